@@ -0,0 +1,69 @@
+"""
+动画
+实时监控网络时逐帧移动节点、修改线的颜色等，由matplotlib的FuncAnimation驱动：
+- 开始后场景模型切换到动画模式（SceneModel.live），每帧的修改原地写入已生成的图元，
+  坐标范围不再随新的位置扩展
+- 每帧先调用update(frame)修改场景（如NodeVar.pos、NetScene.moveNodes、setLinesStyle），再统一生成变化的部分
+- blit为True时坐标轴、标题与不参与动画的文本保存为背景，每帧只重绘参与动画的图元：
+  批量模式下的节点集合、线集合与箭头集合，普通模式下的节点与线，texts为True时还包括文本
+texts为False时文本属于背景，动画中对文本的修改要在窗口完整重绘（如改变大小）后才会显示。
+"""
+from typing import Any, Callable, List
+
+from matplotlib.artist import Artist
+from matplotlib.animation import FuncAnimation
+
+from Nets.SceneModel import SceneModel
+
+class Animator(object):
+    def __init__(self, model: SceneModel, update: Callable[[Any], None], frames=None, interval: float = 1000,
+                 blit: bool = True, texts: bool = False, **kwargs):
+        self.model = model
+        self.update = update
+        self.texts = texts
+        ax = model.ax
+        model.materialize()
+        # 固定坐标范围，否则背景随之失效
+        self._autoscale = ax.get_autoscale_on()
+        ax.set_autoscale_on(False)
+        model.live = True
+        self.animation = FuncAnimation(ax.figure, self._frame, frames=frames, init_func=self.artists,
+                                       interval=interval, blit=blit, cache_frame_data=False, **kwargs)
+
+    # 参与动画的图元，每帧都要全部返回：blit时整个坐标系先恢复为背景，未返回的图元不会被绘制
+    def artists(self) -> List[Artist]:
+        model = self.model
+        if model.batch:
+            artists: List[Artist] = list(model.nodeCollections.values())
+            if model.lineCollection is not None:
+                artists.append(model.lineCollection)
+            if model.arrowCollections is not None:
+                artists.extend(model.arrowCollections)
+        else:
+            artists = [artist for artist in model.nodeArtists + model.lineArtists if artist is not None]
+        if self.texts:
+            if model.lod is not None:
+                artists.append(model.lod._layer)
+            else:
+                artists.extend(artist for artist in model.textArtists if artist is not None)
+        return artists
+
+    def _frame(self, frame) -> List[Artist]:
+        self.update(frame)
+        self.model.materialize()
+        return self.artists()
+
+    # 保存为视频或动图，参数同FuncAnimation.save
+    def save(self, fileName: str, **kwargs) -> None:
+        self.animation.save(fileName, **kwargs)
+
+    # 停止动画并退出动画模式，之后坐标范围照常随图元扩展
+    def stop(self) -> None:
+        self.animation.pause()
+        for artist in self.artists():
+            artist.set_animated(False)
+        self.model.live = False
+        self.model.ax.set_autoscale_on(self._autoscale)
+        self.model.ax.figure.canvas.draw_idle()
+
+__all__ = ['Animator']
@@ -1,9 +1,12 @@
 # 我想基于matplotlib做一个网络图的库，考虑有以下几种类节点类、线类、文本类，这三种都有以下属性
 from typing import Literal, Self
-from dataclasses import dataclass
+from dataclasses import dataclass, fields, replace as _replace
+import weakref
 
 # 共同的样式配置
-@dataclass
+# 样式不可修改（frozen），可以哈希，经internStyle驻留后值相同的样式共用同一个对象，可直接作为分组的键；
+# 需要不同的样式时用replace得到新的样式。文本的角度是每个文本各自的属性，场景模型中单独按文本保存
+@dataclass(frozen=True, slots=True, weakref_slot=True)
 class CommonStyleMixin(object):
     """
     各个属性分别从节点类、线类、文本类展开说明
@@ -22,48 +25,61 @@ class CommonStyleMixin(object):
     size: int
     color: str
 
+    def __post_init__(self):
+        # 序列形式的颜色（如[1, 0, 0]、数组）转为元组，保证可以哈希
+        if not isinstance(self.color, (str, tuple)) and hasattr(self.color, '__iter__'):
+            object.__setattr__(self, 'color', tuple(self.color))
+
     @classmethod
     def to(cls, which: Literal["node", "line", "text"], **kwargs) -> Self:
-        if which == 'node':
-            return cls(style=kwargs.get('style', 'o'), size=kwargs.get('size', 5), color=kwargs.get('color', '#000000'))
-        elif which == 'line':
-            return cls(style=kwargs.get('style', '-'), size=kwargs.get('size', 2), color=kwargs.get('color', '#000000'))
-        else:
-            return cls(style=kwargs.get('style', 'normal'), size=kwargs.get('size', 16),
-                       color=kwargs.get('color', '#000000'))
+        default = _Defaults[which]
+        return internStyle(cls(**{name: kwargs.get(name, default[name]) for name in ('style', 'size', 'color')}))
+
+    # 修改部分属性，返回驻留后的新样式
+    def replace(self, **changes) -> Self:
+        return internStyle(_replace(self, **changes))
 
     def __str__(self):
         return f"style : {self.style}\nsize : {self.size}\ncolor : {self.color}"
 
-    def __eq__(self, other : Self) -> bool:
-        return self.style == other.style and self.size == self.size and self.color == other.color
-
 # 文本的额外配置
+@dataclass(frozen=True, slots=True, init=False)
 class TextStyleMixin(CommonStyleMixin):
     """
     family表示字体类型，默认是微软雅黑
-    rotation表示文本角度，默认是水平，即0°，但在两个指定点时，会自动替换为达到平行线需要的角度
+    rotation表示文本的默认角度，默认是水平，即0°；平行文本等的角度按文本单独记录，不修改样式
     """
     family: str = 'Microsoft YaHei'
-    rotation: int = 0
-    def __init__(self, family: str = 'Microsoft YaHei', rotation: int = 0, **kwargs):
-        super().__init__(**kwargs)
-        self.family = family
-        self.rotation = rotation
+    rotation: float = 0
 
-    def __eq__(self, other : Self) -> bool:
-        return self.family == other.family and self.rotation == other.rotation and super().__eq__(other)
+    # 保持原有的参数顺序：位置参数依次是family、rotation，style、size、color以关键字传入
+    def __init__(self, family: str = 'Microsoft YaHei', rotation: float = 0, *, style: str, size: int, color: str):
+        for name, value in (('style', style), ('size', size), ('color', color), ('family', family), ('rotation', rotation)):
+            object.__setattr__(self, name, value)
+        self.__post_init__()
 
     @classmethod
     def to(cls, **kwargs) -> Self:
-        instance = super().to('text', **kwargs)
-        instance.family = kwargs.get('family', 'Microsoft YaHei')
-        instance.rotation = kwargs.get('rotation', 0)
-        return instance
+        default = _Defaults['text']
+        return internStyle(cls(**{name: kwargs.get(name, value) for name, value in default.items()}))
 
     def __str__(self):
-        return f"{super().__str__()}\nfamily : {self.family}\nrotation : {self.rotation}"
+        return f"{CommonStyleMixin.__str__(self)}\nfamily : {self.family}\nrotation : {self.rotation}"
+
 
+# 样式驻留表：(类型, 各属性值) -> 共用的样式对象；只弱引用样式，不再使用的样式（如临时的角度）随之移除，长期运行时不会无限增长
+_Interned: 'weakref.WeakValueDictionary[tuple, CommonStyleMixin]' = weakref.WeakValueDictionary()
+
+# 返回与style值相同的共用对象，第一次出现时style本身成为共用对象
+def internStyle(style: CommonStyleMixin) -> CommonStyleMixin:
+    key = (type(style),) + tuple(getattr(style, field.name) for field in fields(style))
+    return _Interned.setdefault(key, style)
+
+_Defaults = {
+    'node': dict(style='o', size=5, color='#000000'),
+    'line': dict(style='-', size=2, color='#000000'),
+    'text': dict(style='normal', size=16, color='#000000', family='Microsoft YaHei', rotation=0),
+}
 
 """默认样式配置"""
 DefaultNodeStyle = CommonStyleMixin.to('node')
@@ -75,32 +91,9 @@ DefaultMixinStyle = {
     'Text': DefaultTextStyle
 }
 
-# 样式分析
-def StyleAnalyze(which: Literal["node", "line", "text"], style) -> None:
-    if which == 'node':
-        if style.style is None:
-            style.style = 'o'
-        if style.size is None:
-            style.size = 5
-        if style.color is None:
-            style.color = '#000000'
-    elif which == 'line':
-        if style.style is None:
-            style.style = '-'
-        if style.size is None:
-            style.size = 2
-        if style.color is None:
-            style.color = '#000000'
-    else:
-        if style.style is None:
-            style.style = 'normal'
-        if style.size is None:
-            style.size = 16
-        if style.color is None:
-            style.color = '#000000'
-        if style.family is None:
-            style.family = 'Microsoft YaHei'
-        if style.rotation is None:
-            style.rotation = 0
-
-__all__ = ['CommonStyleMixin', 'TextStyleMixin', 'DefaultLineStyle', 'DefaultMixinStyle', 'DefaultNodeStyle', 'DefaultTextStyle', 'StyleAnalyze']
+# 样式分析：未设置（None）的属性取默认值，返回驻留后的样式，不修改传入的样式
+def StyleAnalyze(which: Literal["node", "line", "text"], style: CommonStyleMixin) -> CommonStyleMixin:
+    missing = {name: value for name, value in _Defaults[which].items() if getattr(style, name, value) is None}
+    return internStyle(_replace(style, **missing) if missing else style)
+
+__all__ = ['CommonStyleMixin', 'TextStyleMixin', 'DefaultLineStyle', 'DefaultMixinStyle', 'DefaultNodeStyle', 'DefaultTextStyle', 'StyleAnalyze', 'internStyle']
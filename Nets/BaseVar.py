@@ -1,16 +1,18 @@
-from dataclasses import dataclass
-from copy import copy as tempCopy
-from typing import Optional, Self, Iterable, List, overload, Union, Literal
-from math import sqrt, cos, sin, degrees, atan2, radians
+from dataclasses import dataclass, replace
+from typing import Optional, Self, Iterable, List, Tuple, overload, Union, Literal, TYPE_CHECKING
+from math import sqrt, cos, sin, degrees, atan2, radians, inf, nan
 
-import matplotlib.pyplot as plt
-from matplotlib.axes import Axes
-from matplotlib.lines import Line2D
+import numpy as np
 
 from Nets.BaseMixin import CommonStyleMixin, TextStyleMixin, DefaultNodeStyle, DefaultTextStyle, DefaultLineStyle, StyleAnalyze
+from Nets.SceneModel import SceneModel
+
+# 坐标系只用于标注类型，导入本模块不加载matplotlib
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
 
 # 位置偏移类，默认是相当于原点，传入x和y轴的坐标
-@dataclass
+@dataclass(slots=True)
 class Offset(object):
     x: float
     y: float
@@ -29,23 +31,71 @@ class Offset(object):
     def __sub__(self, other : Union[Self, float]) -> Self:
         return Offset(self.x - other.x, self.y - other.y) if isinstance(other, Offset) else Offset(self.x - other, self.y - other)
 
+# 图元类只是场景模型中某一行的视图，位置与样式都保存在模型的列中
+class _ElementView(object):
+    __slots__ = ('_model', '_index')
+
+    # 直接基于已有的行创建视图，不会新增图元
+    @classmethod
+    def view(cls, model: SceneModel, index: int) -> Self:
+        instance = cls.__new__(cls)
+        instance._model = model
+        instance._index = index
+        return instance
+
+    @property
+    def index(self) -> int: return self._index
+
+    def __eq__(self, other) -> bool:
+        return type(self) is type(other) and self._model is other._model and self._index == other._index
+
+    def __hash__(self) -> int:
+        return hash((id(self._model), self._index))
+
 # 节点类
-class NodeVar(object):
+class NodeVar(_ElementView):
+    __slots__ = ()
+
     # 相对于原点的偏移的向量构造方式
-    def __init__(self, pos: Offset, ax: Axes, style: CommonStyleMixin = tempCopy(DefaultNodeStyle)):
-        StyleAnalyze('node', style)
-        self._instance : Line2D = ax.plot(pos.x, pos.y, marker=style.style, color=style.color, markersize=style.size)[0]
-        self.style = style
-        self.pos = pos
+    def __init__(self, pos: Offset, ax: 'Axes', style: CommonStyleMixin = DefaultNodeStyle):
+        style = StyleAnalyze('node', style)
+        # 只记录到场景模型，图元在show/save时统一生成；_index是该节点在模型中的行号
+        self._model = SceneModel.of(ax)
+        self._index = self._model.addNode(pos.x, pos.y, style)
+
+    # 位置与样式，赋值会写回模型；样式不可修改，修改请使用setStyle
+    @property
+    def pos(self) -> Offset:
+        x, y = self._model.nodeXY[self._index]
+        return Offset(float(x), float(y))
+
+    @pos.setter
+    def pos(self, pos: Offset) -> None:
+        self._model.setNodePos(self._index, pos.x, pos.y)
+
+    @property
+    def style(self) -> CommonStyleMixin:
+        return self._model.styles[self._model.nodeStyle[self._index]]
+
+    @style.setter
+    def style(self, style: CommonStyleMixin) -> None:
+        self._model.setNodeStyle(self._index, style)
+
+    # 相对于node创建的节点会记录node，之后移动node时随之平移（见Dependency）
+    @classmethod
+    def _relative(cls, node: Self, pos: Offset, ax: 'Axes', style: CommonStyleMixin) -> Self:
+        style = StyleAnalyze('node', style)
+        model = SceneModel.of(ax)
+        return cls.view(model, model.addNode(pos.x, pos.y, style, node._index if node._model is model else -1))
 
     # 相对于某点偏移，计算方式为向量求和
     @classmethod
-    def offset(cls, node: Self, direction: Offset, ax: Axes, style: CommonStyleMixin = tempCopy(DefaultNodeStyle)) -> Self:
-        return cls(node.pos + direction, ax, style)
+    def offset(cls, node: Self, direction: Offset, ax: 'Axes', style: CommonStyleMixin = DefaultNodeStyle) -> Self:
+        return cls._relative(node, node.pos + direction, ax, style)
 
-    def X(self) -> float: return self.pos.x
+    def X(self) -> float: return float(self._model.nodeXY[self._index, 0])
 
-    def Y(self) -> float: return self.pos.y
+    def Y(self) -> float: return float(self._model.nodeXY[self._index, 1])
 
     # 重写设置点的样式
     def setStyle(
@@ -54,111 +104,222 @@ class NodeVar(object):
             size : Optional[int] = None,
             color : Optional[str] = None
     ) -> Self:
-        if color:
-            self._instance.set_color(color)
-        if style:
-            self._instance.set_marker(style)
-        if size:
-            self._instance.set_markersize(size)
+        # 样式不可修改，替换为修改后的样式
+        changes = {name: value for name, value in (('style', style), ('size', size), ('color', color)) if value}
+        if changes:
+            self.style = self.style.replace(**changes)
         return self
 
     # 绑定一个相对点的长度夹角构造方式
     @classmethod
-    def bind(cls, node: Self, length: float, theta: float, ax: Axes,
-             style: CommonStyleMixin = tempCopy(DefaultNodeStyle)) -> Self:
+    def bind(cls, node: Self, length: float, theta: float, ax: 'Axes',
+             style: CommonStyleMixin = DefaultNodeStyle) -> Self:
         theta = radians(theta)
         pos = Offset(x=node.X() + length * cos(theta), y=node.Y() + length * sin(theta))
-        return cls(pos=pos, ax=ax, style=style)
+        return cls._relative(node, pos, ax, style)
 
     # 相对于bind精确的方法，bind_like提供了模糊的绑定一个相对点的长度夹角构造方式
     @classmethod
-    def bind_like(cls, node : Self, length_like : str, theta : float, ax : Axes, style: CommonStyleMixin = tempCopy(DefaultNodeStyle)) -> Self:
+    def bind_like(cls, node : Self, length_like : str, theta : float, ax : 'Axes', style: CommonStyleMixin = DefaultNodeStyle) -> Self:
         return cls.bind(node, float(length_like), theta, ax, style)
 
     # 与目标点的距离
     def measure(self, node: Self) -> float: return sqrt((self.X() - node.X()) ** 2 + (self.Y() - node.Y()) ** 2)
-    # 到某线段所在直线的垂距
+    # 到某线段所在直线的垂距，用叉积计算，竖直的线同样适用；长度为0的线退化为到该点的距离
     def vertical_distance(self, line : 'LineVar') -> float:
-        return abs(-line.K * self.X() + self.Y() - line.B) * abs(cos(radians(line.theta)))
+        x1, y1, x2, y2 = line._model.lineXY[line._index]
+        dx, dy = x2 - x1, y2 - y1
+        length = sqrt(dx ** 2 + dy ** 2)
+        px, py = self.X() - x1, self.Y() - y1
+        return float(abs(dx * py - dy * px) / length) if length else float(sqrt(px ** 2 + py ** 2))
 
 # 线类
-class LineVar(object):
+class LineVar(_ElementView):
+    __slots__ = ()
+
     # 相当于原点的两个点，两种实现，另一个是基于节点
-    def __init__(self, start: Offset, to: Offset, ax: Axes, arrow=False, style: CommonStyleMixin = tempCopy(DefaultLineStyle)):
-        StyleAnalyze('line', style)
-        if arrow:
-            ax.annotate('', xy=(to.x, to.y), xytext=(start.x, start.y),
-                        arrowprops=dict(arrowstyle='->', color=style.color, lw=style.size, ls=style.style))
-        else:
-            plt.plot((start.x, to.x), (start.y, to.y), color=style.color, lw=style.size, ls=style.style)
-
-        self.style = style
-        self.start = start
-        self.to = to
+    def __init__(self, start: Offset, to: Offset, ax: 'Axes', arrow=False, style: CommonStyleMixin = DefaultLineStyle):
+        style = StyleAnalyze('line', style)
+        self._model = SceneModel.of(ax)
+        self._index = self._model.addLine(start.x, start.y, to.x, to.y, style, arrow)
+
+    @property
+    def start(self) -> Offset:
+        x1, y1 = self._model.lineXY[self._index, :2]
+        return Offset(float(x1), float(y1))
+
+    @start.setter
+    def start(self, start: Offset) -> None:
+        _, _, x2, y2 = self._model.lineXY[self._index]
+        self._model.setLine(self._index, start.x, start.y, x2, y2)
+
+    @property
+    def to(self) -> Offset:
+        x2, y2 = self._model.lineXY[self._index, 2:]
+        return Offset(float(x2), float(y2))
+
+    @to.setter
+    def to(self, to: Offset) -> None:
+        x1, y1, _, _ = self._model.lineXY[self._index]
+        self._model.setLine(self._index, x1, y1, to.x, to.y)
+
+    @property
+    def arrow(self) -> bool:
+        return bool(self._model.lineArrow[self._index])
 
+    @property
+    def style(self) -> CommonStyleMixin:
+        return self._model.styles[self._model.lineStyle[self._index]]
+
+    @style.setter
+    def style(self, style: CommonStyleMixin) -> None:
+        self._model.setLineStyle(self._index, style)
+
+    # 由两个节点连成的线会记录两端节点的行号
     @classmethod
-    def bind(cls, node1: NodeVar, node2: NodeVar, ax: Axes, arrow=False, style: CommonStyleMixin = tempCopy(DefaultLineStyle)):
-        return cls(node1.pos, node2.pos, ax, arrow, style)
+    def bind(cls, node1: NodeVar, node2: NodeVar, ax: 'Axes', arrow=False, style: CommonStyleMixin = DefaultLineStyle):
+        model = SceneModel.of(ax)
+        ends = (node1._index, node2._index) if node1._model is model and node2._model is model else (-1, -1)
+        return cls._anchored(node1.pos, node2.pos, ax, arrow, style, ends)
+
+    # 端点锚定在节点上的线，ends是两端节点的行号，不是节点的一端为-1；移动节点时该端随之更新（见Dependency）
+    @classmethod
+    def _anchored(cls, start: Offset, to: Offset, ax: 'Axes', arrow: bool, style: CommonStyleMixin,
+                  ends: Tuple[int, int]) -> Self:
+        style = StyleAnalyze('line', style)
+        model = SceneModel.of(ax)
+        return cls.view(model, model.addLine(start.x, start.y, to.x, to.y, style, arrow, *ends))
 
     # 相对于原点的夹角，返回度数值
     @property
-    def theta(self) -> float: return degrees(atan2(self.to.y - self.start.y, self.to.x - self.start.x)) % 360
-    # 获取斜率与截距
+    def theta(self) -> float:
+        x1, y1, x2, y2 = self._model.lineXY[self._index]
+        return degrees(atan2(y2 - y1, x2 - x1)) % 360
+    # 获取斜率与截距，竖直的线斜率为inf、截距为nan
     @property
-    def K(self) -> float: return (self.start.y - self.to.y) / (self.start.x - self.to.x)
+    def K(self) -> float:
+        x1, y1, x2, y2 = self._model.lineXY[self._index]
+        return inf if x1 == x2 else float((y1 - y2) / (x1 - x2))
     @property
-    def B(self) -> float: return self.start.y - self.start.x * self.K
+    def B(self) -> float:
+        k = self.K
+        return nan if k == inf else self.start.y - self.start.x * k
     # 长度
     @property
-    def length(self): return sqrt((self.start.x - self.to.x) ** 2 + (self.start.y - self.to.y) ** 2)
+    def length(self) -> float:
+        x1, y1, x2, y2 = self._model.lineXY[self._index]
+        return sqrt((x1 - x2) ** 2 + (y1 - y2) ** 2)
     # 中点位置
     @property
-    def middle(self) -> Offset: return Offset(self.start.x / 2 + self.to.x / 2, self.start.y / 2 + self.to.y / 2)
+    def middle(self) -> Offset:
+        x1, y1, x2, y2 = self._model.lineXY[self._index]
+        return Offset(float(x1 + x2) / 2, float(y1 + y2) / 2)
     # 中点
-    def middleNode(self, ax : Axes, style : CommonStyleMixin = tempCopy(DefaultNodeStyle)) -> NodeVar: return NodeVar(self.middle, ax, style)
+    def middleNode(self, ax : 'Axes', style : CommonStyleMixin = DefaultNodeStyle) -> NodeVar: return NodeVar(self.middle, ax, style)
 # 文本类
 """
 设计规定：
 1. 我们传入的一切角度都是自然直观的度数，不是弧度，范围是0 ~ 360
 2. 在进行一个文本布置的时候，bias控制文本偏移目标距离、其内置属性rotation控制文本相当于目标位置的角度
-注：文本布置最大的bug在于如果初始画布不是n*n尺寸，会导致直线不与文本平行的问题;
-另外，即使初始平行，任意缩放尺寸也会造成平行丢失，办法就是重写resize画布事件.
-除了使用画布纵横比约束（在图元少的情况，显示效果很差），我不写更多，其他作为备注
+3. 平行文本（parallel、distance与length的parallel）记录的是数据空间中线的角度，
+   绘制时由matplotlib经坐标变换换算为屏幕上的角度（transform_rotates_text），
+   因此画布不是n*n尺寸或者任意缩放时文本仍与直线平行，不需要在resize时逐个重新计算
+4. parallel、distance、length与bind创建的文本锚定在线的两端节点（或所在节点）上，
+   移动节点时位置、平行角度与长度文本随之更新（见Dependency）；不是由节点连成的线没有可锚定的节点
 """
-class TextVar(object):
-    # 从某点开始布置文本
-    def __init__(self, pos: Offset, text: str, ax: Axes, style: TextStyleMixin = tempCopy(DefaultTextStyle)):
-        StyleAnalyze('text', style)
-        self.pos = pos
-        self.text = text
-        self.style = style
-        ax.text(pos.x, pos.y, text, fontdict=dict(
-            fontname=style.family,
-            fontsize=style.size,
-            style=style.style
-        ), ha='center', va='center', c=style.color, rotation=style.rotation)
+class TextVar(_ElementView):
+    __slots__ = ()
+
+    # 从某点开始布置文本，rotation为空时取style.rotation；parallel为True时角度是数据空间中的角度（见设计规定3）
+    def __init__(self, pos: Offset, text: str, ax: 'Axes', style: TextStyleMixin = DefaultTextStyle,
+                 parallel: bool = False, rotation: Optional[float] = None):
+        style = StyleAnalyze('text', style)
+        # 角度按文本单独记录，不修改共用的样式
+        self._model = SceneModel.of(ax)
+        self._index = self._model.addText(pos.x, pos.y, text, style, parallel, rotation=rotation)
+
+    # 锚定在两个节点上的文本，digits不小于0时是两节点的距离（见设计规定4）
+    @classmethod
+    def _anchored(cls, pos: Offset, text: str, ax: 'Axes', style: TextStyleMixin, parallel: bool,
+                  ends: Tuple[int, int], digits: int = -1, rotation: Optional[float] = None) -> Self:
+        style = StyleAnalyze('text', style)
+        model = SceneModel.of(ax)
+        return cls.view(model, model.addText(pos.x, pos.y, text, style, parallel, ends, digits, rotation))
+
+    # 线的两端节点，线不在ax的场景中或不是由节点连成时为(-1, -1)
+    @staticmethod
+    def _ends(line: LineVar, ax: 'Axes') -> Tuple[int, int]:
+        if line._model is not SceneModel.of(ax):
+            return -1, -1
+        a, b = line._model.lineNodes[line._index]
+        return (int(a), int(b)) if a >= 0 and b >= 0 else (-1, -1)
+
+    @staticmethod
+    def _pair(node1: NodeVar, node2: NodeVar, ax: 'Axes') -> Tuple[int, int]:
+        model = SceneModel.of(ax)
+        return (node1._index, node2._index) if node1._model is model and node2._model is model else (-1, -1)
+
+    @property
+    def pos(self) -> Offset:
+        x, y = self._model.textXY[self._index]
+        return Offset(float(x), float(y))
+
+    @pos.setter
+    def pos(self, pos: Offset) -> None:
+        self._model.setTextPos(self._index, pos.x, pos.y)
+
+    @property
+    def text(self) -> str:
+        return self._model.textStr[self._index]
+
+    @text.setter
+    def text(self, text: str) -> None:
+        self._model.setText(self._index, text)
+
+    # 样式表中的文本样式不含角度，读取时带上该文本自己的rotation
+    @property
+    def style(self) -> TextStyleMixin:
+        # 角度按文本单独保存，返回的样式带上当前角度，但不驻留（每个角度都驻留的话驻留表会随角度不断增长）
+        return replace(self._model.styles[self._model.textStyle[self._index]], rotation=self.rotation)
+
+    # 样式的rotation不为0时视为指定了角度，否则保留文本当前的角度（如平行文本的角度）
+    @style.setter
+    def style(self, style: TextStyleMixin) -> None:
+        self._model.setTextStyle(self._index, style, style.rotation or None)
+
+    @property
+    def rotation(self) -> float:
+        return float(self._model.textRotation[self._index])
+
+    @rotation.setter
+    def rotation(self, rotation: float) -> None:
+        self._model.setTextRotation(self._index, rotation)
+
+    # 是否为平行文本
+    @property
+    def isParallel(self) -> bool:
+        return bool(self._model.textParallel[self._index])
 
     # 在线的一侧偏置平行标注，注意此时，如果采用默认角度，会被纠正
     # 可以通过bias设置平行间距，如果不设置，偏移间距为（线粗+字体）* 0.05
     @classmethod
-    def parallel(cls, line: LineVar, text: str, ax: Axes, bias: Optional[float] = None,
-                 style: TextStyleMixin = tempCopy(DefaultTextStyle)) -> Self:
+    def parallel(cls, line: LineVar, text: str, ax: 'Axes', bias: Optional[float] = None,
+                 style: TextStyleMixin = DefaultTextStyle) -> Self:
         gap: float = bias if bias else (line.style.size + style.size) * 0.05
         theta = line.theta
         X = (line.start.x + line.to.x) / 2
         Y = (line.start.y + line.to.y) / 2 + gap
         pos = Offset(X, Y)
-        style.rotation = theta
-        return cls(pos, text, ax, style)
+        return cls._anchored(pos, text, ax, style, True, cls._ends(line, ax), rotation=theta)
 
     # 显示两点之间的距离(distance) | 显示直线长度(length)。这两个方法都是主动平行于所在直线的，可以设置不平行
     @classmethod
     def distance(cls,
                  node1: NodeVar,
                  node2: NodeVar,
-                 ax: Axes,
+                 ax: 'Axes',
                  bias: Optional[float] = None,
-                 style: TextStyleMixin = tempCopy(DefaultTextStyle),
+                 style: TextStyleMixin = DefaultTextStyle,
                  visible: int = 0,
                  parallel=False
      ) -> Self:
@@ -167,31 +328,26 @@ class TextVar(object):
         X = (node1.X() + node2.X()) / 2
         Y = (node2.Y() + node1.Y()) / 2 + gap
         pos = Offset(X, Y)
-        if parallel:
-            style.rotation = theta
         text = f'{node1.measure(node2):.{visible}f}'
-        return cls(pos, text, ax, style)
+        return cls._anchored(pos, text, ax, style, parallel, cls._pair(node1, node2, ax), visible,
+                             theta if parallel else None)
 
     @classmethod
     def length(cls,
                line: LineVar,
-               ax: Axes,
+               ax: 'Axes',
                bias: Optional[float] = None,
-               style: TextStyleMixin = tempCopy(DefaultTextStyle),
+               style: TextStyleMixin = DefaultTextStyle,
                visible: int = 0,
                parallel=False
     ) -> Self:
         gap: float = bias if bias else (line.style.size + style.size) * 0.05
-        theta = line.theta
-        node1 = line.start
-        node2 = line.to
-        X = (node1.x + node2.x) / 2
-        Y = (node2.y + node1.y) / 2 + gap
-        pos = Offset(X, Y)
-        if parallel:
-            style.rotation = theta
-        text = f'{line.length:.{visible}f}'
-        return cls(pos, text, ax, style)
+        # 夹角、中点、长度都由同一行端点算出，只读取一次
+        x1, y1, x2, y2 = (float(v) for v in line._model.lineXY[line._index])
+        pos = Offset((x1 + x2) / 2, (y1 + y2) / 2 + gap)
+        rotation = degrees(atan2(y2 - y1, x2 - x1)) % 360 if parallel else None
+        text = f'{sqrt((x1 - x2) ** 2 + (y1 - y2) ** 2):.{visible}f}'
+        return cls._anchored(pos, text, ax, style, parallel, cls._ends(line, ax), visible, rotation)
 
     # 在节点旁边添加文本
     # theta是文本相当于目标位置的夹角
@@ -200,33 +356,38 @@ class TextVar(object):
             cls,
             node : NodeVar,
             text : str,
-            ax: Axes,
+            ax: 'Axes',
             theta : int = 0,
             bias: Optional[float] = None,
-            style : TextStyleMixin = tempCopy(DefaultTextStyle)
+            style : TextStyleMixin = DefaultTextStyle
     ) -> Self:
         # print(style.rotation)
         gap: float = bias if bias else (node.style.size + style.size) * 0.05
         t = radians(theta)
-        return cls(node.pos + Offset(gap * cos(t), gap * sin(t)), text, ax, style)
+        return cls._anchored(node.pos + Offset(gap * cos(t), gap * sin(t)), text, ax, style, False,
+                             cls._pair(node, node, ax))
 
     # 在偏移位置旁边添加文本
     # theta是文本相当于目标位置的夹角
     # 由于没有绑定目标的尺寸信息，使用revise来设置bias为空的时候默认位置偏移
+    # pos是两个节点的中点（如线的中点）时可以传入ends锚定在这两个节点上，digits同_anchored
     @classmethod
     def bindOffset(
             cls,
             pos : Offset,
             text: str,
-            ax: Axes,
+            ax: 'Axes',
             theta: int = 0,
             bias: Optional[float] = None,
-            style: TextStyleMixin = tempCopy(DefaultTextStyle),
-            revise : float = 2
+            style: TextStyleMixin = DefaultTextStyle,
+            revise : float = 2,
+            *,
+            ends: Tuple[int, int] = (-1, -1),
+            digits: int = -1
     ) -> Self:
         gap: float = bias if bias else (revise + style.size) * 0.05
         t = radians(theta)
-        return cls(pos + Offset(gap * cos(t), gap * sin(t)), text, ax, style)
+        return cls._anchored(pos + Offset(gap * cos(t), gap * sin(t)), text, ax, style, False, ends, digits)
 
 # 将相对于原点的位置列表转为Offset | 另一个版本是相对于是上一个进行偏移，第一个相对于原点
 @overload
@@ -236,12 +397,7 @@ def transToOffset(points : Iterable, isBind : bool = False) -> List[Offset]: ...
 def transToOffset(points : Iterable, isBind : Optional[bool] = False) -> List[Offset]:
     if not isBind:
         return [Offset(p[0], p[1]) for p in points]
-    else:
-        last = Offset(0, 0)
-        ls = []
-        for p in points:
-            last = last + Offset(p[0], p[1])
-            ls.append(last)
-        return ls
+    xy = np.cumsum(np.asarray(list(points), dtype=float).reshape(-1, 2), axis=0)
+    return [Offset(x, y) for x, y in xy.tolist()]
 
 __all__ = ['NodeVar', 'LineVar', 'TextVar', 'Offset', 'transToOffset']
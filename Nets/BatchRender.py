@@ -0,0 +1,121 @@
+"""
+多进程批量渲染
+每个任务描述一个场景：builder是可被pickle的函数（模块顶层定义），以builder(*args, **kwargs)调用并返回NetScene，
+渲染后按formats保存到fileName。任务在进程池中执行，单个任务出错只记录在结果中，不影响其他任务；
+工作进程异常退出（崩溃、被系统终止）时，受影响的任务逐个在单独的进程中重新渲染，仍然失败的任务记为出错。
+建议builder中使用NetScene(headless=True)创建场景；工作进程会强制使用Agg后端。
+"""
+from typing import Callable, Optional, List, Tuple, Iterable
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from time import perf_counter
+import traceback
+
+@dataclass
+class RenderJob(object):
+    builder: Callable
+    fileName: str
+    formats: Tuple[str, ...] = ('png',)
+    args: tuple = ()
+    kwargs: dict = field(default_factory=dict)
+    # 传给NetScene.save_many的额外参数，如dpi、bbox_inches
+    saveKwargs: dict = field(default_factory=dict)
+
+@dataclass
+class RenderResult(object):
+    fileName: str
+    files: List[str] = field(default_factory=list)
+    # 出错时为异常的完整回溯文本
+    error: Optional[str] = None
+    elapsed: float = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+def _initWorker() -> None:
+    import matplotlib
+    matplotlib.use('Agg')
+
+# 渲染单个任务，异常被捕获并写入结果
+def renderOne(job: RenderJob) -> RenderResult:
+    start = perf_counter()
+    result = RenderResult(job.fileName)
+    try:
+        scene = job.builder(*job.args, **job.kwargs)
+        try:
+            result.files = scene.save_many(job.fileName, job.formats, **job.saveKwargs)
+        finally:
+            scene.close()
+    except Exception:
+        result.error = traceback.format_exc()
+    result.elapsed = perf_counter() - start
+    return result
+
+def _renderChunk(jobs: List[RenderJob]) -> List[RenderResult]:
+    return [renderOne(job) for job in jobs]
+
+# 在一个进程池中渲染indices对应的任务，每完成一个任务调用finish(序号, 结果)；
+# 返回因工作进程异常退出而没有结果的任务序号
+def _renderPool(jobs: List[RenderJob], indices: List[int], workers: Optional[int], chunksize: int,
+                finish: Callable[[int, RenderResult], None]) -> List[int]:
+    crashed = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_initWorker) as pool:
+        futures = {}
+        for start in range(0, len(indices), chunksize):
+            chunk = indices[start:start + chunksize]
+            try:
+                futures[pool.submit(_renderChunk, [jobs[index] for index in chunk])] = chunk
+            except BrokenProcessPool:
+                crashed.extend(indices[start:])
+                break
+        for future in as_completed(futures):
+            chunk = futures[future]
+            try:
+                outputs = future.result()
+            except BrokenProcessPool:
+                crashed.extend(chunk)
+                continue
+            except Exception:
+                # 任务无法发送到工作进程或结果无法返回（如builder不能pickle）
+                error = traceback.format_exc()
+                for index in chunk:
+                    finish(index, RenderResult(jobs[index].fileName, error=error))
+                continue
+            for index, result in zip(chunk, outputs):
+                finish(index, result)
+    return sorted(crashed)
+
+# 批量渲染，结果顺序与jobs一致
+# workers为进程数，默认是CPU核数；workers为1时在当前进程中依次渲染（不切换后端），便于调试
+# chunksize是每次派发给一个进程的任务数，任务很小时调大可以减少进程间通信
+# progress(done, total, result)在每个任务完成后于主进程中按完成的先后调用
+def renderMany(
+        jobs: Iterable[RenderJob],
+        workers: Optional[int] = None,
+        chunksize: int = 1,
+        progress: Optional[Callable[[int, int, RenderResult], None]] = None
+) -> List[RenderResult]:
+    jobs = list(jobs)
+    results: List[Optional[RenderResult]] = [None] * len(jobs)
+    done = 0
+
+    def finish(index: int, result: RenderResult) -> None:
+        nonlocal done
+        results[index] = result
+        done += 1
+        if progress:
+            progress(done, len(jobs), result)
+
+    if workers == 1:
+        for index, job in enumerate(jobs):
+            finish(index, renderOne(job))
+        return results
+    # 进程池中一个工作进程异常退出后，同一进程池中未完成的任务都会失败；这些任务逐个在单独的进程中重新渲染，找出出错的任务
+    for index in _renderPool(jobs, list(range(len(jobs))), workers, max(chunksize, 1), finish):
+        if _renderPool(jobs, [index], 1, 1, finish):
+            finish(index, RenderResult(jobs[index].fileName, error='渲染任务的工作进程异常退出（崩溃或被系统终止）'))
+    return results
+
+__all__ = ['RenderJob', 'RenderResult', 'renderOne', 'renderMany']
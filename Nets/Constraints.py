@@ -0,0 +1,437 @@
+"""
+几何约束求解（实际比例图）
+按给定的边长、方向角与固定节点同时求解所有节点的位置，代替逐条边依次推算：
+依次推算（addBindsToAll等）时误差沿路径累积，闭合边的长度与给定值不符；同时求解时所有约束一起按最小二乘满足，
+约束互相矛盾时误差分摊到各条约束上，并逐条报告残差。
+- lengths：(L, 2)的节点序号对与(L,)的长度，约束两节点之间的距离
+- angles：(A, 2)的节点序号对与(A,)的角度，约束从第一个节点指向第二个节点的方向，角度与LineVar.theta相同（度，0 ~ 360）
+- pos：(N, 2)的初始位置，例如依次推算得到的位置；pinned：固定不动的节点序号或长度为N的布尔数组
+- iterations：最大迭代次数；tol：所有残差都小于tol * 平均边长时结束
+求解使用Levenberg-Marquardt（带阻尼的Gauss-Newton），每一步的法方程(JᵀJ + λD)δ = -Jᵀr用预条件共轭梯度求解：
+- 每条约束只涉及两个节点，雅可比矩阵不显式构造，J与Jᵀ的乘积用数组索引与bincount向量化计算，代价与约束数成正比
+- 预条件是聚合多重网格的V循环：按约束图逐层把相邻节点两两聚合，粗层的矩阵由细层按聚合求和得到，
+  最粗一层直接求逆；路径、多边形这类长链的迭代次数因此不随节点数增长
+角度约束的残差是弧长：两节点的距离乘以方向与给定角度之差（弧度），与长度约束的单位相同；报告时换算为角度的偏差。
+约束矛盾、约束图接近退化或迭代次数不足时残差达不到tol，solve在返回的Convergence中报告是否收敛、迭代次数、最大残差与结束的原因。
+没有固定节点时整体的平移（没有角度约束时还有旋转）不确定，阻尼使解停留在初始位置附近。
+本模块只依赖NumPy。
+"""
+from typing import Optional, Tuple, List, Callable
+from dataclasses import dataclass
+
+import numpy as np
+
+# 求解的收敛情况
+@dataclass(slots=True)
+class Convergence(object):
+    """
+    converged：所有残差都小于tol * 平均边长
+    iterations：Levenberg-Marquardt的迭代次数
+    residual：最大残差，与长度同单位（角度约束按弧长计）
+    reason：结束的原因，'tol'：达到精度；'stationary'：梯度相对残差可以忽略（约束矛盾时的最小二乘解）；'stalled'：代价不再明显下降；
+    'step'：步长过小；'damping'：阻尼增大到上限仍无法下降；'iterations'：达到最大迭代次数；'pinned'：没有可移动的节点
+    """
+    converged: bool
+    iterations: int
+    residual: float
+    reason: str
+
+# 所有约束的残差r与对两节点之差的梯度g，第k条约束的J·v = g[k]·(v[j] - v[i])，前split条是长度约束
+def _residuals(xy: np.ndarray, pairs: np.ndarray, targets: np.ndarray, split: int) -> Tuple[np.ndarray, np.ndarray]:
+    delta = xy[pairs[:, 1]] - xy[pairs[:, 0]]
+    dist = np.hypot(delta[:, 0], delta[:, 1])
+    # 两点重合时方向任取
+    safe = dist > 1e-12
+    unit = np.where(safe[:, None], delta / np.where(safe, dist, 1)[:, None], (1., 0.))
+    r = dist - targets
+    g = unit.copy()
+    # 角度约束：r = dist * Δθ，对两节点之差的梯度是Δθ * 单位方向 + 法向
+    turn = (np.arctan2(delta[split:, 1], delta[split:, 0]) - targets[split:] + np.pi) % (2 * np.pi) - np.pi
+    r[split:] = dist[split:] * turn
+    g[split:] = unit[split:] * turn[:, None] + np.column_stack((-unit[split:, 1], unit[split:, 0]))
+    return r, g
+
+# 一组2×2或3×3矩阵的逆，按伴随矩阵直接计算，避免逐个调用LAPACK；接近奇异的块改用伪逆
+def _invert(blocks: np.ndarray) -> np.ndarray:
+    if blocks.shape[1] == 2:
+        a, b, c, d = blocks[:, 0, 0], blocks[:, 0, 1], blocks[:, 1, 0], blocks[:, 1, 1]
+        det = a * d - b * c
+        adjugate = np.stack((np.stack((d, -b), axis=1), np.stack((-c, a), axis=1)), axis=1)
+    else:
+        # 第i列是另两行的叉积
+        rows = blocks
+        adjugate = np.stack((np.cross(rows[:, 1], rows[:, 2]), np.cross(rows[:, 2], rows[:, 0]),
+                             np.cross(rows[:, 0], rows[:, 1])), axis=2)
+        det = np.einsum('np,np->n', rows[:, 0], adjugate[:, :, 0])
+    scale = np.abs(blocks).reshape(len(blocks), -1).max(axis=1)
+    singular = np.abs(det) <= 1e-12 * np.maximum(scale, 1e-300) ** blocks.shape[1]
+    inverse = adjugate / np.where(singular, 1., det)[:, None, None]
+    if singular.any():
+        inverse[singular] = np.linalg.pinv(blocks[singular])
+    return inverse
+
+# 多重网格的一层：以自由度为行列的稀疏矩阵，每个节点（最细一层）或聚合（粗层）有block个自由度
+# 稀疏结构在求解开始时确定，之后只更新数值
+class _Level(object):
+    def __init__(self, rows: np.ndarray, cols: np.ndarray, size: int, block: int):
+        key, self.inverse = np.unique(rows * size + cols, return_inverse=True)
+        self.rows, self.cols, self.size, self.block = key // size, key % size, size, block
+        # 同一节点的对角块在values中的位置
+        own = np.flatnonzero(self.rows // block == self.cols // block)
+        self.diagonal = own, self.rows[own] // block, self.rows[own] % block, self.cols[own] % block
+        self.values = np.zeros(len(key))
+        # 到下一层的延拓：每个自由度对应下一层的两个自由度及系数
+        self.prolongCols: Optional[np.ndarray] = None
+        self.prolongValues: Optional[np.ndarray] = None
+
+    # values与构造时的行列一一对应，重复的位置求和；merged为True时values已与合并后的非零元一一对应
+    def assign(self, values: np.ndarray, merged: bool = False) -> None:
+        self.values = values if merged else np.bincount(self.inverse, values, len(self.rows))
+        own, node, p, q = self.diagonal
+        blocks = np.zeros((self.size // self.block, self.block, self.block))
+        blocks[node, p, q] = self.values[own]
+        # 单个节点的聚合没有转动，该自由度所在的行列全为0，对角元置1后可逆
+        diagonal = blocks[:, range(self.block), range(self.block)]
+        diagonal[diagonal <= 0] = 1.
+        blocks[:, range(self.block), range(self.block)] = diagonal
+        self.smoother = _invert(blocks)
+
+    def __matmul__(self, v: np.ndarray) -> np.ndarray:
+        return np.bincount(self.rows, self.values * v[self.cols], self.size)
+
+    # 块Jacobi
+    def smooth(self, r: np.ndarray) -> np.ndarray:
+        return np.einsum('npq,nq->np', self.smoother, r.reshape(-1, self.block)).reshape(-1)
+
+    def restrict(self, r: np.ndarray, size: int) -> np.ndarray:
+        return np.bincount(self.prolongCols.reshape(-1), (r[:, None] * self.prolongValues).reshape(-1), size)
+
+    def prolong(self, e: np.ndarray) -> np.ndarray:
+        return (e[self.prolongCols] * self.prolongValues).sum(axis=1)
+
+    # 下一层的每个聚合有平移与转动三个自由度：聚合整体平移(tx, ty)并绕中心center转动θ时，
+    # 位于center + d的成员平移(tx - θ dy, ty + θ dx)，粗层的成员（聚合）还随之转动θ
+    # positions是这一层每个节点（聚合）的位置，返回下一层与聚合的中心
+    def coarsen(self, groups: np.ndarray, count: int, positions: np.ndarray) -> Tuple['_Level', np.ndarray]:
+        members = np.bincount(groups, minlength=count)
+        center = np.column_stack((np.bincount(groups, positions[:, 0], count),
+                                  np.bincount(groups, positions[:, 1], count))) / members[:, None]
+        d = positions - center[groups]
+        base = 3 * groups
+        cols = [np.column_stack((base, base + 2)), np.column_stack((base + 1, base + 2))]
+        values = [np.column_stack((np.ones(len(d)), -d[:, 1])), np.column_stack((np.ones(len(d)), d[:, 0]))]
+        if self.block == 3:
+            cols.append(np.column_stack((base + 2, base + 2)))
+            values.append(np.column_stack((np.ones(len(d)), np.zeros(len(d)))))
+        self.prolongCols = np.stack(cols, axis=1).reshape(-1, 2)
+        self.prolongValues = np.stack(values, axis=1).reshape(-1, 2)
+        # PᵀAP：第k个非零元(r, c, v)贡献到(P[r]的列, P[c]的列)，系数是两者之积
+        rows = np.repeat(self.prolongCols[self.rows], 2, axis=1)
+        cols = np.tile(self.prolongCols[self.cols], 2)
+        self.expand = np.repeat(self.prolongValues[self.rows], 2, axis=1) * np.tile(self.prolongValues[self.cols], 2)
+        return _Level(rows.reshape(-1), cols.reshape(-1), 3 * count, 3), center
+
+# 两两聚合：每个节点选择随机优先级最高的相邻节点，互相选中的成对，剩下的并入相邻的聚合；返回聚合序号与聚合数
+def _aggregate(edges: np.ndarray, size: int, rng: np.random.Generator) -> Tuple[np.ndarray, int]:
+    groups = np.full(size, -1, dtype=np.int64)
+    count = 0
+    priority = rng.random(size)
+    for _ in range(3):
+        open_ = groups < 0
+        candidates = edges[open_[edges[:, 0]] & open_[edges[:, 1]]]
+        if not len(candidates):
+            break
+        candidates = candidates[np.lexsort((priority[candidates[:, 1]], candidates[:, 0]))]
+        last = np.r_[candidates[1:, 0] != candidates[:-1, 0], True]
+        pick = np.full(size, -1, dtype=np.int64)
+        pick[candidates[last, 0]] = candidates[last, 1]
+        first = np.flatnonzero((pick >= 0) & (pick[np.maximum(pick, 0)] == np.arange(size)))
+        first = first[first < pick[first]]
+        groups[first] = groups[pick[first]] = count + np.arange(len(first))
+        count += len(first)
+    joined = edges[(groups[edges[:, 0]] < 0) & (groups[edges[:, 1]] >= 0)]
+    nodes, index = np.unique(joined[:, 0], return_index=True)
+    groups[nodes] = groups[joined[index, 1]]
+    alone = np.flatnonzero(groups < 0)
+    groups[alone] = count + np.arange(len(alone))
+    return groups, count + len(alone)
+
+# 聚合多重网格：ends是每条约束两端在自由节点中的序号（固定节点为-1），positions是自由节点的位置
+# 聚合只取决于约束图，在求解开始时计算一次；每一步用assign更新最细一层的JᵀJ，apply计算(JᵀJ + λD)v；
+# 各层的预条件数值由setup按当时的阻尼更新，阻尼变化不大时沿用（见_levenbergMarquardt）
+class _Multigrid(object):
+    def __init__(self, ends: np.ndarray, positions: np.ndarray, coarsest: int = 128):
+        size = len(positions)
+        i, j = ends[:, 0], ends[:, 1]
+        # 第k条约束的四个块：(i, i)、(j, j)为g gᵀ，(i, j)、(j, i)为-g gᵀ，只保留两端都是自由节点的块
+        blockRows = np.concatenate((i, j, i, j))
+        blockCols = np.concatenate((i, j, j, i))
+        keep = (blockRows >= 0) & (blockCols >= 0)
+        self.source = np.tile(np.arange(len(ends)), 4)[keep]
+        self.sign = np.repeat((1., 1., -1., -1.), len(ends))[keep]
+        p, q = np.array((0, 0, 1, 1)), np.array((0, 1, 0, 1))
+        rows = (2 * blockRows[keep, None] + p).reshape(-1)
+        cols = (2 * blockCols[keep, None] + q).reshape(-1)
+        # 最后是阻尼的对角线
+        dofs = np.arange(2 * size)
+        self.levels = [_Level(np.concatenate((rows, dofs)), np.concatenate((cols, dofs)), 2 * size, 2)]
+        self.damped = self.levels[0].inverse[len(rows):]
+        self.gram = np.zeros(len(self.levels[0].rows))
+        edges = ends[(ends >= 0).all(axis=1) & (ends[:, 0] != ends[:, 1])]
+        edges = np.unique(np.concatenate((edges, edges[:, ::-1])), axis=0)
+        rng = np.random.default_rng(0)
+        while size > coarsest and len(edges):
+            groups, count = _aggregate(edges, size, rng)
+            if count > .9 * size:
+                break
+            # 再两两聚合一次，每个聚合约有4个节点，K循环在每层调用两次下一层，下一层需要足够小
+            merged = groups[edges]
+            merged = np.unique(merged[merged[:, 0] != merged[:, 1]], axis=0)
+            if count > coarsest and len(merged):
+                outer, count = _aggregate(merged, count, rng)
+                groups = outer[groups]
+            level, positions = self.levels[-1].coarsen(groups, count, positions)
+            self.levels.append(level)
+            edges = groups[edges]
+            edges = np.unique(edges[edges[:, 0] != edges[:, 1]], axis=0)
+            size = count
+        # 最粗一层不大时直接求逆，否则（约束图不连通，无法继续聚合）用块Jacobi
+        self.direct = size <= coarsest
+
+    # 最细一层的JᵀJ（不含阻尼），与最细一层的非零元一一对应
+    def assign(self, g: np.ndarray) -> None:
+        outer = g[:, (0, 0, 1, 1)] * g[:, (0, 1, 0, 1)]
+        level = self.levels[0]
+        values = np.concatenate(((self.sign[:, None] * outer[self.source]).reshape(-1), np.zeros(level.size)))
+        self.gram = np.bincount(level.inverse, values, len(level.rows))
+
+    # (JᵀJ + diag(scaled))v
+    def apply(self, v: np.ndarray, scaled: np.ndarray) -> np.ndarray:
+        level = self.levels[0]
+        return np.bincount(level.rows, self.gram * v[level.cols], level.size) + scaled * v
+
+    # 按assign的JᵀJ与阻尼scaled更新各层的预条件
+    def setup(self, scaled: np.ndarray) -> None:
+        level = self.levels[0]
+        values = self.gram.copy()
+        np.add.at(values, self.damped, scaled)
+        level.assign(values, merged=True)
+        for coarse in self.levels[1:]:
+            coarse.assign((level.values[:, None] * level.expand).reshape(-1))
+            level = coarse
+        if self.direct:
+            dense = np.zeros((level.size, level.size))
+            dense[level.rows, level.cols] = level.values
+            # 单个节点的聚合没有转动，对应的行列全为0，对角元置1后矩阵正定，这些自由度的解为0
+            diagonal = dense.diagonal().copy()
+            diagonal[diagonal <= 0] = 1.
+            np.fill_diagonal(dense, diagonal)
+            try:
+                np.linalg.cholesky(dense)
+                self.solver = np.linalg.inv(dense)
+            except np.linalg.LinAlgError:
+                self.solver = np.linalg.pinv(dense, hermitian=True)
+
+    def _cycle(self, index: int, r: np.ndarray, weight: float = .8) -> np.ndarray:
+        level = self.levels[index]
+        if index == len(self.levels) - 1:
+            return self.solver @ r if self.direct else level.smooth(r)
+        x = weight * level.smooth(r)
+        x += level.prolong(self._coarse(index + 1, level.restrict(r - level @ x, self.levels[index + 1].size)))
+        x += weight * level.smooth(r - level @ x)
+        return x
+
+    # 粗层的修正：最粗一层直接求解，其余用以下一层循环为预条件的两步共轭梯度（K循环），
+    # 两两聚合的粗层只逼近平移与转动，单次循环的修正随层数增加而变弱，K循环使收敛速度与层数无关
+    def _coarse(self, index: int, r: np.ndarray) -> np.ndarray:
+        if index == len(self.levels) - 1:
+            return self._cycle(index, r)
+        level = self.levels[index]
+        c1 = self._cycle(index, r)
+        v1 = level @ c1
+        rho1 = float(c1 @ v1)
+        if rho1 <= 0:
+            return c1
+        alpha1 = float(c1 @ r) / rho1
+        rest = r - alpha1 * v1
+        if float(rest @ rest) <= .0625 * float(r @ r):
+            return alpha1 * c1
+        c2 = self._cycle(index, rest)
+        v2 = level @ c2
+        gamma = float(c2 @ v1)
+        rho2 = float(c2 @ v2) - gamma * gamma / rho1
+        if rho2 <= 0:
+            return alpha1 * c1
+        alpha2 = float(c2 @ rest) / rho2
+        return (alpha1 - gamma * alpha2 / rho1) * c1 + alpha2 * c2
+
+    # 作为共轭梯度的预条件
+    def __call__(self, r: np.ndarray) -> np.ndarray:
+        return self._cycle(0, r)
+
+# 预条件共轭梯度，apply是矩阵与向量的乘积，precondition是预条件；
+# K循环的预条件随输入略有变化，β按Polak-Ribière的形式计算（灵活共轭梯度）
+def _conjugateGradient(apply: Callable[[np.ndarray], np.ndarray], precondition: Callable[[np.ndarray], np.ndarray],
+                       b: np.ndarray, iterations: int, tol: float) -> np.ndarray:
+    x = np.zeros_like(b)
+    r = b.copy()
+    z = precondition(r)
+    p = z.copy()
+    rz = float(r @ z)
+    target = tol * tol * float(b @ b)
+    for _ in range(iterations):
+        q = apply(p)
+        pq = float(p @ q)
+        if pq <= 0:
+            break
+        alpha = rz / pq
+        x += alpha * p
+        last = r.copy()
+        r -= alpha * q
+        if float(r @ r) <= target:
+            break
+        z = precondition(r)
+        beta = float(z @ (r - last)) / rz
+        rz = float(r @ z)
+        p = z + beta * p
+    return x
+
+def solve(
+        count: int,
+        pos,
+        lengths: Tuple = ((), ()),
+        angles: Tuple = ((), ()),
+        pinned=None,
+        iterations: int = 100,
+        tol: float = 1e-9,
+        cgIterations: int = 200
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Convergence]:
+    """
+    返回(N, 2)的位置、(L,)的长度残差（实际长度 - 给定长度）、(A,)的角度残差（实际角度 - 给定角度，度，-180 ~ 180）
+    与收敛情况；cgIterations是每一步共轭梯度的最大迭代次数
+    """
+    xy = np.array(pos, dtype=float).reshape(count, 2)
+    lengthPairs = np.asarray(lengths[0], dtype=np.int64).reshape(-1, 2)
+    lengthValues = np.asarray(lengths[1], dtype=float).reshape(-1)
+    anglePairs = np.asarray(angles[0], dtype=np.int64).reshape(-1, 2)
+    angleValues = np.asarray(angles[1], dtype=float).reshape(-1)
+    if len(lengthPairs) != len(lengthValues) or len(anglePairs) != len(angleValues):
+        raise ValueError('约束的节点对与数值数量不一致')
+    # 两端是同一节点的约束与位置无关，只报告残差
+    pairs = np.concatenate((lengthPairs, anglePairs))
+    targets = np.concatenate((lengthValues, np.radians(angleValues)))
+    active = pairs[:, 0] != pairs[:, 1]
+    split = int(active[:len(lengthPairs)].sum())
+    pairs, targets = pairs[active], targets[active]
+    # 参与求解的是约束涉及的未固定节点
+    free = np.zeros(count, dtype=bool)
+    free[pairs.reshape(-1)] = True
+    if pinned is not None:
+        pinned = np.asarray(pinned)
+        if pinned.dtype == bool:
+            free &= ~pinned
+        else:
+            free[pinned.astype(np.int64)] = False
+    scale = float(np.abs(lengthValues).mean()) if len(lengthValues) else 1.
+    tol *= max(scale, 1e-12)
+    if free.any():
+        steps, reason = _levenbergMarquardt(xy, pairs, targets, split, free, iterations, tol, cgIterations)
+    else:
+        steps, reason = 0, 'pinned'
+    r = _residuals(xy, pairs, targets, split)[0]
+    residual = float(np.abs(r).max()) if len(r) else 0.
+    convergence = Convergence(residual <= tol, steps, residual, 'tol' if residual <= tol else reason)
+    return xy, *_report(xy, lengthPairs, lengthValues, anglePairs, angleValues), convergence
+
+# 原地修改xy，返回迭代次数与结束的原因
+def _levenbergMarquardt(xy: np.ndarray, pairs: np.ndarray, targets: np.ndarray, split: int, free: np.ndarray,
+                        iterations: int, tol: float, cgIterations: int) -> Tuple[int, str]:
+    nodes = np.flatnonzero(free)
+    local = np.full(len(xy), -1, dtype=np.int64)
+    local[nodes] = np.arange(len(nodes))
+    ends = local[pairs]
+    multigrid = _Multigrid(ends, xy[nodes])
+    # Jᵀw：第k条约束对第二个节点的分量为w g，对第一个节点为-w g，只计自由节点
+    side = np.concatenate((ends[:, 1], ends[:, 0]))
+    keep = side >= 0
+    source = np.tile(np.arange(len(pairs)), 2)[keep]
+    sign = np.repeat((1., -1.), len(pairs))[keep]
+    dofs = np.concatenate((2 * side[keep], 2 * side[keep] + 1))
+    size = 2 * len(nodes)
+
+    # Jv：固定节点的位移为0，用末尾补上的一行0表示
+    padded = np.where(ends < 0, len(nodes), ends)
+
+    def transpose(g: np.ndarray, w: np.ndarray) -> np.ndarray:
+        value = (sign * w[source])[:, None] * g[source]
+        return np.bincount(dofs, value.T.reshape(-1), size)
+
+    def jacobian(g: np.ndarray, v: np.ndarray) -> np.ndarray:
+        v = np.concatenate((v.reshape(-1, 2), ((0., 0.),)))
+        return np.einsum('kp,kp->k', g, v[padded[:, 1]] - v[padded[:, 0]])
+
+    r, g = _residuals(xy, pairs, targets, split)
+    cost = float(r @ r)
+    history = [cost]
+    # 阻尼按实际下降与线性模型预测的下降之比调整（Nielsen），被拒绝的步依次放大growth倍
+    damping, growth = 1e-6, 2.
+    previous = None
+    for step in range(iterations):
+        if float(np.abs(r).max()) <= tol:
+            return step, 'tol'
+        gradient = transpose(g, r)
+        norm = float(np.linalg.norm(gradient))
+        # 梯度相对残差可以忽略时已是最小二乘解（约束矛盾，残差不为0），继续迭代代价也不再下降
+        if norm <= 1e-6 * np.sqrt(cost):
+            return step, 'stationary'
+        # 共轭梯度的精度随梯度的下降而提高（Eisenstat-Walker）
+        forcing = .1 if previous is None else min(.1, max(1e-4, norm / previous))
+        previous = norm
+        # JᵀJ的对角线，为0的自由度取1，使阻尼项保持正定
+        diag = np.bincount(dofs, (g[source] ** 2).T.reshape(-1), size)
+        diag[diag <= 0] = 1.
+        # 预条件在梯度变化后重建，被拒绝的步只增大阻尼，变化不超过100倍时沿用原来的预条件
+        multigrid.assign(g)
+        built = None
+        while True:
+            scaled = damping * diag
+            if built is None or not built / 100 <= damping <= built * 100:
+                multigrid.setup(scaled)
+                built = damping
+            delta = _conjugateGradient(lambda v: multigrid.apply(v, scaled), multigrid, -gradient, cgIterations, forcing)
+            trial = xy.copy()
+            trial[nodes] += delta.reshape(-1, 2)
+            r2, g2 = _residuals(trial, pairs, targets, split)
+            cost2 = float(r2 @ r2)
+            if cost2 < cost:
+                model = r + jacobian(g, delta)
+                predicted = cost - float(model @ model)
+                ratio = (cost - cost2) / predicted if predicted > 0 else 1.
+                damping = max(damping * max(1 / 3, 1 - (2 * ratio - 1) ** 3), 1e-12)
+                growth = 2.
+                break
+            damping *= growth
+            growth *= 2
+            if damping > 1e12:
+                return step, 'damping'
+        xy[:] = trial
+        history.append(cost2)
+        stalled = cost - cost2 <= 1e-12 * cost or len(history) > 5 and cost2 > .99 * history[-6]
+        r, g, cost = r2, g2, cost2
+        # 代价不再下降（约束矛盾，残差不为0），或连续5步共下降不到1%（约束图接近退化，收敛很慢）时结束
+        if stalled:
+            return step + 1, 'stalled'
+        if float(np.abs(delta).max()) <= tol * 1e-3:
+            return step + 1, 'step'
+    return iterations, 'iterations'
+
+def _report(xy: np.ndarray, lengthPairs: np.ndarray, lengthValues: np.ndarray, anglePairs: np.ndarray,
+            angleValues: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    delta = xy[lengthPairs[:, 1]] - xy[lengthPairs[:, 0]]
+    lengthResiduals = np.hypot(delta[:, 0], delta[:, 1]) - lengthValues
+    delta = xy[anglePairs[:, 1]] - xy[anglePairs[:, 0]]
+    actual = np.degrees(np.arctan2(delta[:, 1], delta[:, 0]))
+    angleResiduals = (actual - angleValues + 180) % 360 - 180
+    return lengthResiduals, angleResiduals
+
+__all__ = ['solve', 'Convergence']
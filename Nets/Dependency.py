@@ -0,0 +1,123 @@
+"""
+依赖关系
+移动节点时只重新计算依赖它的图元，代价与被移动节点的邻域成正比，与场景规模无关：
+- 节点 -> 以其为端点的线（lineNodes）：端点随之更新
+- 节点 -> 相对于它创建的节点（nodeParent，如NodeVar.bind、NodeVar.offset、addBindsToAll）：随之平移，
+  逐层传递；同时被指定了位置的节点以指定的位置为准
+- 节点 -> 文本（textNodes）：文本锚定在两个节点上（线的两端；节点旁的文本两端是同一个节点），
+  位置是两节点的中点加上创建时的偏移textOffset；平行文本的角度随两节点的方向更新；
+  textDigits不小于0时文本是两节点的距离（TextVar.length、TextVar.distance），按该位数重新格式化
+每种关系保存为按节点行号排序的数组，新添加的行在查询时归并进来，不重新排序已有部分。
+"""
+from typing import Tuple, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from Nets.SceneModel import SceneModel
+
+# 按键排序的(键, 行号)，键是节点行号，行号是依赖它的图元
+class _SortedIndex(object):
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        # 已并入的行数
+        self.built = 0
+        self.keys = np.empty(0, dtype=np.int64)
+        self.rows = np.empty(0, dtype=np.int64)
+
+    # column是(n,)或(n, k)的键，第i行的每个非负键都指向i
+    def sync(self, column: np.ndarray) -> None:
+        count = len(column)
+        if count == self.built:
+            return
+        part = column[self.built:count].reshape(count - self.built, -1)
+        keys = part.ravel()
+        rows = np.repeat(np.arange(self.built, count), part.shape[1])
+        keep = keys >= 0
+        order = np.argsort(keys[keep], kind='stable')
+        keys, rows = keys[keep][order], rows[keep][order]
+        # 新项插入到相同键的已有项之后
+        at = np.searchsorted(self.keys, keys, 'right') + np.arange(len(keys))
+        mask = np.zeros(len(self.keys) + len(keys), dtype=bool)
+        mask[at] = True
+        merged = []
+        for old, new in ((self.keys, keys), (self.rows, rows)):
+            array = np.empty(len(mask), dtype=np.int64)
+            array[mask] = new
+            array[~mask] = old
+            merged.append(array)
+        self.keys, self.rows = merged
+        self.built = count
+
+    # keys对应的全部行号，以及每个行号来自keys中的第几个
+    def lookup(self, keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        low = np.searchsorted(self.keys, keys, 'left')
+        counts = np.searchsorted(self.keys, keys, 'right') - low
+        entries = np.repeat(low - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        return self.rows[entries], np.repeat(np.arange(len(keys)), counts)
+
+class Dependencies(object):
+    def __init__(self, model: 'SceneModel'):
+        self.model = model
+        self.children = _SortedIndex()
+        self.lines = _SortedIndex()
+        self.texts = _SortedIndex()
+
+    # 场景被整体替换（SceneModel.restore）后重新建立
+    def reset(self) -> None:
+        for index in (self.children, self.lines, self.texts):
+            index.reset()
+
+    # 移动节点，返回位置发生变化的节点、线与文本的行号；indices中重复的节点以最后一次为准
+    def moveNodes(self, indices, xy: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        model = self.model
+        indices = np.asarray(indices, dtype=np.int64).ravel()
+        xy = np.asarray(xy, dtype=float).reshape(-1, 2)
+        indices, last = np.unique(indices[::-1], return_index=True)
+        nodeXY = model.nodeXY.data
+        delta = xy[::-1][last] - nodeXY[indices]
+        # 子节点随最近的被移动祖先平移；父节点总是先于子节点创建，逐层向下不会重复访问
+        self.children.sync(model.nodeParent.data)
+        nodes, deltas = [indices], [delta]
+        frontier = indices
+        while len(frontier):
+            kids, owner = self.children.lookup(frontier)
+            keep = ~np.isin(kids, indices)
+            frontier, delta = kids[keep], delta[owner[keep]]
+            nodes.append(frontier)
+            deltas.append(delta)
+        nodes = np.concatenate(nodes)
+        nodeXY[nodes] += np.concatenate(deltas)
+        return nodes, self._updateLines(nodes), self._updateTexts(nodes)
+
+    def _updateLines(self, nodes: np.ndarray) -> np.ndarray:
+        model = self.model
+        self.lines.sync(model.lineNodes.data)
+        lines = np.unique(self.lines.lookup(nodes)[0])
+        ends = model.lineNodes.data[lines]
+        for side in (0, 1):
+            bound = ends[:, side] >= 0
+            model.lineXY.data[lines[bound], 2 * side:2 * side + 2] = model.nodeXY.data[ends[bound, side]]
+        return lines
+
+    def _updateTexts(self, nodes: np.ndarray) -> np.ndarray:
+        model = self.model
+        self.texts.sync(model.textNodes.data)
+        texts = np.unique(self.texts.lookup(nodes)[0])
+        ends = model.textNodes.data[texts]
+        a, b = model.nodeXY.data[ends[:, 0]], model.nodeXY.data[ends[:, 1]]
+        model.textXY.data[texts] = (a + b) / 2 + model.textOffset.data[texts]
+        pair = ends[:, 0] != ends[:, 1]
+        turn = pair & model.textParallel.data[texts]
+        angle = np.arctan2(b[turn, 1] - a[turn, 1], b[turn, 0] - a[turn, 0])
+        model.textRotation.data[texts[turn]] = np.degrees(angle) % 360
+        digits = model.textDigits.data[texts]
+        measure = np.flatnonzero(pair & (digits >= 0))
+        lengths = np.hypot(*(b[measure] - a[measure]).T)
+        for i, length in zip(measure.tolist(), lengths.tolist()):
+            model.textStr.data[texts[i]] = f'{length:.{digits[i]}f}'
+        return texts
+
+__all__ = ['Dependencies']
@@ -0,0 +1,114 @@
+"""
+列式存储
+场景中的节点、线、文本按列保存在NumPy数组中（位置、样式序号、文本等各占一列），
+每一行对应一个图元；NodeVar、LineVar、TextVar只是指向某一行的轻量视图。
+样式对象统一存放在样式表中，图元只保存样式序号。
+"""
+from typing import Optional, List, Dict, Tuple, Union
+
+import numpy as np
+
+from Nets.BaseMixin import CommonStyleMixin, TextStyleMixin, internStyle
+
+# 可增长的列，容量不足时按倍数扩容，data是有效部分的视图
+class Column(object):
+    __slots__ = ('_array', '_size')
+
+    def __init__(self, dtype, width: Optional[int] = None, capacity: int = 16):
+        shape = (capacity,) if width is None else (capacity, width)
+        self._array = np.empty(shape, dtype=dtype)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def data(self) -> np.ndarray:
+        return self._array[:self._size]
+
+    def _reserve(self, extra: int) -> None:
+        need = self._size + extra
+        if need <= len(self._array):
+            return
+        capacity = max(need, len(self._array) * 2)
+        array = np.empty((capacity,) + self._array.shape[1:], dtype=self._array.dtype)
+        array[:self._size] = self._array[:self._size]
+        self._array = array
+
+    # 追加一行，返回行号
+    def append(self, value) -> int:
+        self._reserve(1)
+        self._array[self._size] = value
+        self._size += 1
+        return self._size - 1
+
+    # 追加多行，返回行号范围
+    def extend(self, values: Union[np.ndarray, List]) -> range:
+        values = np.asarray(values, dtype=self._array.dtype) if self._array.dtype != object else values
+        count = len(values)
+        self._reserve(count)
+        start = self._size
+        self._array[start:start + count] = values
+        self._size += count
+        return range(start, self._size)
+
+    # 直接使用已有数组作为列的全部数据，不复制；之后追加时才会复制到新的数组
+    def assign(self, array: np.ndarray) -> None:
+        self._array = array
+        self._size = len(array)
+
+    def __getitem__(self, index):
+        return self.data[index]
+
+    def __setitem__(self, index, value):
+        self.data[index] = value
+
+# 样式的比较键，值相同的样式共用同一个序号；文本的rotation按图元单独保存，不参与比较
+def styleKey(style: CommonStyleMixin) -> Tuple:
+    if isinstance(style, TextStyleMixin):
+        return 'text', style.style, style.size, style.color, style.family
+    return 'common', style.style, style.size, style.color
+
+# 样式表：序号 -> 样式，值相同的样式共用同一个序号
+class StyleTable(object):
+    def __init__(self):
+        self.styles: List[CommonStyleMixin] = []
+        self._ids: Dict[CommonStyleMixin, int] = {}
+        # 按序号展开的样式属性，渲染时按图元的样式序号直接索引
+        self._columns: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.styles)
+
+    def __getitem__(self, index: int) -> CommonStyleMixin:
+        return self.styles[index]
+
+    # 样式不可修改且可以哈希，直接作为键；文本样式去掉角度后再比较
+    def intern(self, style: CommonStyleMixin) -> int:
+        if isinstance(style, TextStyleMixin) and style.rotation:
+            style = style.replace(rotation=0)
+        index = self._ids.get(style)
+        if index is None:
+            index = len(self.styles)
+            self.styles.append(internStyle(style))
+            self._ids[style] = index
+            self._columns.clear()
+        return index
+
+    # 所有样式的某个属性组成的数组，如column('size')[ids]即得到每个图元的大小
+    def column(self, name: str) -> np.ndarray:
+        array = self._columns.get(name)
+        if array is None:
+            if name == 'rgba':
+                from matplotlib.colors import to_rgba_array
+                array = to_rgba_array([s.color for s in self.styles]) if self.styles else np.empty((0, 4))
+            else:
+                values = [getattr(s, name) for s in self.styles]
+                array = np.empty(len(values), dtype=object)
+                array[:] = values
+                if name == 'size':
+                    array = array.astype(float)
+            self._columns[name] = array
+        return array
+
+__all__ = ['Column', 'StyleTable', 'styleKey']
@@ -0,0 +1,99 @@
+"""
+批量几何计算
+与NodeVar.measure、NodeVar.vertical_distance以及LineVar.theta、K、B、length、middle一一对应，
+一次处理多个节点或线，返回NumPy数组。
+节点可以传入NodeVar、Offset的序列或(N, 2)数组；线可以传入LineVar的序列或(M, 4)数组（起点x、y，终点x、y）。
+同一个场景中的NodeVar、LineVar会直接从场景模型的列中按行号取数据，不逐个读取属性。
+本模块只依赖NumPy。
+"""
+from typing import Iterable, Optional, Union
+
+import numpy as np
+
+Points = Union[np.ndarray, Iterable]
+Segments = Union[np.ndarray, Iterable]
+
+# 从视图序列中取出同一场景模型的行号，不是同一个模型时返回None
+def _rows(items: list, column: str):
+    model = getattr(items[0], '_model', None)
+    if model is None or any(getattr(item, '_model', None) is not model for item in items):
+        return None
+    return getattr(model, column)[[item._index for item in items]]
+
+# 转为(N, 2)的坐标数组
+def asPoints(nodes: Points) -> np.ndarray:
+    if isinstance(nodes, np.ndarray):
+        return nodes.reshape(-1, 2).astype(float, copy=False)
+    nodes = list(nodes)
+    if not nodes:
+        return np.empty((0, 2))
+    rows = _rows(nodes, 'nodeXY')
+    if rows is not None:
+        return rows
+    return np.array([(n.pos.x, n.pos.y) if hasattr(n, 'pos') else (n.x, n.y) for n in nodes], dtype=float)
+
+# 转为(M, 4)的线段数组
+def asSegments(lines: Segments) -> np.ndarray:
+    if isinstance(lines, np.ndarray):
+        return lines.reshape(-1, 4).astype(float, copy=False)
+    lines = list(lines)
+    if not lines:
+        return np.empty((0, 4))
+    rows = _rows(lines, 'lineXY')
+    if rows is not None:
+        return rows
+    return np.array([(l.start.x, l.start.y, l.to.x, l.to.y) for l in lines], dtype=float)
+
+# 两组节点两两之间的距离矩阵(N, K)，只传一组时计算组内距离
+def distanceMatrix(nodes: Points, others: Optional[Points] = None) -> np.ndarray:
+    a = asPoints(nodes)
+    b = a if others is None else asPoints(others)
+    return np.hypot(a[:, None, 0] - b[None, :, 0], a[:, None, 1] - b[None, :, 1])
+
+# 两组节点逐个对应的距离(N,)
+def measures(nodes: Points, others: Points) -> np.ndarray:
+    a, b = asPoints(nodes), asPoints(others)
+    return np.hypot(a[:, 0] - b[:, 0], a[:, 1] - b[:, 1])
+
+# 每个节点到每条线所在直线的垂距(N, M)；长度为0的线退化为到该点的距离
+def pointLineDistances(nodes: Points, lines: Segments) -> np.ndarray:
+    p = asPoints(nodes)
+    s = asSegments(lines)
+    dx, dy = s[:, 2] - s[:, 0], s[:, 3] - s[:, 1]
+    px = p[:, None, 0] - s[None, :, 0]
+    py = p[:, None, 1] - s[None, :, 1]
+    length = np.hypot(dx, dy)
+    cross = np.abs(dx * py - dy * px)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(length > 0, cross / np.where(length > 0, length, 1), np.hypot(px, py))
+
+# 线相对于x轴正方向的夹角，度数，范围0 ~ 360
+def thetas(lines: Segments) -> np.ndarray:
+    s = asSegments(lines)
+    return np.degrees(np.arctan2(s[:, 3] - s[:, 1], s[:, 2] - s[:, 0])) % 360
+
+# 斜率，竖直的线为inf
+def slopes(lines: Segments) -> np.ndarray:
+    s = asSegments(lines)
+    dx, dy = s[:, 2] - s[:, 0], s[:, 3] - s[:, 1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(dx == 0, np.inf, dy / np.where(dx == 0, 1, dx))
+
+# 截距，竖直的线为nan
+def intercepts(lines: Segments) -> np.ndarray:
+    s = asSegments(lines)
+    k = slopes(s)
+    with np.errstate(invalid='ignore'):
+        return np.where(np.isinf(k), np.nan, s[:, 1] - s[:, 0] * np.where(np.isinf(k), 0, k))
+
+def lengths(lines: Segments) -> np.ndarray:
+    s = asSegments(lines)
+    return np.hypot(s[:, 2] - s[:, 0], s[:, 3] - s[:, 1])
+
+# 中点(M, 2)
+def middles(lines: Segments) -> np.ndarray:
+    s = asSegments(lines)
+    return (s[:, :2] + s[:, 2:]) / 2
+
+__all__ = ['asPoints', 'asSegments', 'distanceMatrix', 'measures', 'pointLineDistances', 'thetas', 'slopes',
+           'intercepts', 'lengths', 'middles']
@@ -0,0 +1,206 @@
+"""
+图模型
+以场景模型中的节点行号为节点编号，由节点连成的线（lineNodes两端都不是-1）为边，维护压缩稀疏行（CSR）邻接表：
+- 每条边在邻接表中记录两次（u -> v与v -> u），另记录边的行号和是否与线的方向一致；
+  有向查询时带箭头的线只能沿箭头方向通过，普通线两个方向都可以通过
+- 增量维护：新添加的线在查询时排序后与已有的邻接表归并，不重新排序已有部分
+- 边的权重是线的长度（LineVar.length），查询时由当前端点计算，节点移动后自动生效
+- 连通分量：向量化的挂接与指针跳跃，每轮处理所有尚未合并的边，轮数约为O(log n)
+- 最短路径：基于CSR数组的delta-stepping，每次向量化地处理一个距离区间内的所有节点，指定终点时到达终点即停止
+- 高亮：一组节点与线合并为一个散点集合与一个LineCollection，绘制在其他图元之上
+本模块只依赖NumPy，高亮时才导入matplotlib。
+"""
+from typing import Optional, List, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from matplotlib.artist import Artist
+
+class Graph(object):
+    def __init__(self, model):
+        self.model = model
+        # 当前的高亮图元
+        self.overlay: List['Artist'] = []
+        self.reset()
+
+    # 清空邻接表，下一次查询时由全部的线重新建立
+    def reset(self) -> None:
+        # 已并入邻接表的线数
+        self.built = 0
+        # 按起点排序的邻接表项：起点、终点、线的行号、是否与线的方向一致
+        self.src = np.empty(0, dtype=np.int64)
+        self.dst = np.empty(0, dtype=np.int64)
+        self.line = np.empty(0, dtype=np.int64)
+        self.forward = np.empty(0, dtype=bool)
+        self._indptr: Optional[np.ndarray] = None
+
+    @property
+    def nodeCount(self) -> int:
+        return self.model.nodeCount
+
+    # 把新添加的线归并进邻接表
+    def _sync(self) -> None:
+        count = self.model.lineCount
+        if count == self.built:
+            return
+        rows = np.arange(self.built, count)
+        ends = self.model.lineNodes.data[rows]
+        keep = (ends >= 0).all(axis=1)
+        rows, ends = rows[keep], ends[keep]
+        src = np.concatenate((ends[:, 0], ends[:, 1]))
+        order = np.argsort(src, kind='stable')
+        new = (src[order], np.concatenate((ends[:, 1], ends[:, 0]))[order], np.concatenate((rows, rows))[order],
+               np.repeat([True, False], len(rows))[order])
+        # 新项插入到相同起点的已有项之后
+        at = np.searchsorted(self.src, new[0], 'right') + np.arange(len(new[0]))
+        mask = np.zeros(len(self.src) + len(new[0]), dtype=bool)
+        mask[at] = True
+        merged = []
+        for old, part in zip((self.src, self.dst, self.line, self.forward), new):
+            array = np.empty(len(mask), dtype=old.dtype)
+            array[mask] = part
+            array[~mask] = old
+            merged.append(array)
+        self.src, self.dst, self.line, self.forward = merged
+        self.built = count
+        self._indptr = None
+
+    # 每个节点的邻接表项在[indptr[i], indptr[i + 1])中
+    def indptr(self) -> np.ndarray:
+        self._sync()
+        if self._indptr is None or len(self._indptr) != self.nodeCount + 1:
+            self._indptr = np.concatenate(([0], np.cumsum(np.bincount(self.src, minlength=self.nodeCount))))
+        return self._indptr
+
+    # 可以通过的邻接表项，有向时去掉逆着箭头方向的项
+    def _passable(self, directed: bool) -> np.ndarray:
+        self._sync()
+        if not directed:
+            return np.ones(len(self.src), dtype=bool)
+        return self.forward | ~self.model.lineArrow.data[self.line]
+
+    # 边的权重：线的长度
+    def weights(self, lines: np.ndarray) -> np.ndarray:
+        xy = self.model.lineXY.data[lines]
+        return np.hypot(xy[:, 2] - xy[:, 0], xy[:, 3] - xy[:, 1])
+
+    # 节点的度（连接的线数），nodes默认是全部节点；有向时是出度
+    def degree(self, nodes=None, directed: bool = False) -> np.ndarray:
+        self._sync()
+        degree = np.bincount(self.src[self._passable(directed)], minlength=self.nodeCount)
+        return degree if nodes is None else degree[np.asarray(nodes, dtype=np.int64)]
+
+    # 相邻的节点与对应的线
+    def neighbors(self, node: int, directed: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        indptr = self.indptr()
+        part = slice(indptr[node], indptr[node + 1])
+        keep = self._passable(directed)[part]
+        return self.dst[part][keep], self.line[part][keep]
+
+    # 连通分量（忽略方向），返回每个节点所在分量的编号，编号按分量中最小的节点行号排列
+    def components(self) -> np.ndarray:
+        self._sync()
+        label = np.arange(self.nodeCount)
+        src, dst = self.src, self.dst
+        while True:
+            lu, lv = label[src], label[dst]
+            active = lu != lv
+            if not active.any():
+                break
+            src, dst, lu, lv = src[active], dst[active], lu[active], lv[active]
+            # 挂接：较大的根指向较小的根，之后指针跳跃直到每个节点直接指向根
+            np.minimum.at(label, np.maximum(lu, lv), np.minimum(lu, lv))
+            while True:
+                jump = label[label]
+                if (jump == label).all():
+                    break
+                label = jump
+        return np.unique(label, return_inverse=True)[1]
+
+    # 从source出发的单源最短路径，返回到各节点的距离与到达该节点所经过的线（-1表示未到达或起点）
+    # 使用delta-stepping：按距离把节点分到宽度为delta的桶中，每次向量化地松弛一整个桶，
+    # 桶内距离变短的节点重复松弛直到不再变化，结果与Dijkstra相同；delta默认是边的平均长度
+    # 指定target时target所在的桶确定后即停止，此时其余节点的结果不完整
+    def shortestPaths(self, source: int, target: int = -1, directed: bool = False,
+                      delta: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        indptr = self.indptr()
+        weight = np.where(self._passable(directed), self.weights(self.line), np.inf)
+        if delta is None:
+            finite = weight[np.isfinite(weight)]
+            delta = float(finite.mean()) if len(finite) else 1.
+        delta = max(delta, 1e-12)
+        dist = np.full(self.nodeCount, np.inf)
+        via = np.full(self.nodeCount, -1, dtype=np.int64)
+        done = np.zeros(self.nodeCount, dtype=bool)
+        dist[source] = 0.
+        while True:
+            pending = np.flatnonzero(~done & np.isfinite(dist))
+            if not len(pending):
+                break
+            high = (np.floor(dist[pending].min() / delta) + 1) * delta
+            frontier = pending[dist[pending] < high]
+            bucket = [frontier]
+            while len(frontier):
+                counts = indptr[frontier + 1] - indptr[frontier]
+                entries = np.repeat(indptr[frontier], counts) + np.arange(counts.sum()) - \
+                    np.repeat(np.cumsum(counts) - counts, counts)
+                u, v = np.repeat(frontier, counts), self.dst[entries]
+                nd = dist[u] + weight[entries]
+                better = nd < dist[v]
+                v, nd, entries = v[better], nd[better], entries[better]
+                np.minimum.at(dist, v, nd)
+                # 同一节点被多次改进时，记录取到最小值的一项
+                win = nd == dist[v]
+                via[v[win]] = self.line[entries[win]]
+                frontier = np.unique(v[nd < high])
+                bucket.append(frontier)
+            done[np.concatenate(bucket)] = True
+            if 0 <= target and done[target]:
+                break
+        return dist, via
+
+    # source到target的最短路径，返回经过的节点、线与总长度；不可达时返回空数组与inf
+    def shortestPath(self, source: int, target: int, directed: bool = False) -> Tuple[np.ndarray, np.ndarray, float]:
+        dist, via = self.shortestPaths(source, target, directed)
+        if not np.isfinite(dist[target]):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), float('inf')
+        ends = self.model.lineNodes.data
+        nodes, lines = [target], []
+        node = target
+        while node != source:
+            line = int(via[node])
+            lines.append(line)
+            a, b = ends[line]
+            node = int(a if b == node else b)
+            nodes.append(node)
+        return np.array(nodes[::-1], dtype=np.int64), np.array(lines[::-1], dtype=np.int64), float(dist[target])
+
+    # 高亮一组节点与线，替换之前的高亮；size为None时在原尺寸（线宽）上加大
+    # 高亮图元记录的是当前的位置，之后移动节点不会随之更新
+    def highlight(self, nodes=None, lines=None, color='red', size: Optional[float] = None) -> List['Artist']:
+        from matplotlib.collections import LineCollection
+        self.clear()
+        model = self.model
+        ax = model.ax
+        sizes = model.styles.column('size')
+        if lines is not None and len(lines):
+            lines = np.asarray(lines, dtype=np.int64)
+            width = sizes[model.lineStyle.data[lines]] + 2 if size is None else size
+            collection = LineCollection(model.lineXY.data[lines].reshape(-1, 2, 2), colors=color, linewidths=width,
+                                        zorder=4)
+            ax.add_collection(collection, autolim=False)
+            self.overlay.append(collection)
+        if nodes is not None and len(nodes):
+            nodes = np.asarray(nodes, dtype=np.int64)
+            xy = model.nodeXY.data[nodes]
+            marker = sizes[model.nodeStyle.data[nodes]] + 4 if size is None else np.full(len(nodes), size)
+            self.overlay.append(ax.scatter(xy[:, 0], xy[:, 1], s=marker ** 2, c=color, zorder=5))
+        return self.overlay
+
+    def clear(self) -> None:
+        for artist in self.overlay:
+            artist.remove()
+        self.overlay = []
+
+__all__ = ['Graph']
@@ -0,0 +1,223 @@
+"""
+导入
+把已有的网络数据批量导入场景，节点、线、文本各自一次写入场景模型，使用现有的样式类：
+- 边表CSV/TSV：列名source、target（必需），weight、label（可选）；
+  可以另给一个节点表，列名id、x、y（必需），label（可选）
+- GraphML：节点的x、y、label与边的weight、label从同名的<key>属性读取，有向图的边带箭头
+CSV/TSV的解析全部基于NumPy：文件以内存映射方式读取，按字节查找换行与分隔符，
+每次处理_Block行，把字段切成定长字节串数组后由NumPy转换为数值，不为每一行创建Python对象；
+不支持在引号中包含分隔符或换行的字段。
+节点编号可以是任意字符串，全部是数字时按整数处理；没有位置的节点放在原点，之后可以调用NetScene.layout。
+空标签不创建文本；节点标签放在节点右侧，边标签放在线的中点上方，与addNodeSigns、TextVar.length的默认位置一致，并锚定在对应的节点上。
+"""
+from typing import Dict, List, Optional, Tuple
+import xml.etree.ElementTree as ElementTree
+
+import numpy as np
+
+from Nets.BaseMixin import CommonStyleMixin, TextStyleMixin
+
+# 每次处理的行数与查找换行时每次扫描的字节数
+_Block = 1 << 18
+_Scan = 1 << 26
+
+# 每一行的起止位置（不含换行符），跳过空行
+def _lines(buf: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    newline = np.concatenate([np.flatnonzero(buf[at:at + _Scan] == 10) + at for at in range(0, len(buf), _Scan)] or
+                             [np.empty(0, dtype=np.int64)])
+    starts = np.concatenate(([0], newline + 1))
+    ends = np.concatenate((newline, [len(buf)]))
+    # Windows换行的\r
+    ends = ends - ((ends > starts) & (buf[np.maximum(ends - 1, 0)] == 13))
+    keep = ends > starts
+    return starts[keep], ends[keep]
+
+# 把[start, end)中的字节切成定长字节串数组，去掉两端的空格与引号
+def _strings(buf: np.ndarray, start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    # 两端需要去掉的字符通常很少，逐个字符移动起止位置，不逐个处理字符串
+    start, end = start.copy(), end.copy()
+    for at, step in ((start, 1), (end, -1)):
+        while True:
+            chars = buf[np.maximum(at - (step < 0), 0)]
+            trim = np.flatnonzero((start < end) & ((chars == 32) | (chars == 34)))
+            if not len(trim):
+                break
+            at[trim] += step
+    length = end - start
+    width = max(int(length.max()), 1) if len(length) else 1
+    index = np.minimum(start[:, None] + np.arange(width), len(buf) - 1)
+    chars = np.asarray(buf[index])
+    chars[np.arange(width) >= length[:, None]] = 0
+    return np.ascontiguousarray(chars).view(f'S{width}').ravel()
+
+# 全部由数字组成的字节串数组直接按字节计算整数，不是时返回None
+def _integers(values: np.ndarray) -> Optional[np.ndarray]:
+    width = values.dtype.itemsize
+    if values.dtype.kind != 'S' or not len(values) or width > 18:
+        return None
+    chars = values.view(np.uint8).reshape(-1, width)
+    filled = chars != 0
+    # 字节串去掉了两端的空白，数字之后只有补齐的0字节
+    if not ((chars >= 48) & (chars <= 57) | ~filled).all() or not filled[:, 0].all():
+        return None
+    result = np.zeros(len(values), dtype=np.int64)
+    for column in range(width):
+        result = np.where(filled[:, column], result * 10 + chars[:, column] - 48, result)
+    return result
+
+# 读取分隔的表格，返回所需列的字节串数组；optional中的列不存在时不返回
+def _readTable(fileName: str, delimiter: Optional[str], required: List[str],
+               optional: List[str]) -> Dict[str, np.ndarray]:
+    buf = np.memmap(fileName, dtype=np.uint8, mode='r')
+    starts, ends = _lines(buf)
+    if not len(starts):
+        raise ValueError(f'{fileName}是空文件')
+    head = bytes(buf[starts[0]:ends[0]]).decode('U8').lstrip('\ufeff')
+    if delimiter is None:
+        delimiter = '\t' if fileName.lower().endswith(('.tsv', '.tab')) or '\t' in head else ','
+    names = [name.strip().strip('"').lower() for name in head.split(delimiter)]
+    missing = [name for name in required if name not in names]
+    if missing:
+        raise ValueError(f'{fileName}缺少列：{", ".join(missing)}')
+    wanted = {name: names.index(name) for name in required + optional if name in names}
+    code = ord(delimiter)
+    last = len(names) - 1
+    parts: Dict[str, List[np.ndarray]] = {name: [] for name in wanted}
+    for first in range(1, len(starts), _Block):
+        start, end = starts[first:first + _Block], ends[first:first + _Block]
+        low, high = int(start[0]), int(end[-1])
+        marks = np.flatnonzero(buf[low:high] == code) + low
+        # 每行恰好有last个分隔符时，第i行的分隔符就是marks[i * last:(i + 1) * last]
+        table = marks.reshape(-1, last) if len(marks) == len(start) * last else None
+        if table is None or not ((table[:, 0] >= start) & (table[:, -1] < end)).all():
+            counts = np.searchsorted(marks, end) - np.searchsorted(marks, start)
+            wrong = np.flatnonzero(counts != last)
+            raise ValueError(f'{fileName}第{first + int(wrong[0]) + 1}个非空行的列数与表头不一致')
+        for name, column in wanted.items():
+            a = start if column == 0 else table[:, column - 1] + 1
+            b = end if column == last else table[:, column]
+            parts[name].append(_strings(buf, a, b))
+    return {name: np.concatenate(arrays) if arrays else np.empty(0, dtype='S1') for name, arrays in parts.items()}
+
+# 字节串（或字符串）数组转为数值，空字段是nan
+def _numbers(values: np.ndarray) -> np.ndarray:
+    # 至少能放下'nan'
+    width = max(values.dtype.itemsize // np.dtype(values.dtype.kind + '1').itemsize, 3)
+    values = values.astype(f'{values.dtype.kind}{width}')
+    values[values == values.dtype.type()] = 'nan' if values.dtype.kind == 'U' else b'nan'
+    return values.astype(np.float64)
+
+def _texts(values: np.ndarray) -> np.ndarray:
+    texts = np.char.decode(values, 'U8') if values.dtype.kind == 'S' else values
+    return texts.astype(object)
+
+# 非空标签的位置、文本与锚定的两个节点（见Dependency）
+def _labels(xy: np.ndarray, values: np.ndarray, ends: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    keep = values != values.dtype.type()
+    return xy[keep], _texts(values[keep]), ends[keep]
+
+# 把节点编号、边与标签写入场景，返回新节点的行号范围、新线的行号范围、节点编号（按行号排列）与边的权重
+def _build(scene, nodeKeys: np.ndarray, xy: Optional[np.ndarray], nodeLabels: Optional[np.ndarray],
+           src: np.ndarray, dst: np.ndarray, weights: Optional[np.ndarray], edgeLabels: Optional[np.ndarray],
+           arrow: bool, nodestyle: CommonStyleMixin, linestyle: CommonStyleMixin, textstyle: TextStyleMixin
+           ) -> Tuple[range, range, np.ndarray, Optional[np.ndarray]]:
+    model = scene.model
+    keys = np.concatenate((nodeKeys, src, dst))
+    if len(keys) and (keys == keys.dtype.type()).any():
+        raise ValueError('节点编号不能为空')
+    # 编号全部是数字时按整数比较，'7'与'007'是同一个节点
+    numbers = _integers(keys)
+    if numbers is None and len(keys) and keys.dtype.kind == 'U' and np.char.isdigit(keys).all():
+        numbers = keys.astype(np.int64)
+    if numbers is not None and int(numbers.max()) < 4 * len(numbers):
+        # 编号较密集时用计数代替排序
+        present = np.zeros(int(numbers.max()) + 1, dtype=bool)
+        present[numbers] = True
+        unique = np.flatnonzero(present)
+        inverse = (np.cumsum(present) - 1)[numbers]
+    else:
+        unique, inverse = np.unique(keys if numbers is None else numbers, return_inverse=True)
+        inverse = inverse.ravel()
+    count = len(nodeKeys)
+    position = np.zeros((len(unique), 2))
+    if xy is not None and count:
+        position[inverse[:count]] = np.nan_to_num(xy)
+    nodes = model.addNodes(position, nodestyle)
+    base = nodes.start
+    ends = np.column_stack((inverse[count:count + len(src)], inverse[count + len(src):])) + base
+    points = model.nodeXY.data
+    lines = model.addLines(np.hstack((points[ends[:, 0]], points[ends[:, 1]])), linestyle, arrow, ends)
+    if nodeLabels is not None and count:
+        gap = (nodestyle.size + textstyle.size) * 0.05
+        rows = inverse[:count] + base
+        xy, texts, anchors = _labels(points[rows] + (gap, 0), nodeLabels, np.column_stack((rows, rows)))
+        model.addTexts(xy, texts, textstyle, nodes=anchors)
+    if edgeLabels is not None and len(src):
+        gap = (linestyle.size + textstyle.size) * 0.05
+        segments = model.lineXY.data[lines.start:lines.stop]
+        xy, texts, anchors = _labels((segments[:, :2] + segments[:, 2:]) / 2 + (0, gap), edgeLabels, ends)
+        model.addTexts(xy, texts, textstyle, nodes=anchors)
+    return nodes, lines, unique, weights
+
+# 导入边表（与可选的节点表），delimiter为None时按扩展名或表头推断
+def importEdgeList(scene, fileName: str, nodeFile: Optional[str], delimiter: Optional[str], arrow: bool,
+                   nodestyle: CommonStyleMixin, linestyle: CommonStyleMixin, textstyle: TextStyleMixin
+                   ) -> Tuple[range, range, np.ndarray, Optional[np.ndarray]]:
+    edges = _readTable(fileName, delimiter, ['source', 'target'], ['weight', 'label'])
+    nodeKeys, xy, nodeLabels = np.empty(0, dtype='S1'), None, None
+    if nodeFile is not None:
+        table = _readTable(nodeFile, delimiter, ['id', 'x', 'y'], ['label'])
+        nodeKeys = table['id']
+        xy = np.column_stack((_numbers(table['x']), _numbers(table['y'])))
+        nodeLabels = table.get('label')
+    weights = _numbers(edges['weight']) if 'weight' in edges else None
+    return _build(scene, nodeKeys, xy, nodeLabels, edges['source'], edges['target'], weights, edges.get('label'),
+                  arrow, nodestyle, linestyle, textstyle)
+
+# 导入GraphML，arrow为None时由图的edgedefault决定
+def importGraphML(scene, fileName: str, arrow: Optional[bool], nodestyle: CommonStyleMixin,
+                  linestyle: CommonStyleMixin, textstyle: TextStyleMixin
+                  ) -> Tuple[range, range, np.ndarray, Optional[np.ndarray]]:
+    # <key>的id -> (作用对象, 属性名)
+    keys: Dict[str, Tuple[str, str]] = {}
+    nodes: Dict[str, list] = {'id': [], 'x': [], 'y': [], 'label': []}
+    edges: Dict[str, list] = {'source': [], 'target': [], 'weight': [], 'label': []}
+    directed = False
+    for event, elem in ElementTree.iterparse(fileName, events=('start', 'end')):
+        tag = elem.tag.rsplit('}', 1)[-1]
+        if event == 'start':
+            if tag == 'graph':
+                directed = elem.get('edgedefault') == 'directed'
+            continue
+        if tag == 'key':
+            keys[elem.get('id')] = (elem.get('for'), (elem.get('attr.name') or elem.get('id')).lower())
+        elif tag in ('node', 'edge'):
+            data = {}
+            for child in elem:
+                if child.tag.rsplit('}', 1)[-1] == 'data' and child.get('key') in keys:
+                    data[keys[child.get('key')][1]] = (child.text or '').strip()
+            if tag == 'node':
+                nodes['id'].append(elem.get('id'))
+                for name in ('x', 'y', 'label'):
+                    nodes[name].append(data.get(name, ''))
+            else:
+                edges['source'].append(elem.get('source'))
+                edges['target'].append(elem.get('target'))
+                for name in ('weight', 'label'):
+                    edges[name].append(data.get(name, ''))
+            # 释放已经读取的元素，内存只与尚未结束的元素有关
+            elem.clear()
+    # 节点与边各自声明了哪些属性
+    nodeUsed = {name for domain, name in keys.values() if domain in ('node', 'all')}
+    edgeUsed = {name for domain, name in keys.values() if domain in ('edge', 'all')}
+    array = lambda values: np.array(values, dtype=str) if values else np.empty(0, dtype='U1')
+    xy = None
+    if 'x' in nodeUsed and 'y' in nodeUsed:
+        xy = np.column_stack((_numbers(array(nodes['x'])), _numbers(array(nodes['y']))))
+    weights = _numbers(array(edges['weight'])) if 'weight' in edgeUsed else None
+    return _build(scene, array(nodes['id']), xy, array(nodes['label']) if 'label' in nodeUsed else None,
+                  array(edges['source']), array(edges['target']), weights,
+                  array(edges['label']) if 'label' in edgeUsed else None,
+                  directed if arrow is None else arrow, nodestyle, linestyle, textstyle)
+
+__all__ = ['importEdgeList', 'importGraphML']
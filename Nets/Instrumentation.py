@@ -0,0 +1,136 @@
+"""
+性能统计
+开启后在场景实例上包装以下方法，记录调用次数与耗时，关闭时撤销包装，没有任何额外开销：
+- NetScene的公开API（addBindsToAll、drawPathWithNodeAndText等），按方法名累计，包含其中嵌套调用的时间
+- 场景模型的materialize（生成图元）、画布的draw（matplotlib绘制）与savefig（编码）
+各阶段的时间不重叠：每次调用只把扣除嵌套调用后的部分计入自己的阶段，如save中的draw计入绘制而不是编码。
+- build：构造图元（API方法，含BaseVar中的几何计算与写入场景模型）
+- layout：layout、placeLabels、solveConstraints
+- query：空间查询与图查询
+- render：生成matplotlib图元
+- draw：matplotlib绘制
+- encode：savefig中绘制之外的部分（编码、写文件）以及save中缓存的查找
+hooks中的函数在每次调用结束时收到(名称, 阶段, 秒数)，名称是API方法名或阶段名，秒数包含嵌套调用，可用于转发到外部的监控系统。
+"""
+from typing import Callable, Dict, List, Optional, Tuple
+from collections import Counter
+from functools import wraps
+from time import perf_counter
+import inspect
+
+Hook = Callable[[str, str, float], None]
+
+# 不计时的方法：阻塞的窗口、释放资源与统计本身
+_Skip = {'show', 'close', 'instrument', 'stats'}
+
+_Phases = {
+    'layout': 'layout',
+    'placeLabels': 'layout',
+    'solveConstraints': 'layout',
+    'render': 'render',
+    'save': 'encode',
+    'saveBytes': 'encode',
+    'save_many': 'encode',
+}
+_Queries = {
+    'nearestNode', 'nearestNodes', 'nodesInRadius', 'nodesInBox', 'nearestLine', 'linesInBox', 'linesCrossing',
+    'degree', 'neighbors', 'components', 'shortestPath'
+}
+for _name in _Queries:
+    _Phases[_name] = 'query'
+
+class Instrumentation(object):
+    def __init__(self, hooks: List[Hook] = ()):
+        self.hooks = list(hooks)
+        # 阶段 -> [调用次数, 秒数]
+        self.phases: Dict[str, List[float]] = {}
+        # API方法 -> [调用次数, 秒数]
+        self.methods: Dict[str, List[float]] = {}
+        # 正在进行的调用中嵌套调用的累计时间
+        self._inner: List[float] = []
+        self._wrapped: List[Tuple[object, str]] = []
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._wrapped)
+
+    # 包装场景、场景模型与画布上的方法
+    def attach(self, scene) -> None:
+        if self.enabled:
+            return
+        for name, value in vars(type(scene)).items():
+            if name.startswith('_') or name in _Skip or not inspect.isfunction(value):
+                continue
+            self._wrap(scene, name, _Phases.get(name, 'build'), name)
+        self._wrap(scene.model, 'materialize', 'render')
+        self._wrap(scene.figure, 'draw', 'draw')
+        self._wrap(scene.figure, 'savefig', 'encode')
+
+    # 撤销包装，已记录的数据保留
+    def detach(self) -> None:
+        for owner, name in reversed(self._wrapped):
+            delattr(owner, name)
+        self._wrapped.clear()
+
+    def reset(self) -> None:
+        self.phases.clear()
+        self.methods.clear()
+
+    # 包装为实例属性，撤销时删除即可恢复为类上的方法
+    def _wrap(self, owner, name: str, phase: str, method: Optional[str] = None) -> None:
+        original = getattr(owner, name)
+        inner = self._inner
+
+        @wraps(original)
+        def timed(*args, **kwargs):
+            inner.append(0.)
+            start = perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                elapsed = perf_counter() - start
+                nested = inner.pop()
+                if inner:
+                    inner[-1] += elapsed
+                self._add(self.phases, phase, elapsed - nested)
+                if method is not None:
+                    self._add(self.methods, method, elapsed)
+                for hook in self.hooks:
+                    hook(method or phase, phase, elapsed)
+
+        setattr(owner, name, timed)
+        self._wrapped.append((owner, name))
+
+    @staticmethod
+    def _add(table: Dict[str, List[float]], key: str, seconds: float) -> None:
+        entry = table.get(key)
+        if entry is None:
+            table[key] = [1, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+
+    @staticmethod
+    def _table(table: Dict[str, List[float]]) -> Dict[str, dict]:
+        return {key: dict(calls=int(calls), seconds=seconds)
+                for key, (calls, seconds) in sorted(table.items(), key=lambda item: -item[1][1])}
+
+    def report(self) -> dict:
+        return dict(
+            enabled=self.enabled,
+            seconds=sum(seconds for _, seconds in self.phases.values()),
+            phases=self._table(self.phases),
+            methods=self._table(self.methods),
+        )
+
+# 场景中的元素数与坐标系中按类型统计的图元数，不需要开启统计
+def counts(scene) -> dict:
+    model = scene.model
+    arrows = int(model.lineArrow.data.sum())
+    return dict(
+        elements=dict(node=model.nodeCount, line=model.lineCount - arrows, arrow=arrows, text=model.textCount),
+        artists=dict(Counter(type(artist).__name__ for artist in scene.ax.get_children()).most_common()),
+        pending=model.dirty,
+    )
+
+__all__ = ['Instrumentation', 'counts']
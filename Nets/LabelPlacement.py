@@ -0,0 +1,120 @@
+"""
+标签布置
+为文本选择互不重叠的位置：每个文本从首选位置（当前位置）开始，依次尝试周围的候选位置，
+与已放置的文本或障碍物（如节点）重叠时换下一个候选位置。
+- 文本范围由字号、字数、行数与角度估算（单位是点），旋转后取外接矩形
+- 每一轮所有未放置的文本同时尝试同一个候选位置，重叠检测使用均匀网格：
+  矩形按所覆盖的格子排序后配对，只比较同一格子中的矩形，每轮约O(n log n)
+- 同一轮中互相重叠的文本，序号小的优先
+本模块只依赖NumPy。
+"""
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+
+# 字符平均宽度与行高，相对于字号
+_CharWidth = .6
+_LineHeight = 1.2
+# 候选方向，乘以文本自身的宽高；第一个是首选位置本身
+_Directions = np.array([(0, 0), (0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (-1, 1), (1, -1), (-1, -1)], dtype=float)
+
+# 文本外接矩形的宽高(N, 2)，单位与fontsizes相同
+def labelExtents(texts: Iterable[str], fontsizes, rotations=None) -> np.ndarray:
+    texts = [str(text).split('\n') for text in texts]
+    chars = np.array([max(map(len, lines)) for lines in texts], dtype=float)
+    lines = np.array([len(lines) for lines in texts], dtype=float)
+    size = np.broadcast_to(np.asarray(fontsizes, dtype=float), chars.shape)
+    w, h = chars * size * _CharWidth, lines * size * _LineHeight
+    if rotations is None:
+        return np.column_stack((w, h))
+    t = np.radians(np.asarray(rotations, dtype=float))
+    c, s = np.abs(np.cos(t)), np.abs(np.sin(t))
+    return np.column_stack((w * c + h * s, w * s + h * c))
+
+def _boxes(centers: np.ndarray, sizes: np.ndarray) -> np.ndarray:
+    return np.hstack((centers - sizes / 2, centers + sizes / 2))
+
+# 矩形覆盖的格子，返回(矩形序号, 格子键)
+def _cells(boxes: np.ndarray, cell: float) -> Tuple[np.ndarray, np.ndarray]:
+    low = np.floor(boxes[:, :2] / cell).astype(np.int64)
+    high = np.floor(boxes[:, 2:] / cell).astype(np.int64)
+    span = high - low + 1
+    counts = span[:, 0] * span[:, 1]
+    owner = np.repeat(np.arange(len(boxes)), counts)
+    offset = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    cx = low[owner, 0] + offset % span[owner, 0]
+    cy = low[owner, 1] + offset // span[owner, 0]
+    return owner, (cx << 32) + cy
+
+# 两组矩形中互相重叠的(i, j)对，inner为True时是组内比较，只返回i < j的对
+def overlapPairs(a: np.ndarray, b: np.ndarray, cell: float, inner: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    empty = np.empty(0, dtype=np.int64)
+    if not len(a) or not len(b):
+        return empty, empty
+    ia, ka = _cells(a, cell)
+    ib, kb = _cells(b, cell)
+    order = np.argsort(kb, kind='stable')
+    ib, kb = ib[order], kb[order]
+    first = np.searchsorted(kb, ka, 'left')
+    counts = np.searchsorted(kb, ka, 'right') - first
+    i = np.repeat(ia, counts)
+    j = ib[np.repeat(first, counts) + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)]
+    keep = (a[i, 0] < b[j, 2]) & (a[i, 2] > b[j, 0]) & (a[i, 1] < b[j, 3]) & (a[i, 3] > b[j, 1])
+    if inner:
+        keep &= i < j
+    # 跨越多个格子的两个矩形可能被配对多次
+    pair = np.unique(i[keep] * len(b) + j[keep])
+    return pair // len(b), pair % len(b)
+
+# 布置文本，返回新的中心位置(N, 2)与是否找到不重叠位置的掩码(N,)
+# anchors：首选位置(N, 2)；sizes：文本外接矩形宽高(N, 2)，与坐标同一单位
+# obstacles：不能覆盖的矩形(K, 4)，依次是xmin、ymin、xmax、ymax
+# rings：候选位置的圈数，第r圈离首选位置r个文本宽高；gap：文本之间的额外间距
+def placeLabels(
+        anchors: np.ndarray,
+        sizes: np.ndarray,
+        obstacles: Optional[np.ndarray] = None,
+        rings: int = 2,
+        gap: float = 0
+) -> Tuple[np.ndarray, np.ndarray]:
+    anchors = np.asarray(anchors, dtype=float).reshape(-1, 2)
+    sizes = np.asarray(sizes, dtype=float).reshape(-1, 2) + gap
+    count = len(anchors)
+    result = anchors.copy()
+    placed = np.zeros(count, dtype=bool)
+    if not count:
+        return result, placed
+    fixed = np.empty((0, 4)) if obstacles is None else np.asarray(obstacles, dtype=float).reshape(-1, 4)
+    # 格子边长取常见文本尺寸的两倍，个别很长的文本跨越多个格子
+    cell = float(max(np.median(sizes.max(axis=1)) * 2, 1e-12))
+    # 已放置的矩形按块保存，每轮只与之前各块比较
+    blocks = [fixed] if len(fixed) else []
+    candidates = [(0, 0)] + [(r * dx, r * dy) for r in range(1, rings + 1) for dx, dy in _Directions[1:]]
+    for dx, dy in candidates:
+        pending = np.flatnonzero(~placed)
+        if not len(pending):
+            break
+        centers = anchors[pending] + sizes[pending] * (dx, dy)
+        boxes = _boxes(centers, sizes[pending])
+        # 0：待定，1：接受，-1：放弃
+        state = np.zeros(len(pending), dtype=np.int8)
+        for block in blocks:
+            hit, _ = overlapPairs(boxes, block, cell)
+            state[hit] = -1
+        # 同一轮中互相重叠时序号小的优先：没有待定或已接受的更小序号对手的文本被接受，
+        # 与已接受文本重叠的文本被放弃，每次至少确定序号最小的待定文本
+        i, j = overlapPairs(boxes, boxes, cell, inner=True)
+        while (state == 0).any():
+            active = (state[i] >= 0) & (state[j] >= 0)
+            beaten = np.zeros(len(pending), dtype=bool)
+            beaten[j[active]] = True
+            state[(state == 0) & ~beaten] = 1
+            state[j[(state[i] == 1) & (state[j] == 0)]] = -1
+        ok = state == 1
+        accepted = pending[ok]
+        result[accepted] = centers[ok]
+        placed[accepted] = True
+        blocks.append(boxes[ok])
+    return result, placed
+
+__all__ = ['labelExtents', 'overlapPairs', 'placeLabels']
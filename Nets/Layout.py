@@ -0,0 +1,183 @@
+"""
+力导向布局
+根据边表计算节点位置，全部基于NumPy向量化计算：
+- fruchtermanReingold：精确计算所有节点对之间的斥力，O(n²)，按行分块控制内存，适合几千个节点以内
+- barnesHut：斥力使用四叉树近似，远处的一组节点以其质心代替，O(n log n)，适合大规模网络
+两者参数一致：
+- edges：(M, 2)的节点序号对；count：节点总数
+- pos：(N, 2)的初始位置，用于热启动（例如上一次布局的结果）；不传时随机初始化
+- pinned：固定不动的节点序号或长度为N的布尔数组，这些节点必须在pos中给出位置
+- iterations：最大迭代次数；tol：平均位移小于tol * k时提前结束
+- k：理想边长，默认由布局范围和节点数估算；seed：随机初始化的种子
+返回(N, 2)的位置数组。
+本模块只依赖NumPy。
+"""
+from typing import Optional, Tuple, Callable
+
+import numpy as np
+
+# 初始化位置、固定掩码、布局范围与理想边长
+def _prepare(edges, count: int, pos, pinned, k, seed) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float, float]:
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    edges = edges[edges[:, 0] != edges[:, 1]]
+    fixed = np.zeros(count, dtype=bool)
+    if pinned is not None:
+        pinned = np.asarray(pinned)
+        if pinned.dtype == bool:
+            fixed[:] = pinned
+        else:
+            fixed[pinned.astype(np.int64)] = True
+    rng = np.random.default_rng(seed)
+    if pos is None:
+        if fixed.any():
+            raise ValueError('固定的节点需要在pos中给出位置')
+        xy = rng.random((count, 2))
+        scale = 1.0
+    else:
+        xy = np.array(pos, dtype=float).reshape(count, 2)
+        low, high = xy.min(axis=0), xy.max(axis=0)
+        scale = float(max((high - low).max(), 1e-9))
+        # 所有节点重合时（例如全部初始化为原点），在其周围随机展开
+        if scale < 1e-6:
+            scale = 1.0
+            free = ~fixed
+            xy[free] = low + rng.random((int(free.sum()), 2)) - .5
+    if k is None:
+        k = scale / np.sqrt(max(count, 1))
+    return edges, xy, fixed, scale, float(k)
+
+# 沿边的引力 d² / k，返回每个节点的位移
+def _attraction(xy: np.ndarray, edges: np.ndarray, k: float) -> np.ndarray:
+    delta = xy[edges[:, 0]] - xy[edges[:, 1]]
+    dist = np.maximum(np.hypot(delta[:, 0], delta[:, 1]), 1e-12)
+    force = delta * (dist / k)[:, None]
+    count = len(xy)
+    disp = np.empty_like(xy)
+    for axis in (0, 1):
+        disp[:, axis] = np.bincount(edges[:, 1], force[:, axis], count) - np.bincount(edges[:, 0], force[:, axis], count)
+    return disp
+
+# 精确的斥力 k² / d，按行分块计算
+def _exactRepulsion(xy: np.ndarray, k: float, block: int = 1024) -> np.ndarray:
+    disp = np.zeros_like(xy)
+    for start in range(0, len(xy), block):
+        part = xy[start:start + block]
+        delta = part[:, None, :] - xy[None, :, :]
+        dist2 = np.maximum((delta ** 2).sum(axis=-1), 1e-12)
+        index = np.arange(len(part))
+        dist2[index, start + index] = np.inf
+        disp[start:start + block] = (delta * (k * k / dist2)[..., None]).sum(axis=1)
+    return disp
+
+# 四叉树：逐层把节点按所在格子分组，记录每个格子的质量（节点数）与质心
+class _QuadTree(object):
+    def __init__(self, xy: np.ndarray, depth: int):
+        low = xy.min(axis=0)
+        self.side = float(max((xy.max(axis=0) - low).max(), 1e-12)) * (1 + 1e-9)
+        unit = (xy - low) / self.side
+        self.depth = depth
+        self.keys, self.mass, self.com, self.cell, self.first, self.last = [], [], [], [], [], []
+        for level in range(depth + 1):
+            n = 1 << level
+            ix = np.minimum((unit[:, 0] * n).astype(np.int64), n - 1)
+            iy = np.minimum((unit[:, 1] * n).astype(np.int64), n - 1)
+            keys, cell = np.unique((ix << level) | iy, return_inverse=True)
+            mass = np.bincount(cell, minlength=len(keys)).astype(float)
+            com = np.column_stack((np.bincount(cell, xy[:, 0], len(keys)), np.bincount(cell, xy[:, 1], len(keys))))
+            self.keys.append(keys)
+            self.mass.append(mass)
+            self.com.append(com / mass[:, None])
+            self.cell.append(cell)
+        # 子格子：按父格子排序后，每个父格子的子格子是连续的一段[first, last)
+        self.order = []
+        for level in range(depth):
+            keys = self.keys[level + 1]
+            child = level + 1
+            parent = ((keys >> child) >> 1 << level) | ((keys & ((1 << child) - 1)) >> 1)
+            parentIndex = np.searchsorted(self.keys[level], parent)
+            order = np.argsort(parentIndex, kind='stable')
+            bounds = np.searchsorted(parentIndex[order], np.arange(len(self.keys[level]) + 1))
+            self.order.append(order)
+            self.first.append(bounds[:-1])
+            self.last.append(bounds[1:])
+
+    # 每个节点受到的斥力，theta是张角阈值：格子边长 / 距离 < theta时用质心近似
+    def repulsion(self, xy: np.ndarray, k: float, theta: float) -> np.ndarray:
+        disp = np.zeros_like(xy)
+        bodies = np.arange(len(xy))
+        cells = np.zeros(len(xy), dtype=np.int64)
+        for level in range(self.depth + 1):
+            if not len(bodies):
+                break
+            mass = self.mass[level][cells]
+            com = self.com[level][cells]
+            inside = self.cell[level][bodies] == cells
+            leaf = (mass == 1) | (level == self.depth)
+            # 最深一层的格子里还有其他节点时，去掉自身后作为一个整体
+            own = inside & leaf & (mass > 1)
+            com[own] = (com[own] * mass[own, None] - xy[bodies[own]]) / (mass[own, None] - 1)
+            mass = np.where(own, mass - 1, mass)
+            delta = xy[bodies] - com
+            dist2 = np.maximum((delta ** 2).sum(axis=1), 1e-12)
+            far = ~inside & ((self.side / (1 << level)) ** 2 < theta * theta * dist2)
+            accept = far | (leaf & (~inside | own))
+            force = delta[accept] * (k * k * mass[accept] / dist2[accept])[:, None]
+            target = bodies[accept]
+            disp[:, 0] += np.bincount(target, force[:, 0], len(xy))
+            disp[:, 1] += np.bincount(target, force[:, 1], len(xy))
+            expand = ~accept & ~leaf
+            if level == self.depth or not expand.any():
+                break
+            bodies, cells = bodies[expand], cells[expand]
+            first, last = self.first[level][cells], self.last[level][cells]
+            counts = last - first
+            bodies = np.repeat(bodies, counts)
+            offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            cells = self.order[level][np.repeat(first, counts) + offsets]
+        return disp
+
+# 迭代：位移受温度限制，温度线性冷却
+def _run(edges, count, pos, pinned, iterations, tol, k, seed, repulsion: Callable) -> np.ndarray:
+    edges, xy, fixed, scale, k = _prepare(edges, count, pos, pinned, k, seed)
+    free = ~fixed
+    temperature = scale / 10
+    for step in range(iterations):
+        disp = repulsion(xy, k) + _attraction(xy, edges, k)
+        length = np.maximum(np.hypot(disp[:, 0], disp[:, 1]), 1e-12)
+        move = disp * (np.minimum(length, temperature) / length)[:, None]
+        move[fixed] = 0
+        xy += move
+        temperature = scale / 10 * (1 - (step + 1) / iterations)
+        if free.any() and np.hypot(move[free, 0], move[free, 1]).mean() < tol * k:
+            break
+    return xy
+
+def fruchtermanReingold(
+        edges,
+        count: int,
+        pos: Optional[np.ndarray] = None,
+        pinned=None,
+        iterations: int = 50,
+        tol: float = 1e-4,
+        k: Optional[float] = None,
+        seed: Optional[int] = None
+) -> np.ndarray:
+    return _run(edges, count, pos, pinned, iterations, tol, k, seed, _exactRepulsion)
+
+# depth是四叉树的最大层数，重合或非常接近的节点在最深一层合并
+def barnesHut(
+        edges,
+        count: int,
+        pos: Optional[np.ndarray] = None,
+        pinned=None,
+        iterations: int = 50,
+        tol: float = 1e-4,
+        k: Optional[float] = None,
+        seed: Optional[int] = None,
+        theta: float = .8,
+        depth: int = 16
+) -> np.ndarray:
+    return _run(edges, count, pos, pinned, iterations, tol, k, seed,
+                lambda xy, k: _QuadTree(xy, depth).repulsion(xy, k, theta))
+
+__all__ = ['fruchtermanReingold', 'barnesHut']
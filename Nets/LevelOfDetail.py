@@ -0,0 +1,273 @@
+"""
+细节层次
+在交互窗口中缩放、平移大规模网络时，只绘制与视口相交的图元：
+- 坐标范围变化（xlim_changed、ylim_changed）或画布大小变化后，在下一次绘制开始时统一更新一次，
+  通过空间索引取出视口内的节点与线；批量模式下原地修改集合的数据，普通模式下切换图元的可见性
+- 聚合小于一个像素的节点：落在同一个格子（边长pixel像素）中的同一marker的节点只绘制最上面的一个；
+  两端分别落在相同格子中的线也只绘制一条
+- 文本：字号小于minFont像素的不显示；视口内的文本按常见文本大小划分格子，每个格子只显示行号最小的一个，
+  避免整体视图中大量文本互相覆盖；文本图元在第一次显示时才生成，由一个图层统一绘制
+关闭（remove）后恢复绘制全部图元。
+"""
+from typing import List, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+from matplotlib.artist import Artist
+from matplotlib.text import Text
+from matplotlib.transforms import Bbox
+
+from Nets.LabelPlacement import labelExtents
+
+if TYPE_CHECKING:
+    from Nets.SceneModel import SceneModel
+
+# 多列整数键去重，返回每组第一次出现的位置
+def _firstUnique(columns: List[np.ndarray]) -> np.ndarray:
+    if not len(columns[0]):
+        return np.empty(0, dtype=np.int64)
+    key = np.zeros(len(columns[0]), dtype=np.int64)
+    span = 1
+    for column in columns:
+        column = column - column.min()
+        width = int(column.max()) + 1
+        span *= width
+        # 组合键可能溢出时按行去重
+        if span >= 1 << 62:
+            return np.unique(np.column_stack(columns), axis=0, return_index=True)[1]
+        key = key * width + column
+    return np.unique(key, return_index=True)[1]
+
+# 在坐标系中最先绘制，此时坐标范围与画布大小已经确定，更新其余图元的数据
+class _Hook(Artist):
+    def __init__(self, lod: 'LevelOfDetail'):
+        super().__init__()
+        self.lod = lod
+        self.set_zorder(-np.inf)
+
+    def draw(self, renderer) -> None:
+        self.lod.update()
+
+# 绘制当前显示的文本
+class _TextLayer(Artist):
+    def __init__(self, lod: 'LevelOfDetail'):
+        super().__init__()
+        self.lod = lod
+        self.set_zorder(3)
+
+    def _texts(self) -> List[Text]:
+        artists = self.lod.model.textArtists
+        return [artists[index] for index in self.lod.shown.tolist() if artists[index] is not None]
+
+    def draw(self, renderer) -> None:
+        if not self.get_visible():
+            return
+        for text in self._texts():
+            text.draw(renderer)
+
+    def get_window_extent(self, renderer=None) -> Bbox:
+        boxes = [text.get_window_extent(renderer) for text in self._texts()]
+        return Bbox.union(boxes) if boxes else Bbox.null()
+
+# pixel：节点聚合的格子边长（像素）；minFont：文本的最小字号（像素）；labelCell：文本格子相对于常见文本大小的倍数
+class LevelOfDetail(object):
+    def __init__(self, model: 'SceneModel', pixel: float = 1., minFont: float = 6., labelCell: float = 1.):
+        self.model = model
+        self.ax = model.ax
+        self.pixel = pixel
+        self.minFont = minFont
+        self.labelCell = labelCell
+        # 为True时下一次绘制前重新筛选；另外记录上次筛选时的画布大小
+        self.stale = True
+        self._canvas: Optional[Tuple[float, float, float]] = None
+        # 批量模式下每个节点所在集合的编号、各集合的marker与节点的最大尺寸，图元更新后重新计算
+        self._groups: Optional[Tuple[np.ndarray, List[str], float]] = None
+        # 文本外接矩形的宽高（点），文本变化后重新计算
+        self._extents: Optional[np.ndarray] = None
+        # 普通模式下节点、线当前的可见性，None表示全部可见
+        self._visible = {'node': None, 'line': None}
+        # 当前显示的文本行号
+        self.shown = np.empty(0, dtype=np.int64)
+        # 已生成的文本改由图层绘制
+        for index, text in enumerate(model.textArtists):
+            if text is not None:
+                text.remove()
+                model.textArtists[index] = None
+        self._hook = _Hook(self)
+        self._layer = _TextLayer(self)
+        self.ax.add_artist(self._hook)
+        self.ax.add_artist(self._layer)
+        self._cids = [self.ax.callbacks.connect(name, self._limitsChanged) for name in ('xlim_changed', 'ylim_changed')]
+        model.lod = self
+
+    def _limitsChanged(self, ax) -> None:
+        self.stale = True
+
+    # 场景模型生成图元后调用：图元的数据已更新，rows中的文本已变化
+    def invalidate(self, rows) -> None:
+        artists = self.model.textArtists
+        for index in rows:
+            artists[index] = None
+        self._groups = None
+        self._extents = None
+        self.stale = True
+
+    # 关闭细节层次，恢复绘制全部图元
+    def remove(self) -> None:
+        model = self.model
+        for cid in self._cids:
+            self.ax.callbacks.disconnect(cid)
+        self._hook.remove()
+        self._layer.remove()
+        model.lod = None
+        self._applyNodes(np.arange(model.nodeCount))
+        self._applyLines(np.arange(model.lineCount))
+        model.textArtists = [None] * model.textCount
+        model._dirty['text'].update(range(model.textCount))
+        model.materialize()
+        self.ax.stale = True
+
+    # 根据当前坐标范围与画布大小筛选要绘制的图元
+    def update(self) -> None:
+        bbox = self.ax.bbox
+        canvas = (bbox.width, bbox.height, self.ax.figure.dpi)
+        if not self.stale and canvas == self._canvas:
+            return
+        self.stale = False
+        self._canvas = canvas
+        (x0, x1), (y0, y1) = sorted(self.ax.get_xlim()), sorted(self.ax.get_ylim())
+        # 每个坐标单位对应的像素，以及1点对应的像素
+        scale = (canvas[0] / max(x1 - x0, 1e-300), canvas[1] / max(y1 - y0, 1e-300))
+        point = canvas[2] / 72
+        view = (x0, y0, x1, y1)
+        self._applyNodes(self._nodes(view, scale, point))
+        self._applyLines(self._lines(view, scale, point))
+        self.shown = self._texts(view, scale, point)
+        artists = self.model.textArtists
+        for index in self.shown.tolist():
+            if artists[index] is None:
+                artists[index] = self._makeText(index)
+
+    def _group(self) -> Tuple[np.ndarray, List[str], float]:
+        if self._groups is None:
+            model = self.model
+            styles = model.styles.column('style')
+            markers = sorted(set(styles.tolist()))
+            code = np.array([markers.index(marker) for marker in styles.tolist()], dtype=np.int64)
+            used = np.zeros(len(styles), dtype=bool)
+            used[model.nodeStyle.data] = True
+            size = float(model.styles.column('size')[used].max()) if used.any() else 0.
+            self._groups = (code[model.nodeStyle.data], markers, size)
+        return self._groups
+
+    # 把视口向外扩展pad像素
+    @staticmethod
+    def _expand(view, pad: float, scale) -> Tuple[float, float, float, float]:
+        return view[0] - pad / scale[0], view[1] - pad / scale[1], view[2] + pad / scale[0], view[3] + pad / scale[1]
+
+    # 视口内的格子序号
+    def _cells(self, xy: np.ndarray, view, scale) -> Tuple[np.ndarray, np.ndarray]:
+        return (np.floor((xy[:, 0] - view[0]) * scale[0] / self.pixel).astype(np.int64),
+                np.floor((xy[:, 1] - view[1]) * scale[1] / self.pixel).astype(np.int64))
+
+    def _nodes(self, view, scale, point: float) -> np.ndarray:
+        model = self.model
+        if not model.nodeCount:
+            return np.empty(0, dtype=np.int64)
+        code, _, size = self._group()
+        rows = model.spatialIndex().nodesInBox(*self._expand(view, size / 2 * point + 1, scale))
+        # 同一格子中同一marker的节点只保留最上面（行号最大）的一个
+        rows = rows[::-1]
+        first = _firstUnique([code[rows], *self._cells(model.nodeXY.data[rows], view, scale)])
+        return np.sort(rows[first])
+
+    def _lines(self, view, scale, point: float) -> np.ndarray:
+        model = self.model
+        if not model.lineCount:
+            return np.empty(0, dtype=np.int64)
+        width = float(model.styles.column('size')[model.lineStyle.data].max())
+        rows = model.spatialIndex().linesInBox(*self._expand(view, width * point + 1, scale))
+        # 两端都在视口附近的线按两端所在格子去重，其余的线直接保留
+        xy = model.lineXY.data[rows]
+        x1, y1 = self._cells(xy[:, :2], view, scale)
+        x2, y2 = self._cells(xy[:, 2:], view, scale)
+        reach = max(self._canvas[0], self._canvas[1]) / self.pixel
+        cells = np.column_stack((x1, y1, x2, y2))
+        near = ((cells >= -reach) & (cells <= 2 * reach)).all(axis=1)
+        arrow = model.lineArrow.data[rows]
+        kept = [rows[~near]]
+        for group in (near & arrow, near & ~arrow):
+            part = rows[group]
+            kept.append(part[_firstUnique([cells[group, i] for i in range(4)])])
+        return np.sort(np.concatenate(kept))
+
+    def _texts(self, view, scale, point: float) -> np.ndarray:
+        model = self.model
+        if not model.textCount:
+            return np.empty(0, dtype=np.int64)
+        fontsize = model.styles.column('size')[model.textStyle.data]
+        if self._extents is None:
+            self._extents = labelExtents(model.textStr.data, fontsize, model.textRotation.data)
+        # 文本以点为单位，不随坐标缩放，换算为像素后判断外接矩形是否与视口相交
+        half = self._extents * point / 2
+        xy = model.textXY.data
+        px = (xy[:, 0] - view[0]) * scale[0]
+        py = (xy[:, 1] - view[1]) * scale[1]
+        keep = (px + half[:, 0] >= 0) & (px - half[:, 0] <= self._canvas[0])
+        keep &= (py + half[:, 1] >= 0) & (py - half[:, 1] <= self._canvas[1])
+        keep &= fontsize * point >= self.minFont
+        rows = np.flatnonzero(keep)
+        if not len(rows):
+            return rows
+        cell = np.maximum(np.median(half[rows], axis=0) * 2 * self.labelCell, 1)
+        first = _firstUnique([np.floor(px[rows] / cell[0]).astype(np.int64), np.floor(py[rows] / cell[1]).astype(np.int64)])
+        return np.sort(rows[first])
+
+    def _makeText(self, index: int) -> Text:
+        x, y = self.model.textXY[index]
+        text = Text(x, y, self.model.textStr[index], **self.model._textProps(index))
+        text.set_figure(self.ax.figure)
+        text.axes = self.ax
+        text.set_transform(self.ax.transData)
+        text.set_clip_path(self.ax.patch)
+        return text
+
+    # 只绘制rows中的节点
+    def _applyNodes(self, rows: np.ndarray) -> None:
+        model = self.model
+        if not model.batch:
+            self._toggle('node', model.nodeArtists, rows)
+            return
+        code, markers, _ = self._group()
+        for i, marker in enumerate(markers):
+            collection = model.nodeCollections.get(marker)
+            if collection is not None:
+                model._setNodeGroup(collection, rows[code[rows] == i])
+
+    # 只绘制rows中的线
+    def _applyLines(self, rows: np.ndarray) -> None:
+        model = self.model
+        if not model.batch:
+            self._toggle('line', model.lineArtists, rows)
+            return
+        arrow = model.lineArrow.data[rows]
+        if model.lineCollection is not None:
+            model._setSegments(model.lineCollection, rows[~arrow])
+        if model.arrowCollections is not None:
+            model._setArrows(rows[arrow])
+
+    # 普通模式：只切换可见性发生变化的图元
+    def _toggle(self, kind: str, artists: List[Optional[Artist]], rows: np.ndarray) -> None:
+        visible = np.zeros(len(artists), dtype=bool)
+        visible[rows] = True
+        before = self._visible[kind]
+        if before is None or len(before) > len(visible):
+            before = np.ones(len(artists), dtype=bool)
+        elif len(before) < len(visible):
+            # 新生成的图元是可见的
+            before = np.concatenate((before, np.ones(len(visible) - len(before), dtype=bool)))
+        for index in np.flatnonzero(visible != before).tolist():
+            if artists[index] is not None:
+                artists[index].set_visible(bool(visible[index]))
+        self._visible[kind] = visible
+
+__all__ = ['LevelOfDetail']
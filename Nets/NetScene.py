@@ -1,15 +1,61 @@
-from typing import Optional, overload, Union, Tuple, List, Iterable, Dict
-from copy import copy as tempCopy
+from typing import Optional, overload, Union, Tuple, List, Iterable, Dict, Sequence, IO, TYPE_CHECKING
+from io import BytesIO
+from functools import partial
+import warnings
 
-import matplotlib.pyplot as plt
+import numpy as np
 
-from Nets.BaseMixin import TextStyleMixin, CommonStyleMixin, DefaultTextStyle, DefaultLineStyle, DefaultNodeStyle
+from Nets.BaseMixin import TextStyleMixin, CommonStyleMixin, DefaultTextStyle, DefaultLineStyle, DefaultNodeStyle, StyleAnalyze
 from Nets.BaseVar import NodeVar, LineVar, TextVar, Offset
+from Nets.SceneModel import SceneModel
+from Nets.SceneFile import dumpScene, loadScene
+from Nets.RenderCache import RenderCache, sceneDigest, sceneDigests
+from Nets.Layout import fruchtermanReingold, barnesHut
+from Nets.LabelPlacement import labelExtents, placeLabels
+from Nets.StreamBuilder import StreamBuilder
+from Nets.Importers import importEdgeList, importGraphML
+from Nets.Instrumentation import Instrumentation, Hook, counts
+from Nets.SvgWriter import writeSvg
+from Nets.Constraints import solve, Convergence
+
+# matplotlib在创建场景时才导入：headless只加载Figure与Agg画布，不经过pyplot，也就不会加载交互式后端；
+# 细节层次、动画在使用时才导入
+if TYPE_CHECKING:
+    from Nets.Animation import Animator
+
+# 通过实例调用时传入实例，通过类调用时传入None：show原来是staticmethod，NetScene.show()仍然可用
+class _SceneOrClassMethod(object):
+    def __init__(self, function):
+        self.function = function
+        self.__doc__ = function.__doc__
+
+    def __get__(self, instance, owner):
+        return partial(self.function, instance)
 
 # 传入半轴长度figsize控制画布
+# 图元先记录在场景模型中，show/save时才统一生成；之后再次渲染只更新发生变化的部分
+# batch为True时启用批量渲染：节点、线、箭头合并为集合图元，适合大规模网络
+# headless为True时不经过pyplot，直接基于Figure和Agg画布，适合批量导出；用完调用close或使用with语句释放
+# cache传入RenderCache时，导出内容相同的场景直接使用缓存的图片
 class NetScene:
-    def __init__(self, show_origin=True, *, figsize : float, titledict : Optional[dict] = None, cfg=True):
-        self.figure, self.ax = plt.subplots(figsize=(figsize, figsize))
+    def __init__(self, show_origin=True, *, figsize : float, titledict : Optional[dict] = None, cfg=True, batch=False,
+                 headless=False, cache : Optional[RenderCache] = None):
+        self.headless = headless
+        self.cache = cache
+        # 性能统计，见instrument
+        self.instrumentation: Optional[Instrumentation] = None
+        # 场景设置，保存场景文件时一并写入
+        self.settings = dict(figsize=figsize, titledict=titledict, cfg=cfg, batch=batch)
+        if headless:
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            self.figure = Figure(figsize=(figsize, figsize))
+            FigureCanvasAgg(self.figure)
+            self.ax = self.figure.subplots()
+        else:
+            import matplotlib.pyplot as plt
+            self.figure, self.ax = plt.subplots(figsize=(figsize, figsize))
+        self.model = SceneModel.attach(self.ax, batch=batch)
         if cfg:
             self.ax.set_aspect('equal', adjustable='box')  # 保持纵横比
             self.ax.set_facecolor('white')
@@ -21,29 +67,62 @@ class NetScene:
         if show_origin:
             self.Origin = NodeVar(Offset(0, 0), self.ax, CommonStyleMixin(color='red', size=10, style='o'))
 
-    @staticmethod
-    def show() -> None:
+    # netS.show()生成该场景的图元后显示；NetScene.show()与原来一样显示pyplot的所有画布，并生成其中场景的图元
+    @_SceneOrClassMethod
+    def show(self: Optional['NetScene']) -> None:
+        if self is not None and self.headless:
+            raise RuntimeError('headless场景没有窗口，请使用save导出')
+        import matplotlib.pyplot as plt
+        if self is not None:
+            self.render()
+        else:
+            from matplotlib._pylab_helpers import Gcf
+            for manager in Gcf.get_all_fig_managers():
+                for ax in manager.canvas.figure.axes:
+                    model = getattr(ax, '_nets_model', None)
+                    if model is not None:
+                        model.materialize()
         plt.show()
 
+    # 释放画布，pyplot创建的画布同时从pyplot中移除
+    def close(self) -> None:
+        if not self.headless:
+            import matplotlib.pyplot as plt
+            plt.close(self.figure)
+        self.figure.clear()
+
+    def __enter__(self) -> 'NetScene':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    # 生成尚未生成或发生变化的图元，show/save会自动调用
+    def render(self) -> None:
+        self.model.materialize()
+
     # 1. 添加一个节点
     # - 相对于原点添加
     @overload
-    def addNode(self, pos: Offset, style: CommonStyleMixin = tempCopy(DefaultNodeStyle)) -> NodeVar: ...
+    def addNode(self, pos: Offset, style: CommonStyleMixin = DefaultNodeStyle) -> NodeVar: ...
     # - 相对于节点偏移
     @overload
-    def addNode(self, pos: Offset, style: CommonStyleMixin = tempCopy(DefaultNodeStyle), *, node: Optional[NodeVar] = None) -> NodeVar: ...
-    def addNode(self, pos: Offset, style: CommonStyleMixin = tempCopy(DefaultNodeStyle), *,
+    def addNode(self, pos: Offset, style: CommonStyleMixin = DefaultNodeStyle, *, node: Optional[NodeVar] = None) -> NodeVar: ...
+    def addNode(self, pos: Offset, style: CommonStyleMixin = DefaultNodeStyle, *,
                 node: Optional[NodeVar] = None) -> NodeVar:
         """
-        - def addNode(self, pos: Offset, style: CommonStyleMixin = tempCopy(DefaultNodeStyle)) -> NodeVar
-        - def addNode(self, pos: Offset, style: CommonStyleMixin = tempCopy(DefaultNodeStyle), *, node: Optional[NodeVar] = None) -> NodeVar
+        - def addNode(self, pos: Offset, style: CommonStyleMixin = DefaultNodeStyle) -> NodeVar
+        - def addNode(self, pos: Offset, style: CommonStyleMixin = DefaultNodeStyle, *, node: Optional[NodeVar] = None) -> NodeVar
         """
         return NodeVar.offset(node, pos, self.ax, style) if node else NodeVar(pos, self.ax, style)
 
     # 2. 添加一根线，可以带有箭头。当isBind为True的时候，to位置节点是相对于start位置节点偏移的
-    def addLine(self, start: Union[Offset, NodeVar], to: Union[Offset, NodeVar], style: CommonStyleMixin = tempCopy(DefaultLineStyle), arrow=False,
+    # 传入两个节点且isBind为False时，线由两个节点连成（同addConnect）
+    def addLine(self, start: Union[Offset, NodeVar], to: Union[Offset, NodeVar], style: CommonStyleMixin = DefaultLineStyle, arrow=False,
                 isBind=False) -> LineVar:
         if isinstance(start, NodeVar):
+            if not isBind:
+                return LineVar.bind(start, to, self.ax, arrow, style)
             start = start.pos
             to = to.pos
         if isBind:
@@ -51,7 +130,7 @@ class NetScene:
         return LineVar(start, to, self.ax, arrow, style)
 
     # 3. 连接两点
-    def addConnect(self, node1: NodeVar, node2: NodeVar, style: CommonStyleMixin = tempCopy(DefaultLineStyle),
+    def addConnect(self, node1: NodeVar, node2: NodeVar, style: CommonStyleMixin = DefaultLineStyle,
                    arrow=False) -> LineVar:
         return LineVar.bind(node1, node2, self.ax, arrow, style)
 
@@ -61,22 +140,20 @@ class NetScene:
             start: Offset,
             to: Offset,
             arrow=False,
-            linestyle: CommonStyleMixin = tempCopy(DefaultLineStyle),
-            nodestyle: CommonStyleMixin = tempCopy(DefaultNodeStyle),
+            linestyle: CommonStyleMixin = DefaultLineStyle,
+            nodestyle: CommonStyleMixin = DefaultNodeStyle,
             isBind: bool = False
     ) -> Tuple[NodeVar, NodeVar, LineVar]:
         node1 = NodeVar(start, self.ax, nodestyle)
         if isBind:
             to = start + to
         node2 = NodeVar(to, self.ax, nodestyle)
-        return node1, node2, LineVar(start, to, self.ax, arrow, linestyle)
+        return node1, node2, LineVar.bind(node1, node2, self.ax, arrow, linestyle)
 
     # 5. 添加文本，特地把rotation单独拿出来了
-    def addText(self, pos: Offset, text: str, style: TextStyleMixin = tempCopy(DefaultTextStyle), *,
+    def addText(self, pos: Offset, text: str, style: TextStyleMixin = DefaultTextStyle, *,
                 rotation: Optional[int] = None) -> TextVar:
-        if rotation:
-            style.rotation = rotation
-        return TextVar(pos, text, self.ax, style)
+        return TextVar(pos, text, self.ax, style, rotation=rotation)
 
     # 6. 连接两个点并且展示文本，如果文本不指定就展示两点之间距离，点的类型可以是Offset，也可以是NodeVar
     def addTextByConnectNodes(
@@ -86,9 +163,9 @@ class NetScene:
             text: Optional[str] = None,
             arrow: bool = False,
             bias: Optional[float] = None,
-            linestyle: CommonStyleMixin = tempCopy(DefaultLineStyle),
-            nodestyle: CommonStyleMixin = tempCopy(DefaultNodeStyle),
-            textstyle: TextStyleMixin = tempCopy(DefaultTextStyle)
+            linestyle: CommonStyleMixin = DefaultLineStyle,
+            nodestyle: CommonStyleMixin = DefaultNodeStyle,
+            textstyle: TextStyleMixin = DefaultTextStyle
     ) -> Tuple[NodeVar, NodeVar, LineVar, TextVar]:
         if isinstance(node1, Offset):
             node1 = NodeVar(node1, self.ax, nodestyle)
@@ -103,7 +180,7 @@ class NetScene:
             line: LineVar,
             text: Optional[str] = None,
             bias: Optional[float] = None,
-            style: TextStyleMixin = tempCopy(DefaultTextStyle),
+            style: TextStyleMixin = DefaultTextStyle,
             visible: int = 0,
             parallel=True
     ) -> TextVar:
@@ -115,7 +192,7 @@ class NetScene:
             points: List[Offset],
             arrow=False,
             closure=False,
-            style: CommonStyleMixin = tempCopy(DefaultLineStyle)
+            style: CommonStyleMixin = DefaultLineStyle
     ) -> List[LineVar]:
         length = len(points)
         assert length >= 2
@@ -132,20 +209,16 @@ class NetScene:
             points: List[Offset],
             arrow=False,
             closure=False,
-            nodestyle: CommonStyleMixin = tempCopy(DefaultNodeStyle),
-            linestyle: CommonStyleMixin = tempCopy(DefaultLineStyle)
+            nodestyle: CommonStyleMixin = DefaultNodeStyle,
+            linestyle: CommonStyleMixin = DefaultLineStyle
     ) -> Tuple[List[NodeVar], List[LineVar]]:
         length = len(points)
         assert length >= 2
-        ns = []
+        ns = [NodeVar(points[0], self.ax, nodestyle)]
         ls = []
-        length = len(points)
-        assert length >= 2
-        for i in range(length - 1):
-            pos = points[i]
+        for pos in points[1:]:
             ns.append(NodeVar(pos, self.ax, nodestyle))
-            ls.append(LineVar(pos, points[i + 1], self.ax, arrow, linestyle))
-        ns.append(NodeVar(points[-1], self.ax, nodestyle))
+            ls.append(LineVar.bind(ns[-2], ns[-1], self.ax, arrow, linestyle))
         if closure and length >= 3:
             ls.append(LineVar.bind(ns[-1], ns[0], self.ax, arrow, linestyle))
         return ns, ls
@@ -159,24 +232,20 @@ class NetScene:
             visible: int = 0,
             bias: float | None = None,
             parallel=True,
-            nodestyle: CommonStyleMixin = tempCopy(DefaultNodeStyle),
-            linestyle: CommonStyleMixin = tempCopy(DefaultLineStyle),
-            textstyle: TextStyleMixin = tempCopy(DefaultTextStyle)
+            nodestyle: CommonStyleMixin = DefaultNodeStyle,
+            linestyle: CommonStyleMixin = DefaultLineStyle,
+            textstyle: TextStyleMixin = DefaultTextStyle
     ) -> Tuple[List[NodeVar], List[LineVar], List[TextVar]]:
         length = len(points)
         assert length >= 2
-        ns = []
+        ns = [NodeVar(points[0], self.ax, nodestyle)]
         ls = []
         ts = []
-        length = len(points)
-        assert length >= 2
-        for i in range(length - 1):
-            pos = points[i]
+        for pos in points[1:]:
             ns.append(NodeVar(pos, self.ax, nodestyle))
-            line = LineVar(pos, points[i + 1], self.ax, arrow, linestyle)
+            line = LineVar.bind(ns[-2], ns[-1], self.ax, arrow, linestyle)
             ls.append(line)
             ts.append(TextVar.length(line, self.ax, bias, textstyle, visible, parallel))
-        ns.append(NodeVar(points[-1], self.ax, nodestyle))
         if closure and length >= 3:
             ls.append(LineVar.bind(ns[-1], ns[0], self.ax, arrow, linestyle))
             ts.append(TextVar.length(ls[-1], self.ax, bias, textstyle, visible, parallel))
@@ -189,7 +258,7 @@ class NetScene:
             text : str,
             theta: int = 0,
             bias: Optional[float] = None,
-            style : TextStyleMixin = tempCopy(DefaultTextStyle)
+            style : TextStyleMixin = DefaultTextStyle
     ) -> TextVar:
         return TextVar.bind(node, text, self.ax, theta, bias, style)
 
@@ -200,46 +269,44 @@ class NetScene:
             points : Iterable[Offset],
             arrow=False,
             isBind=False,
-            style : CommonStyleMixin = tempCopy(DefaultLineStyle)
+            style : CommonStyleMixin = DefaultLineStyle
     ) -> List[LineVar]:
         return [LineVar(pos, p, self.ax, arrow, style) for p in points] if isBind \
             else [LineVar(pos, pos + p, self.ax, arrow, style) for p in points]
 
     # 13. 从某点出发到各点的路径图，……，同时返回节点(不包含起点)
+    # 线的终点是返回的节点；起点传入节点时线由两个节点连成，否则只有终点随节点移动
     def addPtoPsWithNode(
             self,
-            pos: Offset,
+            pos: Union[Offset, NodeVar],
             points: Iterable[Offset],
             arrow=False,
             isBind=False,
-            linestyle: CommonStyleMixin = tempCopy(DefaultLineStyle),
-            nodestyle : CommonStyleMixin = tempCopy(DefaultNodeStyle)
+            linestyle: CommonStyleMixin = DefaultLineStyle,
+            nodestyle : CommonStyleMixin = DefaultNodeStyle
     ) -> Tuple[List[LineVar], List[NodeVar]]:
         ls = []
         ns = []
-        if isBind:
-            for p in points:
-                ls.append(LineVar(pos, p, self.ax, arrow, linestyle))
-                ns.append(NodeVar(p, self.ax, nodestyle))
-            return ls, ns
+        start = pos.pos if isinstance(pos, NodeVar) else pos
         for p in points:
-            off = p + pos
-            ls.append(LineVar(pos, off, self.ax, arrow, linestyle))
-            ns.append(NodeVar(off, self.ax, nodestyle))
+            node = NodeVar(p if isBind else p + start, self.ax, nodestyle)
+            ls.append(LineVar.bind(pos, node, self.ax, arrow, linestyle) if isinstance(pos, NodeVar)
+                      else LineVar._anchored(start, node.pos, self.ax, arrow, linestyle, (-1, node.index)))
+            ns.append(node)
         return ls, ns
 
     # 14. 从某点出发到各点的路径图，……，同时返回节点(不包含起点)，以及文本，文本为空就显示距离
     def addPtoPsWithNodeAndText(
             self,
-            pos: Offset,
+            pos: Union[Offset, NodeVar],
             points: Iterable[Offset],
             text : Optional[str] = None,
             arrow=False,
             isBind=False,
             bias : Optional[float] = None,
-            linestyle: CommonStyleMixin = tempCopy(DefaultLineStyle),
-            nodestyle : CommonStyleMixin = tempCopy(DefaultNodeStyle),
-            textstyle : TextStyleMixin = tempCopy(DefaultTextStyle),
+            linestyle: CommonStyleMixin = DefaultLineStyle,
+            nodestyle : CommonStyleMixin = DefaultNodeStyle,
+            textstyle : TextStyleMixin = DefaultTextStyle,
             visible : int = 0,
             parallel=True
     ) -> Tuple[List[LineVar], List[NodeVar], List[TextVar]]:
@@ -248,27 +315,74 @@ class NetScene:
         if text else [TextVar.length(line, self.ax, bias, textstyle, visible, parallel) for line in ls])
 
     # 15. 相对于节点偏移的距离和夹角
-    def addBindNode(self, node : NodeVar, length : float, theta : float, style : CommonStyleMixin = tempCopy(DefaultNodeStyle)) -> NodeVar:
+    def addBindNode(self, node : NodeVar, length : float, theta : float, style : CommonStyleMixin = DefaultNodeStyle) -> NodeVar:
         return NodeVar.bind(node, length, theta, self.ax, style)
 
-    # 16. 保存图片
-    def save(self, fileName : str, format : str = 'png', **kwargs) -> None:
-        self.figure.savefig(f"{fileName}.{format}", **kwargs)
+    # 16. 保存图片，fileName是不带后缀的文件名，也可以是文件对象（如BytesIO）
+    def save(self, fileName : Union[str, IO], format : str = 'png', **kwargs) -> None:
+        target = f"{fileName}.{format}" if isinstance(fileName, str) else fileName
+        key = None
+        if self.cache is not None:
+            key = sceneDigest(self, format, **kwargs)
+            if self.cache.fetch(key, format, target):
+                return
+        self.render()
+        if key is None:
+            self.figure.savefig(target, format=format, **kwargs)
+        elif isinstance(target, str):
+            self.figure.savefig(target, format=format, **kwargs)
+            self.cache.store(key, format, target)
+        else:
+            buffer = BytesIO()
+            self.figure.savefig(buffer, format=format, **kwargs)
+            target.write(buffer.getvalue())
+            self.cache.store(key, format, buffer.getvalue())
+
+    # 16.1 保存为字节串
+    def saveBytes(self, format : str = 'png', **kwargs) -> bytes:
+        buffer = BytesIO()
+        self.save(buffer, format, **kwargs)
+        return buffer.getvalue()
+
+    # 16.2 一次保存多种格式，返回写入的文件名；图元生成与bbox_inches='tight'的边界计算只做一次
+    def save_many(self, fileName : str, formats : Iterable[str] = ('png', 'svg', 'pdf'), **kwargs) -> List[str]:
+        formats = list(formats)
+        files = [f"{fileName}.{format}" for format in formats]
+        keys = sceneDigests(self, formats, **kwargs) if self.cache is not None else [None] * len(formats)
+        pending = [(format, file, key) for format, file, key in zip(formats, files, keys)
+                   if key is None or not self.cache.fetch(key, format, file)]
+        if not pending:
+            return files
+        self.render()
+        if kwargs.get('bbox_inches') == 'tight':
+            from matplotlib import rcParams
+            from matplotlib.backends.backend_agg import RendererAgg
+            dpi = self.figure.dpi
+            width, height = self.figure.get_size_inches()
+            renderer = RendererAgg(int(width * dpi), int(height * dpi), dpi)
+            pad = kwargs.pop('pad_inches', rcParams['savefig.pad_inches'])
+            kwargs['bbox_inches'] = self.figure.get_tightbbox(renderer).padded(pad)
+        for format, file, key in pending:
+            self.figure.savefig(file, format=format, **kwargs)
+            if key is not None:
+                self.cache.store(key, format, file)
+        return files
 
-    # 17. 根据偏移的距离和夹角绘制所有图元，下一个的节点是相对于上一个节点的
-    # 在选择闭合的同时，如果为了避免精确计算闭合线长度而不是自己期待的长度，可以使用closureText传入指定文本替换
+    # 17. 根据偏移的距离和夹角绘制所有图元，distances_thetas可以是字典或(长度, 角度)的序列，下一个的节点是相对于上一个节点的
+    # 在选择闭合的同时，如果为了避免精确计算闭合线长度而不是自己期待的长度，可以使用closureText传入指定文本替换；
+    # 需要闭合线的长度也准确时，用solveConstraints按所有边长同时求解
     # 如果起点传入的是节点类型，不会被重新创建，而是直接添加到列表第一个
     def addBindsToAll(
             self,
             pos : Union[Offset, NodeVar],
-            distances_thetas : Dict[float, float],
+            distances_thetas : Union[Dict[float, float], Iterable[Tuple[float, float]]],
             arrow=False,
             closure=False,
             closureText : Optional[str] = None,
             bias : Optional[float] = None,
-            linestyle: CommonStyleMixin = tempCopy(DefaultLineStyle),
-            nodestyle : CommonStyleMixin = tempCopy(DefaultNodeStyle),
-            textstyle : TextStyleMixin = tempCopy(DefaultTextStyle),
+            linestyle: CommonStyleMixin = DefaultLineStyle,
+            nodestyle : CommonStyleMixin = DefaultNodeStyle,
+            textstyle : TextStyleMixin = DefaultTextStyle,
             visible : int = 0,
             parallel=False,
     ) -> Tuple[List[NodeVar], List[LineVar], List[TextVar]]:
@@ -280,7 +394,9 @@ class NetScene:
         else:
             last = pos
         ns.append(last)
-        for distance, theta in distances_thetas.items():
+        # 字典会合并相同的长度，需要重复长度时可以传入(长度, 角度)的序列
+        pairs = distances_thetas.items() if isinstance(distances_thetas, dict) else distances_thetas
+        for distance, theta in pairs:
             node = NodeVar.bind(last, distance, theta, self.ax, nodestyle)
             ns.append(node)
             line = LineVar.bind(last, node, self.ax, arrow, linestyle)
@@ -288,16 +404,20 @@ class NetScene:
             ts.append(TextVar.length(line, self.ax, bias, textstyle, visible, parallel))
             last = node
         if closure:
-            ls.append(LineVar.bind(last, ns[0], self.ax, arrow, linestyle))
-            if parallel:
-                textstyle.rotation = ls[-1].theta
+            closing = LineVar.bind(last, ns[0], self.ax, arrow, linestyle)
+            ls.append(closing)
             if bias is None:
                 bias = (linestyle.size + textstyle.size) * 0.05
-            ts.append(TextVar(
-                ls[-1].middle + bias,
-                closureText if closureText else str(ls[-1].length),
+            # 不指定closureText时与其余边一样是长度标注，按visible位小数显示，移动节点（如solveConstraints）后随之更新
+            ts.append(TextVar._anchored(
+                closing.middle + bias,
+                closureText if closureText else f'{closing.length:.{visible}f}',
                 self.ax,
-                textstyle
+                textstyle,
+                parallel,
+                TextVar._ends(closing, self.ax),
+                -1 if closureText else visible,
+                closing.theta if parallel else None
             ))
         return ns, ls, ts
 
@@ -307,7 +427,7 @@ class NetScene:
             texts : Iterable[str],
             nodes : Iterable[NodeVar],
             bias : Optional[float] = None,
-            style : TextStyleMixin = tempCopy(DefaultTextStyle),
+            style : TextStyleMixin = DefaultTextStyle,
     ) -> List[TextVar]:
         texts = list(texts)
         ts = []
@@ -321,6 +441,8 @@ class NetScene:
     # 第一个值表示节点或者空值，节点不会被创建和操作，只起到访问作用，但是仍然被添加；空值情况使用长度与角偏移创建
     # 第二个值传入字符串，一般在有误差时自己指定长度，否则传入确切长度，二者都表示当前点相对于上一个的偏移；空值的时候忽略创建直线，也代表已有，同时第三值失效
     # 第三个值表示偏移角度
+    # 线由相邻的两个节点连成，标注锚定在线的两端节点上；按数值长度新建节点的标注与闭合线不指定closureText时的标注是长度标注，
+    # 移动节点（如solveConstraints）后重新测量，传入字符串、连到已有节点的标注与closureText保持给定的文本
 # 总结一下传入情况，从某个节点A开始，要和下一个节点B连接，你传入类似[B, 'len', None]；B和下一个位置Offc相连，传入[None, len, 45]
     def addMixedBindsToALl(
             self,
@@ -330,9 +452,9 @@ class NetScene:
             closure=False,
             closureText: Optional[str] = None,
             bias: Optional[float] = None,
-            linestyle: CommonStyleMixin = tempCopy(DefaultLineStyle),
-            nodestyle: CommonStyleMixin = tempCopy(DefaultNodeStyle),
-            textstyle: TextStyleMixin = tempCopy(DefaultTextStyle),
+            linestyle: CommonStyleMixin = DefaultLineStyle,
+            nodestyle: CommonStyleMixin = DefaultNodeStyle,
+            textstyle: TextStyleMixin = DefaultTextStyle,
             visible: int = 0,
             parallel=False,
     ) -> Tuple[List[NodeVar], List[LineVar], List[TextVar]]:
@@ -342,11 +464,13 @@ class NetScene:
         last = node
         for mixin in mixins:
             maybe_node, distance, theta = mixin
+            # 按数值长度创建的节点与上一个节点的距离就是该长度，标注随之重新测量；其余情况标注给定的长度
+            measured = maybe_node is None and not isinstance(distance, str)
             if maybe_node is None:
                 maybe_node = NodeVar.bind_like(last, str(distance), theta, self.ax, nodestyle)
             ns.append(maybe_node)
             if distance:
-                line = LineVar(last.pos, maybe_node.pos, self.ax, arrow, linestyle)
+                line = LineVar.bind(last, maybe_node, self.ax, arrow, linestyle)
                 ls.append(line)
                 text = TextVar.bindOffset(
                     line.middle,
@@ -355,7 +479,9 @@ class NetScene:
                     textstyle.rotation if not parallel else line.theta,
                     bias,
                     textstyle,
-                    linestyle.size
+                    linestyle.size,
+                    ends=TextVar._ends(line, self.ax),
+                    digits=visible if measured else -1
                 )
                 ts.append(text)
             last = maybe_node
@@ -364,8 +490,404 @@ class NetScene:
             ls.append(line)
             ts.append(TextVar.bindOffset(
                 line.middle,
-                closureText, self.ax, textstyle.rotation if not parallel else line.theta, bias, textstyle, linestyle.size
+                closureText if closureText else f'{line.length:.{visible}f}',
+                self.ax, textstyle.rotation if not parallel else line.theta, bias, textstyle, linestyle.size,
+                ends=TextVar._ends(line, self.ax),
+                digits=-1 if closureText else visible
             ))
         return ns, ls, ts
 
-__all__ = ['NetScene']
\ No newline at end of file
+    # 20. 批量添加节点，xy是(N, 2)的坐标数组，所有节点一次写入场景
+    def addNodes(self, xy, style: CommonStyleMixin = DefaultNodeStyle) -> List[NodeVar]:
+        style = StyleAnalyze('node', style)
+        return [NodeVar.view(self.model, i) for i in self.model.addNodes(xy, style)]
+
+    # 21. 批量连接节点，pairs是(M, 2)的序号对；传入nodes时序号是nodes中的位置，否则是场景中节点的行号(NodeVar.index)
+    def addEdges(
+            self,
+            pairs,
+            nodes: Optional[Sequence[NodeVar]] = None,
+            arrow=False,
+            style: CommonStyleMixin = DefaultLineStyle
+    ) -> List[LineVar]:
+        style = StyleAnalyze('line', style)
+        ids = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+        if nodes is not None:
+            ids = np.array([node.index for node in nodes], dtype=np.int64)[ids]
+        xy = self.model.nodeXY.data
+        rows = self.model.addLines(np.hstack((xy[ids[:, 0]], xy[ids[:, 1]])), style, arrow, ids)
+        return [LineVar.view(self.model, i) for i in rows]
+
+    # 22. 极坐标链：addBindsToAll的批量版本，lengths_thetas是(K, 2)的(长度, 角度)数组，允许重复长度
+    # 所有节点位置由一次累加求出，节点、线、长度文本各自一次写入场景；withText为False时不生成文本
+    def addPolarChain(
+            self,
+            pos : Union[Offset, NodeVar],
+            lengths_thetas,
+            arrow=False,
+            closure=False,
+            closureText : Optional[str] = None,
+            bias : Optional[float] = None,
+            linestyle: CommonStyleMixin = DefaultLineStyle,
+            nodestyle : CommonStyleMixin = DefaultNodeStyle,
+            textstyle : TextStyleMixin = DefaultTextStyle,
+            visible : int = 0,
+            parallel=False,
+            withText=True
+    ) -> Tuple[List[NodeVar], List[LineVar], List[TextVar]]:
+        nodestyle = StyleAnalyze('node', nodestyle)
+        linestyle = StyleAnalyze('line', linestyle)
+        textstyle = StyleAnalyze('text', textstyle)
+        lt = np.asarray(lengths_thetas, dtype=float).reshape(-1, 2)
+        t = np.radians(lt[:, 1])
+        start = NodeVar(pos, self.ax, nodestyle) if isinstance(pos, Offset) else pos
+        origin = np.array([start.X(), start.Y()])
+        xy = np.vstack((origin, origin + np.cumsum(np.column_stack((lt[:, 0] * np.cos(t), lt[:, 0] * np.sin(t))), axis=0)))
+        # 与addBindsToAll一致，每个节点相对于上一个节点创建
+        first = self.model.nodeCount
+        rows = self.model.addNodes(xy[1:], nodestyle, np.concatenate(([start.index], np.arange(first, first + len(lt) - 1))))
+        ids = np.concatenate(([start.index], np.asarray(rows)))
+        lengths = lt[:, 0]
+        if closure:
+            xy = np.vstack((xy, origin))
+            ids = np.append(ids, start.index)
+            lengths = np.append(lengths, np.hypot(*(xy[-2] - origin)))
+        segments = np.hstack((xy[:-1], xy[1:]))
+        lines = self.model.addLines(segments, linestyle, arrow, np.column_stack((ids[:-1], ids[1:])))
+        ns = [start] + [NodeVar.view(self.model, i) for i in rows]
+        ls = [LineVar.view(self.model, i) for i in lines]
+        if not withText:
+            return ns, ls, []
+        gap: float = bias if bias else (linestyle.size + textstyle.size) * 0.05
+        texts = [f'{v:.{visible}f}' for v in lengths.tolist()]
+        digits = np.full(len(texts), visible)
+        if closure and closureText:
+            texts[-1] = closureText
+            digits[-1] = -1
+        middle = (segments[:, :2] + segments[:, 2:]) / 2 + (0, gap)
+        rotation = np.degrees(np.arctan2(segments[:, 3] - segments[:, 1], segments[:, 2] - segments[:, 0])) % 360 \
+            if parallel else None
+        rows = self.model.addTexts(middle, texts, textstyle, rotation, parallel, np.column_stack((ids[:-1], ids[1:])), digits)
+        ts = [TextVar.view(self.model, i) for i in rows]
+        return ns, ls, ts
+
+    # 23. 保存场景数据（不是图片），binary为False时保存为JSON，为True时保存为可内存映射的二进制格式
+    def dump(self, fileName : str, binary : bool = False) -> None:
+        dumpScene(self, fileName, binary)
+
+    # 24. 读取场景数据，直接恢复到场景模型中；其余关键字参数覆盖文件中的场景设置，如headless=True
+    @classmethod
+    def load(cls, fileName : str, mmap : bool = True, **kwargs) -> 'NetScene':
+        return loadScene(fileName, mmap, **kwargs)
+
+    # 25. 力导向布局：根据场景中连接节点的线（addEdges、bind等）重新计算节点位置，线的端点随之移动
+    # method为'barnesHut'（四叉树近似，适合大规模网络）或'fr'（精确计算）
+    # nodes只对这些节点布局，默认是全部节点；pinned中的节点保持原位，其余节点参与布局
+    # warm为True时以当前位置为初始位置（热启动），否则随机初始化未固定的节点
+    def layout(
+            self,
+            method : str = 'barnesHut',
+            nodes : Optional[Sequence[NodeVar]] = None,
+            pinned : Optional[Iterable[NodeVar]] = None,
+            warm = True,
+            iterations : int = 50,
+            tol : float = 1e-4,
+            k : Optional[float] = None,
+            seed : Optional[int] = None,
+            theta : float = .8
+    ) -> None:
+        if method not in ('barnesHut', 'fr'):
+            raise ValueError(f'未知的布局方法：{method}')
+        model = self.model
+        ids = np.arange(model.nodeCount) if nodes is None else np.array([node.index for node in nodes], dtype=np.int64)
+        if not len(ids):
+            return
+        # 场景行号 -> 参与布局的序号，只保留两端都参与布局的线
+        local = np.full(model.nodeCount + 1, -1, dtype=np.int64)
+        local[ids] = np.arange(len(ids))
+        ends = local[model.lineNodes.data]
+        edges = ends[(ends >= 0).all(axis=1)]
+        fixed = np.zeros(len(ids), dtype=bool)
+        if pinned is not None:
+            index = local[[node.index for node in pinned]]
+            fixed[index[index >= 0]] = True
+        pos = model.nodeXY.data[ids]
+        if not warm:
+            low, high = pos.min(axis=0), pos.max(axis=0)
+            side = max((high - low).max(), 1.0)
+            free = ~fixed
+            pos[free] = low + np.random.default_rng(seed).random((int(free.sum()), 2)) * side
+        if method == 'fr':
+            xy = fruchtermanReingold(edges, len(ids), pos, fixed, iterations, tol, k, seed)
+        else:
+            xy = barnesHut(edges, len(ids), pos, fixed, iterations, tol, k, seed, theta)
+        model.setNodesPos(ids, xy)
+
+    # 26. 空间查询：基于场景模型的空间索引，位置可以是Offset或NodeVar
+    @staticmethod
+    def _xy(pos : Union[Offset, NodeVar]) -> Tuple[float, float]:
+        pos = pos.pos if isinstance(pos, NodeVar) else pos
+        return pos.x, pos.y
+
+    # 26.1 距离最近的节点，场景中没有节点时返回None
+    def nearestNode(self, pos : Union[Offset, NodeVar]) -> Optional[NodeVar]:
+        index = self.model.spatialIndex().nearestNode(*self._xy(pos))
+        return NodeVar.view(self.model, index) if index >= 0 else None
+
+    # 26.2 距离最近的k个节点，由近到远
+    def nearestNodes(self, pos : Union[Offset, NodeVar], k : int) -> List[NodeVar]:
+        return [NodeVar.view(self.model, i) for i in self.model.spatialIndex().nearestNodes(*self._xy(pos), k).tolist()]
+
+    # 26.3 与pos距离不超过r的节点
+    def nodesInRadius(self, pos : Union[Offset, NodeVar], r : float) -> List[NodeVar]:
+        return [NodeVar.view(self.model, i) for i in self.model.spatialIndex().nodesInRadius(*self._xy(pos), r).tolist()]
+
+    # 26.4 位于两个对角点围成的矩形内的节点
+    def nodesInBox(self, corner1 : Union[Offset, NodeVar], corner2 : Union[Offset, NodeVar]) -> List[NodeVar]:
+        rows = self.model.spatialIndex().nodesInBox(*self._xy(corner1), *self._xy(corner2))
+        return [NodeVar.view(self.model, i) for i in rows.tolist()]
+
+    # 26.5 距离最近的线（点到线段的距离），场景中没有线时返回None
+    def nearestLine(self, pos : Union[Offset, NodeVar]) -> Optional[LineVar]:
+        index = self.model.spatialIndex().nearestLine(*self._xy(pos))
+        return LineVar.view(self.model, index) if index >= 0 else None
+
+    # 26.6 穿过两个对角点围成的矩形的线
+    def linesInBox(self, corner1 : Union[Offset, NodeVar], corner2 : Union[Offset, NodeVar]) -> List[LineVar]:
+        rows = self.model.spatialIndex().linesInBox(*self._xy(corner1), *self._xy(corner2))
+        return [LineVar.view(self.model, i) for i in rows.tolist()]
+
+    # 26.7 与start到to的线段相交的线，tol大于0时包括距离不超过tol的线
+    def linesCrossing(self, start : Union[Offset, NodeVar], to : Union[Offset, NodeVar], tol : float = 0) -> List[LineVar]:
+        rows = self.model.spatialIndex().linesOnSegment(*self._xy(start), *self._xy(to), tol)
+        return [LineVar.view(self.model, i) for i in rows.tolist()]
+
+    # 当前画布上1点对应的坐标长度(x, y)，坐标范围与纵横比按当前图元确定
+    def _pointScale(self) -> np.ndarray:
+        self.render()
+        self.ax.apply_aspect()
+        (x0, y0), (x1, y1) = self.ax.transData.transform([(0, 0), (1, 1)])
+        return 72 / self.figure.dpi / np.abs([x1 - x0, y1 - y0])
+
+    # 27. 自动布置文本，避免文本之间以及文本与节点重叠，texts默认是场景中所有文本
+    # 以文本当前位置为首选位置，依次尝试周围rings圈候选位置，找不到不重叠位置的文本保持原位
+    # 文本大小由字号估算，单位是点，需要按画布换算为坐标，因此在图元添加完、坐标范围确定之后调用
+    # gap是文本之间的额外间距（点），返回每个文本是否找到了不重叠的位置
+    def placeLabels(
+            self,
+            texts : Optional[Sequence[TextVar]] = None,
+            avoidNodes = True,
+            rings : int = 2,
+            gap : float = 1
+    ) -> List[bool]:
+        model = self.model
+        rows = np.arange(model.textCount) if texts is None else np.array([text.index for text in texts], dtype=np.int64)
+        if not len(rows):
+            return []
+        scale = self._pointScale()
+        fontsize = model.styles.column('size')[model.textStyle.data[rows]]
+        sizes = (labelExtents(model.textStr.data[rows], fontsize, model.textRotation.data[rows]) + gap) * scale
+        obstacles = None
+        if avoidNodes and model.nodeCount:
+            half = model.styles.column('size')[model.nodeStyle.data][:, None] / 2 * scale
+            obstacles = np.hstack((model.nodeXY.data - half, model.nodeXY.data + half))
+        xy, placed = placeLabels(model.textXY.data[rows], sizes, obstacles, rings)
+        model.setTextsPos(rows, xy)
+        return placed.tolist()
+
+    # 28. 细节层次：缩放、平移时只绘制视口内的图元，聚合小于一个像素的节点，隐藏过小或过密的文本，适合交互查看大规模网络
+    # pixel是节点聚合的格子边长（像素）；minFont是文本的最小字号（像素）；labelCell是文本格子相对于常见文本大小的倍数
+    # enable为False时关闭，恢复绘制全部图元；导出图片时同样只包含当前视口内按细节层次筛选后的图元
+    def levelOfDetail(self, enable = True, pixel : float = 1., minFont : float = 6., labelCell : float = 1.) -> None:
+        if self.model.lod is not None:
+            self.model.lod.remove()
+        if enable:
+            from Nets.LevelOfDetail import LevelOfDetail
+            LevelOfDetail(self.model, pixel, minFont, labelCell)
+
+    # 29. 图查询：场景中由节点连成的线（addConnect、addEdges以及drawPathWithNode、addBindsToAll、addMixedBindsToALl等
+    # 同时创建节点与线的方法）构成的图，线的长度是边的权重
+    # directed为True时带箭头的线只能沿箭头方向通过；数组形式的结果可以直接使用self.graph
+    @property
+    def graph(self):
+        return self.model.graphModel()
+
+    # 29.1 节点的度（连接的线数），有向时是出度
+    def degree(self, node : NodeVar, directed = False) -> int:
+        return int(self.graph.degree([node.index], directed)[0])
+
+    # 29.2 相邻的节点
+    def neighbors(self, node : NodeVar, directed = False) -> List[NodeVar]:
+        return [NodeVar.view(self.model, i) for i in self.graph.neighbors(node.index, directed)[0].tolist()]
+
+    # 29.3 连通分量，按节点数从多到少排列
+    def components(self) -> List[List[NodeVar]]:
+        label = self.graph.components()
+        order = np.argsort(label, kind='stable')
+        groups = np.split(order, np.cumsum(np.bincount(label))[:-1])
+        groups.sort(key=len, reverse=True)
+        return [[NodeVar.view(self.model, i) for i in group.tolist()] for group in groups]
+
+    # 29.4 最短路径，返回经过的节点、线与总长度；不可达时返回空列表与inf
+    def shortestPath(self, start : NodeVar, to : NodeVar, directed = False) -> Tuple[List[NodeVar], List[LineVar], float]:
+        nodes, lines, length = self.graph.shortestPath(start.index, to.index, directed)
+        return [NodeVar.view(self.model, i) for i in nodes.tolist()], [LineVar.view(self.model, i) for i in lines.tolist()], length
+
+    # 29.5 高亮节点与线（如最短路径、连通分量），合并为一个覆盖图层，替换之前的高亮；size为None时在原尺寸上加大
+    def highlight(self, nodes : Iterable[NodeVar] = (), lines : Iterable[LineVar] = (), color = 'red', size : Optional[float] = None) -> None:
+        self.graph.highlight([node.index for node in nodes], [line.index for line in lines], color, size)
+
+    def clearHighlight(self) -> None:
+        self.graph.clear()
+
+    # 30. 流式构建：从可迭代对象（如生成器）按块读取节点(编号, x, y)与边(编号, 编号)，每块一次写入场景
+    # Python对象的峰值数量只与chunk有关；边引用的编号没有出现在nodes中时在原点创建节点，之后可以调用layout
+    # 返回的构建器可以继续读取（addNodes、addEdges），rows可以把编号换算为节点行号；大规模网络建议batch=True
+    def stream(
+            self,
+            edges : Iterable = (),
+            nodes : Optional[Iterable] = None,
+            chunk : int = 65536,
+            arrow = False,
+            nodestyle : CommonStyleMixin = DefaultNodeStyle,
+            linestyle : CommonStyleMixin = DefaultLineStyle
+    ) -> StreamBuilder:
+        nodestyle = StyleAnalyze('node', nodestyle)
+        linestyle = StyleAnalyze('line', linestyle)
+        builder = StreamBuilder(self.model, chunk, nodestyle, linestyle, arrow)
+        if nodes is not None:
+            builder.addNodes(nodes)
+        builder.addEdges(edges)
+        return builder
+
+    # 31. 导入边表CSV/TSV（列source、target，可选weight、label）与可选的节点表（列id、x、y，可选label）
+    # 文件以内存映射方式读取并直接解析为NumPy数组；delimiter为None时按扩展名或表头推断
+    # 返回新节点与新线的行号范围、节点编号（第i个新节点的编号）与边的权重（没有weight列时为None）
+    def importEdgeList(
+            self,
+            fileName : str,
+            nodeFile : Optional[str] = None,
+            delimiter : Optional[str] = None,
+            arrow = False,
+            nodestyle : CommonStyleMixin = DefaultNodeStyle,
+            linestyle : CommonStyleMixin = DefaultLineStyle,
+            textstyle : TextStyleMixin = DefaultTextStyle
+    ) -> Tuple[range, range, np.ndarray, Optional[np.ndarray]]:
+        nodestyle = StyleAnalyze('node', nodestyle)
+        linestyle = StyleAnalyze('line', linestyle)
+        textstyle = StyleAnalyze('text', textstyle)
+        return importEdgeList(self, fileName, nodeFile, delimiter, arrow, nodestyle, linestyle, textstyle)
+
+    # 32. 导入GraphML，节点的x、y、label与边的weight、label从同名属性读取；arrow为None时有向图的边带箭头，返回值同31
+    def importGraphML(
+            self,
+            fileName : str,
+            arrow : Optional[bool] = None,
+            nodestyle : CommonStyleMixin = DefaultNodeStyle,
+            linestyle : CommonStyleMixin = DefaultLineStyle,
+            textstyle : TextStyleMixin = DefaultTextStyle
+    ) -> Tuple[range, range, np.ndarray, Optional[np.ndarray]]:
+        nodestyle = StyleAnalyze('node', nodestyle)
+        linestyle = StyleAnalyze('line', linestyle)
+        textstyle = StyleAnalyze('text', textstyle)
+        return importGraphML(self, fileName, arrow, nodestyle, linestyle, textstyle)
+
+    # 33. 动画：每帧调用update(frame)修改场景，修改原地写入已生成的图元，blit时只重绘节点、线（texts为True时包括文本）
+    # frames、interval（毫秒）与其余关键字参数传给FuncAnimation；请保留返回的Animator，否则动画会被回收
+    def animate(self, update, frames=None, interval : float = 1000, blit = True, texts = False, **kwargs) -> 'Animator':
+        from Nets.Animation import Animator
+        return Animator(self.model, update, frames, interval, blit, texts, **kwargs)
+
+    # 33.1 批量移动节点，xy是(N, 2)的坐标数组，依赖这些节点的线、节点与文本随之更新（见34）
+    def moveNodes(self, nodes : Iterable[NodeVar], xy) -> None:
+        self.model.setNodesPos([node.index for node in nodes], np.asarray(xy, dtype=float).reshape(-1, 2))
+
+    # 33.2 批量修改节点、线的样式
+    def setNodesStyle(self, nodes : Iterable[NodeVar], style : CommonStyleMixin) -> None:
+        style = StyleAnalyze('node', style)
+        self.model.setNodesStyle([node.index for node in nodes], style)
+
+    def setLinesStyle(self, lines : Iterable[LineVar], style : CommonStyleMixin) -> None:
+        style = StyleAnalyze('line', style)
+        self.model.setLinesStyle([line.index for line in lines], style)
+
+    # 34. 移动节点：以其为端点的线、相对于它创建的节点（bind、addBindsToAll等）以及锚定在它上面的文本
+    # （长度标注、平行标注、节点旁的文本）随之更新，只计算受影响的部分；批量移动见33.1
+    def moveNode(self, node : NodeVar, pos : Offset) -> None:
+        self.model.setNodePos(node.index, pos.x, pos.y)
+
+    # 35. 性能统计：开启后记录各阶段（构造、布局、生成图元、绘制、编码）与各API方法的调用次数和耗时（见Instrumentation）
+    # hooks在每次调用结束时收到(名称, 阶段, 秒数)；关闭后撤销计时，已记录的数据保留，未开启时没有额外开销
+    def instrument(self, enable = True, hooks : Iterable[Hook] = ()) -> Optional[Instrumentation]:
+        if not enable:
+            if self.instrumentation is not None:
+                self.instrumentation.detach()
+            return self.instrumentation
+        if self.instrumentation is None:
+            self.instrumentation = Instrumentation(list(hooks))
+        else:
+            self.instrumentation.hooks.extend(hooks)
+        self.instrumentation.attach(self)
+        return self.instrumentation
+
+    # 35.1 统计报告：元素数、按类型统计的图元数，开启过统计时还有各阶段与各API方法的耗时；reset为True时之后重新计时
+    def stats(self, reset = False) -> dict:
+        report = counts(self)
+        if self.instrumentation is not None:
+            report.update(self.instrumentation.report())
+            if reset:
+                self.instrumentation.reset()
+        else:
+            report.update(enabled=False, seconds=0., phases={}, methods={})
+        return report
+
+    # 36. 不经过matplotlib直接写出SVG（见SvgWriter），按块流式写入，适合大规模场景；画布边长与figsize相同，标题取titledict的label
+    # fileName是不带后缀的文件名，也可以是文本文件对象；直接通过ax添加的matplotlib图元不会写出
+    def saveSvg(self, fileName : Union[str, IO], chunk : int = 65536) -> None:
+        target = f"{fileName}.svg" if isinstance(fileName, str) else fileName
+        title = (self.settings['titledict'] or {}).get('label')
+        writeSvg(self.model, target, size=self.settings['figsize'] * 72, title=title, chunk=chunk)
+
+    # 37. 实际比例图：按给定的边长与方向角同时求解节点的位置（见Constraints），代替addBindsToAll等逐条边依次推算，
+    # 闭合边等不再累积误差；lengths与angles是(线, 数值)的序列，线可以是由节点连成的LineVar或(NodeVar, NodeVar)，
+    # 角度与LineVar.theta相同，从第一个节点指向第二个节点；pinned中的节点保持原位
+    # 以当前位置为初始位置，求解后移动约束涉及的节点，线、相对节点与文本（长度标注、平行标注）随之更新
+    # 返回每条长度约束的残差（实际 - 给定）、每条角度约束的残差（度）与收敛情况（见Constraints.Convergence），
+    # 约束矛盾时残差不为0；残差达不到tol时发出RuntimeWarning，节点仍移动到求得的位置
+    def solveConstraints(
+            self,
+            lengths : Iterable[Tuple[Union[LineVar, Tuple[NodeVar, NodeVar]], float]] = (),
+            angles : Iterable[Tuple[Union[LineVar, Tuple[NodeVar, NodeVar]], float]] = (),
+            pinned : Optional[Iterable[NodeVar]] = None,
+            iterations : int = 100,
+            tol : float = 1e-9
+    ) -> Tuple[np.ndarray, np.ndarray, Convergence]:
+        lengthPairs, lengthValues = self._constraintPairs(lengths)
+        anglePairs, angleValues = self._constraintPairs(angles)
+        model = self.model
+        fixed = None if pinned is None else [node.index for node in pinned]
+        xy, lengthResiduals, angleResiduals, convergence = solve(model.nodeCount, model.nodeXY.data, (lengthPairs, lengthValues),
+                                                                 (anglePairs, angleValues), fixed, iterations, tol)
+        ids = np.unique(np.concatenate((lengthPairs, anglePairs)))
+        if len(ids):
+            model.setNodesPos(ids, xy[ids])
+        if not convergence.converged:
+            warnings.warn(f'约束求解未收敛（{convergence.reason}）：迭代{convergence.iterations}次，'
+                          f'最大残差{convergence.residual:.3g}', RuntimeWarning, stacklevel=2)
+        return lengthResiduals, angleResiduals, convergence
+
+    # 约束的节点对与数值，线按两端节点
+    def _constraintPairs(self, items) -> Tuple[np.ndarray, np.ndarray]:
+        pairs, values = [], []
+        for target, value in items:
+            if isinstance(target, LineVar):
+                a, b = (int(i) for i in self.model.lineNodes[target.index])
+                if a < 0 or b < 0:
+                    raise ValueError('约束的线需要由两个节点连成')
+            else:
+                a, b = (node.index for node in target)
+            pairs.append((a, b))
+            values.append(value)
+        return np.array(pairs, dtype=np.int64).reshape(-1, 2), np.array(values, dtype=float)
+
+__all__ = ['NetScene']
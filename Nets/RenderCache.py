@@ -0,0 +1,136 @@
+"""
+渲染缓存
+以场景内容的哈希为键，把导出的图片保存在磁盘目录中。再次导出内容相同的场景时直接复制缓存的图片，不经过matplotlib。
+哈希覆盖：场景模型的所有列与样式表、场景设置、标题、坐标轴开关、画布尺寸，以及格式、dpi和其他保存参数；
+另外包括库自己绘制的、不在场景模型中的内容：图查询的高亮图层、细节层次的参数，以及关闭自动缩放时（如set_xlim缩放、平移）的坐标范围。
+注意：直接通过ax添加的其他matplotlib图元不在哈希之内。
+目录总大小超过maxBytes时，按最近使用时间（文件修改时间）淘汰最久未使用的图片。
+"""
+from typing import Union, IO, Iterable, List, Optional
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+
+from Nets.ElementStore import styleKey
+
+# 手动设置的坐标范围；自动缩放时坐标范围由图元决定，已经包含在图元之中
+def _limits(ax) -> Optional[list]:
+    if ax.get_autoscalex_on() and ax.get_autoscaley_on():
+        return None
+    return [list(ax.get_xlim()), list(ax.get_ylim())]
+
+# 高亮图层（见Graph.highlight）中各集合的数据
+def _overlayArrays(model) -> List:
+    arrays = []
+    for artist in model.graph.overlay if model.graph is not None else ():
+        if hasattr(artist, 'get_segments'):
+            arrays.extend(artist.get_segments())
+        else:
+            arrays.extend((artist.get_offsets(), artist.get_sizes()))
+        arrays.extend((artist.get_facecolor(), artist.get_edgecolor(), artist.get_linewidths()))
+    return arrays
+
+# 场景内容的哈希，format与其他保存参数一并计入；多种格式共用场景内容部分的计算
+def sceneDigests(scene, formats: Iterable[str], **kwargs) -> List[str]:
+    from matplotlib import rcParams
+    model = scene.model
+    digest = hashlib.blake2b(digest_size=20)
+    dpi = kwargs.pop('dpi', rcParams['savefig.dpi'])
+    meta = dict(
+        settings=scene.settings,
+        title=scene.ax.get_title(),
+        axis=scene.ax.axison,
+        size=scene.figure.get_size_inches().tolist(),
+        dpi=scene.figure.dpi if dpi == 'figure' else dpi,
+        kwargs=kwargs,
+        styles=[styleKey(style) for style in model.styles.styles],
+        limits=_limits(scene.ax),
+        lod=None if model.lod is None else [model.lod.pixel, model.lod.minFont, model.lod.labelCell],
+        overlay=[type(artist).__name__ for artist in model.graph.overlay] if model.graph is not None else []
+    )
+    digest.update(json.dumps(meta, sort_keys=True, default=str).encode('U8'))
+    for column in (model.nodeXY, model.nodeStyle, model.lineXY, model.lineStyle, model.lineArrow, model.textXY,
+                   model.textStyle, model.textRotation, model.textParallel):
+        digest.update(column.data.tobytes())
+    digest.update('\0'.join(map(str, model.textStr.data)).encode('U8'))
+    for array in _overlayArrays(model):
+        digest.update(np.ascontiguousarray(array, dtype=float).tobytes())
+    keys = []
+    for format in formats:
+        keyed = digest.copy()
+        keyed.update(format.encode('U8'))
+        keys.append(keyed.hexdigest())
+    return keys
+
+def sceneDigest(scene, format: str = 'png', **kwargs) -> str:
+    return sceneDigests(scene, [format], **kwargs)[0]
+
+class RenderCache(object):
+    def __init__(self, directory: str, maxBytes: int = 512 * 1024 * 1024):
+        self.directory = directory
+        self.maxBytes = maxBytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str, format: str) -> str:
+        return os.path.join(self.directory, f'{key}.{format}')
+
+    # 命中时把缓存写到目标（文件名或文件对象）并返回True
+    def fetch(self, key: str, format: str, target: Union[str, IO]) -> bool:
+        path = self._path(key, format)
+        try:
+            if isinstance(target, str):
+                shutil.copyfile(path, target)
+            else:
+                with open(path, 'rb') as file:
+                    target.write(file.read())
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return False
+        self.hits += 1
+        return True
+
+    # 把导出的文件（或字节串）存入缓存，然后按需淘汰
+    def store(self, key: str, format: str, source: Union[str, bytes]) -> None:
+        path = self._path(key, format)
+        temp = f'{path}.{os.getpid()}.tmp'
+        if isinstance(source, bytes):
+            with open(temp, 'wb') as file:
+                file.write(source)
+        else:
+            shutil.copyfile(source, temp)
+        os.replace(temp, path)
+        self.evict()
+
+    # 淘汰最久未使用的图片，直到总大小不超过maxBytes
+    def evict(self) -> None:
+        names = {}
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.endswith('.tmp'):
+                stat = entry.stat()
+                names[entry.path] = (stat.st_mtime, stat.st_size)
+        total = sum(size for _, size in names.values())
+        for path, (_, size) in sorted(names.items(), key=lambda item: item[1][0]):
+            if total <= self.maxBytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self) -> None:
+        for entry in os.scandir(self.directory):
+            if entry.is_file():
+                os.remove(entry.path)
+
+    def stats(self) -> dict:
+        files = [entry.stat().st_size for entry in os.scandir(self.directory) if entry.is_file()]
+        return dict(hits=self.hits, misses=self.misses, entries=len(files), bytes=sum(files))
+
+__all__ = ['RenderCache', 'sceneDigest', 'sceneDigests']
@@ -0,0 +1,166 @@
+"""
+场景文件
+把NetScene保存为文件，读取时直接恢复到场景模型的各列中，不需要重新进行任何几何计算。
+- JSON格式（.json）：便于查看和调试，所有列都以列表保存
+- 二进制格式（.nets）：适合大规模网络，结构如下
+    b'NETS' | 头部长度(uint32, 小端) | JSON头部 | 按64字节对齐的各列原始数据
+  头部记录场景设置、样式表以及每一列的dtype、shape和在文件中的偏移；
+  文本字符串以UTF-8拼接为一段数据，另存每个字符串的结束位置。
+  读取时坐标等数值列使用numpy.memmap（写时复制）映射，不会把整个文件读入内存。
+两种格式的头部都记录版本号，列发生变化时增加版本号，读取时只接受当前版本：
+- 1：节点、线、文本的位置与样式
+- 2：增加textParallel（平行文本）
+- 3：增加nodeParent、textNodes、textOffset、textDigits（依赖关系）
+"""
+from typing import Dict, List, Tuple
+import json
+import os
+
+import numpy as np
+
+from Nets.BaseMixin import CommonStyleMixin, TextStyleMixin
+
+Version = 3
+Magic = b'NETS'
+_Align = 64
+# 需要保存的列：列名 -> (dtype, 每行宽度)；增删列时同时增加Version
+_Columns = {
+    'nodeXY': (np.float64, 2),
+    'nodeStyle': (np.int32, None),
+    'nodeParent': (np.int64, None),
+    'lineXY': (np.float64, 4),
+    'lineStyle': (np.int32, None),
+    'lineArrow': (np.bool_, None),
+    'lineNodes': (np.int64, 2),
+    'textXY': (np.float64, 2),
+    'textStyle': (np.int32, None),
+    'textRotation': (np.float64, None),
+    'textParallel': (np.bool_, None),
+    'textNodes': (np.int64, 2),
+    'textOffset': (np.float64, 2),
+    'textDigits': (np.int32, None),
+}
+
+def _aligned(size: int) -> int:
+    return -(-size // _Align) * _Align
+
+def _styleToDict(style: CommonStyleMixin) -> dict:
+    data = dict(style=style.style, size=style.size, color=style.color)
+    if isinstance(style, TextStyleMixin):
+        data['family'] = style.family
+    return data
+
+def _styleFromDict(data: dict) -> CommonStyleMixin:
+    if 'family' in data:
+        return TextStyleMixin(**data)
+    return CommonStyleMixin(**data)
+
+def _header(scene) -> dict:
+    model = scene.model
+    return dict(
+        version=Version,
+        scene=scene.settings,
+        # 坐标轴常在创建场景后直接通过ax关闭，单独记录
+        axis=scene.ax.axison,
+        origin=scene.Origin.index if scene.Origin is not None else None,
+        styles=[_styleToDict(style) for style in model.styles.styles]
+    )
+
+# 保存场景，binary为False时保存为JSON
+def dumpScene(scene, fileName: str, binary: bool = False) -> None:
+    model = scene.model
+    header = _header(scene)
+    columns = {name: getattr(model, name).data for name in _Columns}
+    if not binary:
+        header['columns'] = {name: array.tolist() for name, array in columns.items()}
+        header['textStr'] = list(model.textStr.data)
+        with open(fileName, 'w', encoding='U8') as file:
+            json.dump(header, file, ensure_ascii=False, default=str)
+        return
+    encoded = [str(text).encode('U8') for text in model.textStr.data]
+    columns['textEnds'] = np.cumsum([len(b) for b in encoded], dtype=np.int64)
+    blob = b''.join(encoded)
+    # 先计算各列相对于数据区起点的偏移，头部长度确定后再整体平移
+    layout: Dict[str, dict] = {}
+    offset = 0
+    for name, array in columns.items():
+        layout[name] = dict(dtype=array.dtype.str, shape=list(array.shape), offset=offset)
+        offset += _aligned(array.nbytes)
+    layout['textBlob'] = dict(dtype='|u1', shape=[len(blob)], offset=offset)
+    header['columns'] = layout
+    raw = json.dumps(header, ensure_ascii=False, default=str).encode('U8')
+    start = _aligned(len(Magic) + 4 + len(raw))
+    # 先写入临时文件再替换，避免覆盖正被内存映射的同名文件
+    temp = f'{fileName}.tmp'
+    with open(temp, 'wb') as file:
+        file.write(Magic + len(raw).to_bytes(4, 'little') + raw)
+        # 对齐产生的空隙由seek自动补零
+        for name, array in columns.items():
+            file.seek(start + layout[name]['offset'])
+            file.write(np.ascontiguousarray(array).tobytes())
+        file.seek(start + layout['textBlob']['offset'])
+        file.write(blob)
+    os.replace(temp, fileName)
+
+# 版本不同的文件列不同，不做推测
+def _checkHeader(fileName: str, header: dict) -> None:
+    version = header.get('version')
+    if version != Version:
+        raise ValueError(f'{fileName}的版本为{version}，只支持版本{Version}')
+
+def _readBinary(fileName: str, mmap: bool) -> Tuple[dict, Dict[str, np.ndarray], List[str]]:
+    with open(fileName, 'rb') as file:
+        if file.read(len(Magic)) != Magic:
+            raise ValueError(f'{fileName}不是Nets场景文件')
+        size = int.from_bytes(file.read(4), 'little')
+        header = json.loads(file.read(size).decode('U8'))
+    _checkHeader(fileName, header)
+    start = _aligned(len(Magic) + 4 + size)
+    columns = {}
+    for name, info in header['columns'].items():
+        shape = tuple(info['shape'])
+        dtype = np.dtype(info['dtype'])
+        if not int(np.prod(shape)):
+            columns[name] = np.empty(shape, dtype=dtype)
+        elif mmap:
+            columns[name] = np.memmap(fileName, dtype=dtype, mode='c', offset=start + info['offset'], shape=shape)
+        else:
+            with open(fileName, 'rb') as file:
+                file.seek(start + info['offset'])
+                columns[name] = np.fromfile(file, dtype=dtype, count=int(np.prod(shape))).reshape(shape)
+    blob = bytes(columns.pop('textBlob'))
+    ends = columns.pop('textEnds').tolist()
+    texts = [blob[a:b].decode('U8') for a, b in zip([0] + ends[:-1], ends)]
+    return header, columns, texts
+
+def _readJson(fileName: str) -> Tuple[dict, Dict[str, np.ndarray], List[str]]:
+    with open(fileName, 'r', encoding='U8') as file:
+        header = json.load(file)
+    _checkHeader(fileName, header)
+    columns = {}
+    for name, (dtype, width) in _Columns.items():
+        array = np.array(header['columns'][name], dtype=dtype)
+        columns[name] = array if width is None else array.reshape(-1, width)
+    return header, columns, header['textStr']
+
+# 读取场景文件，根据文件头自动识别格式；mmap只对二进制格式有效
+# 其余关键字参数（如headless、batch）覆盖文件中保存的场景设置
+def loadScene(fileName: str, mmap: bool = True, **kwargs):
+    from Nets.NetScene import NetScene
+    from Nets.BaseVar import NodeVar
+    with open(fileName, 'rb') as file:
+        binary = file.read(len(Magic)) == Magic
+    header, columns, texts = _readBinary(fileName, mmap) if binary else _readJson(fileName)
+    settings = dict(header['scene'])
+    settings.update(kwargs)
+    scene = NetScene(show_origin=False, **settings)
+    text = np.empty(len(texts), dtype=object)
+    text[:] = texts
+    columns['textStr'] = text
+    scene.model.restore([_styleFromDict(data) for data in header['styles']], columns)
+    scene.ax.axis('on' if header['axis'] else 'off')
+    if header['origin'] is not None:
+        scene.Origin = NodeVar.view(scene.model, header['origin'])
+    return scene
+
+__all__ = ['dumpScene', 'loadScene']
@@ -0,0 +1,593 @@
+"""
+场景模型
+节点、线、文本在构造时只记录到场景模型中，不直接创建图元；
+在show/save时（或调用render）统一生成图元，之后只更新发生变化的部分。
+- 普通模式：每个图元生成一个独立的matplotlib图元，与逐个绘制的效果一致
+- 批量模式：节点按marker分组，每组一个PathCollection；普通线全部放进一个LineCollection；
+  箭头共享一组集合（箭身LineCollection + 箭头LineCollection）；文本仍是独立的Text
+直接使用坐标系构造图元（不经过NetScene）时，会自动绑定一个即时模型，每次记录后立刻生成图元。
+已生成的图元原地更新，不删除重建（从坐标系中删除图元的代价与图元总数成正比）：集合使用set_offsets、set_segments、
+set_color等，普通模式的节点、线、箭头与文本修改自身的数据与属性，图元对象不变；坐标范围随新的位置扩展。
+动画模式（live=True，见Animation）下坐标范围固定，不再扩展，便于逐帧只重绘这些图元。
+
+数据按列保存（见ElementStore）：
+- 节点：nodeXY(N, 2)、nodeStyle(N)；nodeParent(N)，相对于某个节点创建的节点记录该节点的行号，否则为-1
+- 线：lineXY(M, 4)，依次是起点x、y和终点x、y；lineStyle(M)；lineArrow(M)；
+  lineNodes(M, 2)，端点是节点时记录该节点的行号，否则为-1；两端都是节点的线才是图模型中的边
+- 文本：textXY(T, 2)、textStyle(T)、textStr(T)、textRotation(T)；textParallel(T)，
+  为True时textRotation是数据空间中的角度（平行于某条线），绘制时才按当前的坐标变换换算为屏幕角度；
+  textNodes(T, 2)、textOffset(T, 2)、textDigits(T)，文本锚定的两个节点、相对于两节点中点的偏移与长度标注的小数位数，
+  不锚定时textNodes为-1，不是长度标注时textDigits为-1
+移动节点（setNodesPos）时由依赖关系（见Dependency）只更新受影响的节点、线与文本。
+"""
+from typing import Optional, List, Dict, Tuple, Set, TYPE_CHECKING
+
+import numpy as np
+
+from Nets.BaseMixin import CommonStyleMixin, TextStyleMixin
+from Nets.ElementStore import Column, StyleTable
+from Nets.SpatialIndex import SpatialIndex
+from Nets.Graph import Graph
+from Nets.Dependency import Dependencies
+
+# matplotlib在生成图元时才导入，只记录场景（如只做几何计算、读写场景文件）时不加载
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+    from matplotlib.artist import Artist
+    from matplotlib.collections import LineCollection, PathCollection
+    from Nets.BaseVar import NodeVar
+    from Nets.LevelOfDetail import LevelOfDetail
+
+# 单位箭头（'->'样式的开口箭头），尖端位于原点，朝向x轴正方向
+_ArrowHead = np.array([(-1, .5), (0, 0), (-1, -.5)])
+
+# 全部相同时只保留一个值：matplotlib对单一颜色、尺寸的集合走更快的绘制路径，修改线宽时也不必逐段处理虚线
+def _uniform(values: np.ndarray) -> np.ndarray:
+    return values[:1] if len(values) and (values == values[:1]).all() else values
+
+class SceneModel(object):
+    def __init__(self, ax: 'Axes', batch: bool = False, eager: bool = False):
+        self.ax = ax
+        self.batch = batch
+        self.eager = eager
+        self.styles = StyleTable()
+        self.nodeXY = Column(float, 2)
+        self.nodeStyle = Column(np.int32)
+        self.nodeParent = Column(np.int64)
+        self.lineXY = Column(float, 4)
+        self.lineStyle = Column(np.int32)
+        self.lineArrow = Column(bool)
+        self.lineNodes = Column(np.int64, 2)
+        self.textXY = Column(float, 2)
+        self.textStyle = Column(np.int32)
+        self.textStr = Column(object)
+        self.textRotation = Column(float)
+        self.textParallel = Column(bool)
+        self.textNodes = Column(np.int64, 2)
+        self.textOffset = Column(float, 2)
+        self.textDigits = Column(np.int32)
+        # 普通模式下每个图元对应的matplotlib图元，尚未生成时为None；批量模式下节点与线不使用
+        self.nodeArtists: List[Optional['Artist']] = []
+        self.lineArtists: List[Optional['Artist']] = []
+        self.textArtists: List[Optional['Artist']] = []
+        # 批量模式下的集合，节点按marker分组
+        self.nodeCollections: Dict[str, 'PathCollection'] = {}
+        self.lineCollection: Optional['LineCollection'] = None
+        self.arrowCollections: Optional[Tuple['LineCollection', 'LineCollection']] = None
+        # 自上次生成以来发生变化的图元序号；批量模式下节点以marker为单位记录，线以'line'、'arrow'两类记录
+        self._dirty: Dict[str, Set] = {'node': set(), 'line': set(), 'text': set()}
+        # 空间索引，第一次查询时创建，之后随添加、移动增量维护
+        self.spatial: Optional[SpatialIndex] = None
+        # 图模型，第一次图查询时创建，之后随添加的线增量维护
+        self.graph: Optional[Graph] = None
+        # 依赖关系，第一次移动节点时创建
+        self.depends: Optional[Dependencies] = None
+        # 细节层次（见LevelOfDetail），启用后只绘制视口内的图元，文本由其按需生成
+        self.lod: Optional['LevelOfDetail'] = None
+        # 动画模式：为True时原地更新已生成的图元，不删除重建
+        self.live = False
+
+    # 获取绑定在坐标系上的场景模型，没有则绑定一个即时模型
+    @classmethod
+    def of(cls, ax: 'Axes') -> 'SceneModel':
+        model = getattr(ax, '_nets_model', None)
+        return model if model is not None else cls.attach(ax, eager=True)
+
+    # 为坐标系绑定一个场景模型，之后基于该坐标系的图元都记录到该模型
+    @classmethod
+    def attach(cls, ax: 'Axes', batch: bool = False, eager: bool = False) -> 'SceneModel':
+        model = cls(ax, batch, eager)
+        ax._nets_model = model
+        return model
+
+    @property
+    def nodeCount(self) -> int:
+        return len(self.nodeXY)
+
+    @property
+    def lineCount(self) -> int:
+        return len(self.lineXY)
+
+    @property
+    def textCount(self) -> int:
+        return len(self.textXY)
+
+    # 每个节点的marker
+    def nodeMarkers(self) -> np.ndarray:
+        return self.styles.column('style')[self.nodeStyle.data]
+
+    # 记录图元，返回其行号
+    def addNode(self, x: float, y: float, style: CommonStyleMixin, parent: int = -1) -> int:
+        sid = self.styles.intern(style)
+        index = self.nodeXY.append((x, y))
+        self.nodeStyle.append(sid)
+        self.nodeParent.append(parent)
+        if not self.batch:
+            self.nodeArtists.append(None)
+        self._markNodes([index], [sid])
+        self._flush()
+        return index
+
+    def addLine(self, x1: float, y1: float, x2: float, y2: float, style: CommonStyleMixin, arrow: bool = False,
+                src: int = -1, dst: int = -1) -> int:
+        index = self.lineXY.append((x1, y1, x2, y2))
+        self.lineStyle.append(self.styles.intern(style))
+        self.lineArrow.append(arrow)
+        self.lineNodes.append((src, dst))
+        if not self.batch:
+            self.lineArtists.append(None)
+        self._markLines([index], arrow)
+        self._flush()
+        return index
+
+    # nodes是文本锚定的两个节点，digits不小于0时文本是两节点的距离（见Dependency）
+    def addText(self, x: float, y: float, text: str, style: TextStyleMixin, parallel: bool = False,
+                nodes: Tuple[int, int] = (-1, -1), digits: int = -1, rotation: Optional[float] = None) -> int:
+        index = self.textXY.append((x, y))
+        self.textStyle.append(self.styles.intern(style))
+        self.textStr.append(text)
+        self.textRotation.append(style.rotation if rotation is None else rotation)
+        self.textParallel.append(parallel)
+        self.textNodes.append(nodes)
+        self.textOffset.append(self._anchorOffset(np.array([[x, y]]), np.array([nodes]))[0])
+        self.textDigits.append(digits)
+        self.textArtists.append(None)
+        self._dirty['text'].add(index)
+        self._flush()
+        return index
+
+    # 批量记录图元，返回行号范围
+    def addNodes(self, xy: np.ndarray, style: CommonStyleMixin, parents: Optional[np.ndarray] = None) -> range:
+        sid = self.styles.intern(style)
+        rows = self.nodeXY.extend(np.asarray(xy, dtype=float).reshape(-1, 2))
+        self.nodeStyle.extend(np.full(len(rows), sid))
+        self.nodeParent.extend(np.full(len(rows), -1) if parents is None else parents)
+        if not self.batch:
+            self.nodeArtists.extend([None] * len(rows))
+        self._markNodes(rows, [sid])
+        self._flush()
+        return rows
+
+    # nodes是两端节点的行号(M, 2)，不是由节点连成的线不传
+    def addLines(self, xy: np.ndarray, style: CommonStyleMixin, arrow: bool = False,
+                 nodes: Optional[np.ndarray] = None) -> range:
+        rows = self.lineXY.extend(np.asarray(xy, dtype=float).reshape(-1, 4))
+        self.lineStyle.extend(np.full(len(rows), self.styles.intern(style)))
+        self.lineArrow.extend(np.full(len(rows), arrow))
+        self.lineNodes.extend(np.full((len(rows), 2), -1) if nodes is None else nodes)
+        if not self.batch:
+            self.lineArtists.extend([None] * len(rows))
+        self._markLines(rows, arrow)
+        self._flush()
+        return rows
+
+    # rotation不传时使用样式中的角度；nodes是(T, 2)的锚定节点，digits可以是每个文本各自的位数
+    def addTexts(self, xy: np.ndarray, texts: List[str], style: TextStyleMixin,
+                 rotation: Optional[np.ndarray] = None, parallel: bool = False,
+                 nodes: Optional[np.ndarray] = None, digits=-1) -> range:
+        xy = np.asarray(xy, dtype=float).reshape(-1, 2)
+        nodes = np.full((len(xy), 2), -1) if nodes is None else np.asarray(nodes, dtype=np.int64).reshape(-1, 2)
+        rows = self.textXY.extend(xy)
+        self.textStyle.extend(np.full(len(rows), self.styles.intern(style)))
+        self.textStr.extend(texts)
+        self.textRotation.extend(np.full(len(rows), style.rotation) if rotation is None else rotation)
+        self.textParallel.extend(np.full(len(rows), parallel))
+        self.textNodes.extend(nodes)
+        self.textOffset.extend(self._anchorOffset(xy, nodes))
+        self.textDigits.extend(np.broadcast_to(digits, len(rows)))
+        self.textArtists.extend([None] * len(rows))
+        self._dirty['text'].update(rows)
+        self._flush()
+        return rows
+
+    # 文本相对于锚定节点中点的偏移，不锚定的文本为0
+    def _anchorOffset(self, xy: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+        bound = nodes[:, 0] >= 0
+        offset = np.zeros_like(xy)
+        ends = nodes[bound]
+        offset[bound] = xy[bound] - (self.nodeXY.data[ends[:, 0]] + self.nodeXY.data[ends[:, 1]]) / 2
+        return offset
+
+    # 用整列数据恢复场景（如从文件读取），styles按序号排列；列可以是内存映射数组，修改时才会复制
+    def restore(self, styles: List[CommonStyleMixin], columns: Dict[str, np.ndarray]) -> None:
+        for sid, style in enumerate(styles):
+            assert self.styles.intern(style) == sid, '样式表中存在重复的样式'
+        for name, array in columns.items():
+            getattr(self, name).assign(array)
+        if self.batch:
+            self._dirty['node'].update(self.styles.column('style')[np.unique(self.nodeStyle.data)])
+            self._dirty['line'].update({'arrow' if a else 'line' for a in np.unique(self.lineArrow.data)})
+        else:
+            self.nodeArtists = [None] * self.nodeCount
+            self.lineArtists = [None] * self.lineCount
+            self._dirty['node'].update(range(self.nodeCount))
+            self._dirty['line'].update(range(self.lineCount))
+        self.textArtists = [None] * self.textCount
+        self._dirty['text'].update(range(self.textCount))
+        if self.spatial is not None:
+            self.spatial.reset()
+        if self.graph is not None:
+            self.graph.reset()
+        if self.depends is not None:
+            self.depends.reset()
+        self._flush()
+
+    # 修改图元的位置与样式
+    def setNodePos(self, index: int, x: float, y: float) -> None:
+        self.setNodesPos([index], [(x, y)])
+
+    # 批量移动节点：以这些节点为端点的线、相对于它们创建的节点与锚定在它们上的文本随之更新，见Dependency
+    def setNodesPos(self, indices, xy: np.ndarray) -> None:
+        nodes, lines, texts = self.dependencies().moveNodes(indices, xy)
+        self._markNodes(nodes.tolist(), np.unique(self.nodeStyle.data[nodes]).tolist())
+        if self.spatial is not None:
+            self.spatial.nodes.invalidate(nodes)
+            self.spatial.lines.invalidate(lines)
+        if self.batch:
+            self._dirty['line'].update('arrow' if a else 'line' for a in np.unique(self.lineArrow.data[lines]))
+        else:
+            self._dirty['line'].update(lines.tolist())
+        self._dirty['text'].update(texts.tolist())
+        self._flush()
+
+    def setNodeStyle(self, index: int, style: CommonStyleMixin) -> None:
+        old = self.nodeStyle[index]
+        self.nodeStyle[index] = self.styles.intern(style)
+        self._markNodes([index, index], [old, self.nodeStyle[index]])
+        self._flush()
+
+    # 批量修改节点的样式
+    def setNodesStyle(self, indices, style: CommonStyleMixin) -> None:
+        indices = np.asarray(indices, dtype=np.int64)
+        old = np.unique(self.nodeStyle.data[indices]).tolist()
+        sid = self.styles.intern(style)
+        self.nodeStyle.data[indices] = sid
+        self._markNodes(indices.tolist(), old + [sid])
+        self._flush()
+
+    def setLine(self, index: int, x1: float, y1: float, x2: float, y2: float) -> None:
+        self.lineXY[index] = (x1, y1, x2, y2)
+        self._markLines([index], self.lineArrow[index])
+        if self.spatial is not None:
+            self.spatial.lines.invalidate([index])
+        self._flush()
+
+    def setLineStyle(self, index: int, style: CommonStyleMixin) -> None:
+        self.lineStyle[index] = self.styles.intern(style)
+        self._markLines([index], self.lineArrow[index])
+        self._flush()
+
+    def setLinesStyle(self, indices, style: CommonStyleMixin) -> None:
+        indices = np.asarray(indices, dtype=np.int64)
+        self.lineStyle.data[indices] = self.styles.intern(style)
+        if self.batch:
+            self._dirty['line'].update('arrow' if a else 'line' for a in np.unique(self.lineArrow.data[indices]))
+        else:
+            self._dirty['line'].update(indices.tolist())
+        self._flush()
+
+    def setTextPos(self, index: int, x: float, y: float) -> None:
+        self.setTextsPos([index], [(x, y)])
+
+    # 锚定的文本以新位置重新计算相对于锚定节点的偏移，之后移动节点时保持在新位置旁边
+    def setTextsPos(self, indices, xy: np.ndarray) -> None:
+        indices = np.asarray(indices, dtype=np.int64)
+        xy = np.asarray(xy, dtype=float).reshape(-1, 2)
+        self.textXY.data[indices] = xy
+        self.textOffset.data[indices] = self._anchorOffset(xy, self.textNodes.data[indices])
+        self._dirty['text'].update(indices.tolist())
+        self._flush()
+
+    def setText(self, index: int, text: str) -> None:
+        self.textStr[index] = text
+        self._dirty['text'].add(index)
+        self._flush()
+
+    # rotation为None时保留文本原有的角度，只替换样式
+    def setTextStyle(self, index: int, style: TextStyleMixin, rotation: Optional[float] = None) -> None:
+        self.textStyle[index] = self.styles.intern(style)
+        if rotation is not None:
+            self.textRotation[index] = rotation
+        self._dirty['text'].add(index)
+        self._flush()
+
+    def setTextRotation(self, index: int, rotation: float) -> None:
+        self.textRotation[index] = rotation
+        self._dirty['text'].add(index)
+        self._flush()
+
+    # 批量模式下节点以marker分组重建，记录受影响的marker；普通模式下记录行号
+    def _markNodes(self, indices, sids) -> None:
+        if self.batch:
+            markers = self.styles.column('style')
+            self._dirty['node'].update(markers[sid] for sid in sids)
+        else:
+            self._dirty['node'].update(indices)
+
+    def _markLines(self, indices, arrow: bool) -> None:
+        if self.batch:
+            self._dirty['line'].add('arrow' if arrow else 'line')
+        else:
+            self._dirty['line'].update(indices)
+
+    # 空间索引（见SpatialIndex），返回模型中的行号
+    def spatialIndex(self) -> SpatialIndex:
+        if self.spatial is None:
+            self.spatial = SpatialIndex(self)
+        return self.spatial
+
+    # 图模型（见Graph），节点编号是模型中的行号
+    def graphModel(self) -> Graph:
+        if self.graph is None:
+            self.graph = Graph(self)
+        return self.graph
+
+    # 依赖关系（见Dependency）
+    def dependencies(self) -> Dependencies:
+        if self.depends is None:
+            self.depends = Dependencies(self)
+        return self.depends
+
+    # 查找节点位于哪个集合的第几个（批量模式）
+    def locate(self, node: 'NodeVar') -> Tuple['PathCollection', int]:
+        self.materialize()
+        index = node.index
+        markers = self.nodeMarkers()
+        marker = markers[index]
+        return self.nodeCollections[marker], int(np.count_nonzero(markers[:index] == marker))
+
+    @property
+    def dirty(self) -> bool:
+        return any(self._dirty.values())
+
+    def _flush(self) -> None:
+        if self.eager:
+            self.materialize()
+
+    # 生成发生变化的图元
+    def materialize(self) -> None:
+        if not self.dirty:
+            return
+        if self.batch:
+            self._buildNodeGroups(self._dirty['node'])
+            if 'line' in self._dirty['line']:
+                self._buildLines()
+            if 'arrow' in self._dirty['line']:
+                self._buildArrows()
+        else:
+            self._buildEach(self._dirty['node'], self.nodeArtists, self._plotNode, self._updateNode)
+            self._buildEach(self._dirty['line'], self.lineArtists, self._plotLine, self._updateLine)
+            self._extendLimits(self.nodeXY.data[sorted(self._dirty['node'])])
+            self._extendLimits(self.lineXY.data[sorted(self._dirty['line'])])
+        if self.lod is None:
+            self._buildEach(self._dirty['text'], self.textArtists, self._plotText, self._updateText)
+        else:
+            self.lod.invalidate(self._dirty['text'])
+        for dirty in self._dirty.values():
+            dirty.clear()
+
+    # 普通模式：逐个生成新的图元，已有的图元原地更新
+    @staticmethod
+    def _buildEach(dirty: Set[int], artists: List[Optional['Artist']], plot, update) -> None:
+        for index in sorted(dirty):
+            artist = artists[index]
+            if artist is None:
+                artists[index] = plot(index)
+            else:
+                update(index, artist)
+
+    # 原地更新后把新的位置并入坐标范围（动画模式下不变）；autoscale_view要遍历全部图元，仍在范围内时不调用
+    def _extendLimits(self, xy: np.ndarray) -> None:
+        if self.live or not len(xy):
+            return
+        xy = xy.reshape(-1, 2)
+        limits = self.ax.dataLim
+        if (xy.min(axis=0) >= limits.min).all() and (xy.max(axis=0) <= limits.max).all():
+            return
+        self.ax.update_datalim(xy)
+        self.ax.autoscale_view()
+
+    def _plotNode(self, index: int) -> 'Artist':
+        x, y = self.nodeXY[index]
+        style = self.styles[self.nodeStyle[index]]
+        return self.ax.plot(x, y, marker=style.style, color=style.color, markersize=style.size)[0]
+
+    def _plotLine(self, index: int) -> 'Artist':
+        x1, y1, x2, y2 = self.lineXY[index]
+        style = self.styles[self.lineStyle[index]]
+        if self.lineArrow[index]:
+            return self.ax.annotate('', xy=(x2, y2), xytext=(x1, y1),
+                                    arrowprops=dict(arrowstyle='->', color=style.color, lw=style.size, ls=style.style))
+        return self.ax.plot((x1, x2), (y1, y2), color=style.color, lw=style.size, ls=style.style)[0]
+
+    def _plotText(self, index: int) -> 'Artist':
+        x, y = self.textXY[index]
+        return self.ax.text(x, y, self.textStr[index], **self._textProps(index))
+
+    # 普通模式：原地更新已有的图元
+    def _updateNode(self, index: int, artist: 'Artist') -> None:
+        x, y = self.nodeXY[index]
+        style = self.styles[self.nodeStyle[index]]
+        artist.set_data([x], [y])
+        artist.set_marker(style.style)
+        artist.set_color(style.color)
+        artist.set_markersize(style.size)
+
+    def _updateLine(self, index: int, artist: 'Artist') -> None:
+        x1, y1, x2, y2 = self.lineXY[index]
+        style = self.styles[self.lineStyle[index]]
+        if self.lineArrow[index]:
+            # Annotation：xy是终点，xyann是起点，箭头的样式在arrow_patch上
+            artist.xy = (x2, y2)
+            artist.xyann = (x1, y1)
+            artist = artist.arrow_patch
+        else:
+            artist.set_data((x1, x2), (y1, y2))
+        artist.set_color(style.color)
+        artist.set_linewidth(style.size)
+        artist.set_linestyle(style.style)
+
+    def _updateText(self, index: int, artist: 'Artist') -> None:
+        artist.set_position(self.textXY[index])
+        artist.set_text(self.textStr[index])
+        artist.update(self._textProps(index))
+
+    # 文本图元的属性；平行文本的角度由matplotlib在绘制时经坐标变换换算，画布纵横比或大小变化后仍与线平行
+    def _textProps(self, index: int) -> dict:
+        style = self.styles[self.textStyle[index]]
+        return dict(fontname=style.family, fontsize=style.size, style=style.style, ha='center', va='center',
+                    color=style.color, rotation=self.textRotation[index],
+                    transform_rotates_text=bool(self.textParallel[index]))
+
+    # 批量模式：只重建发生变化的marker分组
+    def _buildNodeGroups(self, markers: Set[str]) -> None:
+        if not markers:
+            return
+        all_markers = self.nodeMarkers()
+        rgba = self.styles.column('rgba')
+        size = self.styles.column('size')
+        for marker in markers:
+            members = np.flatnonzero(all_markers == marker)
+            if marker in self.nodeCollections:
+                self._setNodeGroup(self.nodeCollections[marker], members)
+                self._extendLimits(self.nodeXY.data[members])
+                continue
+            if not len(members):
+                continue
+            xy = self.nodeXY[members]
+            sid = self.nodeStyle[members]
+            self.nodeCollections[marker] = self.ax.scatter(
+                xy[:, 0],
+                xy[:, 1],
+                s=_uniform(size[sid] ** 2),
+                c=_uniform(rgba[sid]),
+                marker=marker,
+                edgecolors='face',
+                linewidths=1,
+                zorder=3
+            )
+
+    # 用members中的节点替换集合的数据
+    def _setNodeGroup(self, collection: 'PathCollection', members: np.ndarray) -> None:
+        sid = self.nodeStyle.data[members]
+        rgba = _uniform(self.styles.column('rgba')[sid])
+        collection.set_offsets(self.nodeXY.data[members])
+        collection.set_sizes(_uniform(self.styles.column('size')[sid] ** 2))
+        collection.set_facecolor(rgba)
+        collection.set_edgecolor(rgba)
+
+    # 一组线的颜色、线宽与线型
+    def _lineProps(self, members: np.ndarray) -> dict:
+        sid = self.lineStyle[members]
+        linestyles = self.styles.column('style')[sid]
+        return dict(
+            colors=_uniform(self.styles.column('rgba')[sid]),
+            linewidths=_uniform(self.styles.column('size')[sid]),
+            linestyles=linestyles[0] if len(sid) and (linestyles == linestyles[0]).all() else linestyles.tolist()
+        )
+
+    def _segments(self, members: np.ndarray) -> 'LineCollection':
+        from matplotlib.collections import LineCollection
+        return LineCollection(self.lineXY[members].reshape(-1, 2, 2), zorder=2, **self._lineProps(members))
+
+    # 箭头以磅为单位，不随坐标缩放，偏移到终点；方向取数据空间中的角度
+    def _arrowHeads(self, members: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        xy = self.lineXY[members]
+        size = self.styles.column('size')[self.lineStyle[members]]
+        t = np.arctan2(xy[:, 3] - xy[:, 1], xy[:, 2] - xy[:, 0])
+        c, s = np.cos(t)[:, None], np.sin(t)[:, None]
+        x, y = _ArrowHead[:, 0], _ArrowHead[:, 1]
+        heads = np.stack((x * c - y * s, x * s + y * c), axis=-1) * (4 + size)[:, None, None]
+        return heads, xy[:, 2:], size
+
+    # 用members中的线替换集合的数据
+    # 各段的Path共享一个顶点数组（记录在集合上），线不变时直接改写该数组，不为每一段重新创建Path；
+    # 同样记录各段的样式序号，样式不变时不再设置颜色、线宽与线型
+    def _setSegments(self, collection: 'LineCollection', members: np.ndarray) -> None:
+        xy = self.lineXY.data[members].reshape(-1, 2, 2)
+        rows = getattr(collection, '_nets_rows', None)
+        if rows is not None and len(rows) == len(members) and (rows == members).all():
+            collection._nets_xy[...] = xy
+            collection.stale = True
+        else:
+            collection.set_segments(xy)
+            collection._nets_rows, collection._nets_xy = members, xy
+        sid = self.lineStyle.data[members]
+        old = getattr(collection, '_nets_style', None)
+        if not len(members) or old is not None and len(old) == len(sid) and (old == sid).all():
+            return
+        props = self._lineProps(members)
+        collection.set_color(props['colors'])
+        collection.set_linewidth(props['linewidths'])
+        collection.set_linestyle(props['linestyles'])
+        collection._nets_style = sid
+
+    def _setArrows(self, members: np.ndarray) -> None:
+        shafts, tips = self.arrowCollections
+        self._setSegments(shafts, members)
+        heads, offsets, size = self._arrowHeads(members)
+        tips.set_segments(heads)
+        tips.set_offsets(offsets)
+        if len(members):
+            tips.set_color(shafts.get_colors())
+            tips.set_linewidth(_uniform(size))
+
+    def _buildLines(self) -> None:
+        members = np.flatnonzero(~self.lineArrow.data)
+        if self.lineCollection is not None:
+            self._setSegments(self.lineCollection, members)
+            self._extendLimits(self.lineXY.data[members])
+            return
+        if not len(members):
+            return
+        self.lineCollection = self._segments(members)
+        self.ax.add_collection(self.lineCollection)
+        self.ax.autoscale_view()
+
+    def _buildArrows(self) -> None:
+        members = np.flatnonzero(self.lineArrow.data)
+        if self.arrowCollections is not None:
+            self._setArrows(members)
+            self._extendLimits(self.lineXY.data[members])
+            return
+        if not len(members):
+            return
+        shafts = self._segments(members)
+        heads, tips, size = self._arrowHeads(members)
+        from matplotlib.collections import LineCollection
+        from matplotlib.transforms import Affine2D
+        tips = LineCollection(
+            heads,
+            offsets=tips,
+            offset_transform=self.ax.transData,
+            transform=Affine2D().scale(1 / 72) + self.ax.figure.dpi_scale_trans,
+            colors=shafts.get_colors(),
+            linewidths=_uniform(size),
+            zorder=2
+        )
+        self.ax.add_collection(shafts)
+        self.ax.add_collection(tips, autolim=False)
+        self.ax.autoscale_view()
+        self.arrowCollections = (shafts, tips)
+
+__all__ = ['SceneModel']
@@ -0,0 +1,290 @@
+"""
+空间索引
+对场景模型中的节点与线建立索引，支持最近邻、k近邻、半径、矩形与线段相交查询，返回模型中的行号。
+- 索引结构：按Morton码（Z序）排序后逐层打包的R树，每个结点的外包矩形覆盖其fanout个子结点；
+  查询时逐层用NumPy向量化地筛选结点，复杂度约为O(log n + 结果数)
+- 增量维护：新添加的行先放在尾部逐个检查，尾部超过_Tail行时建成一棵树，
+  大小相近的树合并重建（对数方法），均摊每行O(log n)
+- 移动过的节点/线（setNodePos、setLine、layout等）在树中被标记为失效，改为逐个检查；失效行过多时整体重建
+节点视为长度为0的线段，两类元素共用同一套精确判断。
+本模块只依赖NumPy。
+"""
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+# 尾部逐个检查的最大行数
+_Tail = 256
+_Fanout = 16
+
+# 中心点的Morton码，用于排序使相邻的元素在树中相邻
+def _morton(boxes: np.ndarray) -> np.ndarray:
+    center = np.column_stack(((boxes[:, 0] + boxes[:, 2]) / 2, (boxes[:, 1] + boxes[:, 3]) / 2))
+    low = center.min(axis=0)
+    span = np.maximum(center.max(axis=0) - low, 1e-300)
+    code = np.zeros(len(boxes), dtype=np.uint64)
+    for axis in (0, 1):
+        v = ((center[:, axis] - low[axis]) / span[axis] * 65535).astype(np.uint64)
+        for shift, mask in ((16, 0x0000FFFF0000FFFF), (8, 0x00FF00FF00FF00FF), (4, 0x0F0F0F0F0F0F0F0F),
+                            (2, 0x3333333333333333), (1, 0x5555555555555555)):
+            v = (v | (v << np.uint64(shift))) & np.uint64(mask)
+        code |= v << np.uint64(axis)
+    return code
+
+def _bounds(segments: np.ndarray) -> np.ndarray:
+    return np.column_stack((np.minimum(segments[:, 0], segments[:, 2]), np.minimum(segments[:, 1], segments[:, 3]),
+                            np.maximum(segments[:, 0], segments[:, 2]), np.maximum(segments[:, 1], segments[:, 3])))
+
+# 外包矩形到点的最小、最大距离
+def _minDist(boxes: np.ndarray, x: float, y: float) -> np.ndarray:
+    dx = np.maximum(np.maximum(boxes[:, 0] - x, x - boxes[:, 2]), 0)
+    dy = np.maximum(np.maximum(boxes[:, 1] - y, y - boxes[:, 3]), 0)
+    return np.hypot(dx, dy)
+
+def _maxDist(boxes: np.ndarray, x: float, y: float) -> np.ndarray:
+    return np.hypot(np.maximum(np.abs(boxes[:, 0] - x), np.abs(boxes[:, 2] - x)),
+                    np.maximum(np.abs(boxes[:, 1] - y), np.abs(boxes[:, 3] - y)))
+
+def _overlaps(boxes: np.ndarray, box: Tuple[float, float, float, float]) -> np.ndarray:
+    return (boxes[:, 0] <= box[2]) & (boxes[:, 2] >= box[0]) & (boxes[:, 1] <= box[3]) & (boxes[:, 3] >= box[1])
+
+# 点到线段的距离
+def pointSegmentDistances(segments: np.ndarray, x, y) -> np.ndarray:
+    dx, dy = segments[:, 2] - segments[:, 0], segments[:, 3] - segments[:, 1]
+    length2 = dx * dx + dy * dy
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.clip(np.where(length2 > 0, ((x - segments[:, 0]) * dx + (y - segments[:, 1]) * dy) / length2, 0), 0, 1)
+    return np.hypot(segments[:, 0] + t * dx - x, segments[:, 1] + t * dy - y)
+
+# 线段到一条线段的距离，相交时为0
+def segmentDistances(segments: np.ndarray, segment: Tuple[float, float, float, float]) -> np.ndarray:
+    x1, y1, x2, y2 = segment
+
+    def cross(ax, ay, bx, by, cx, cy):
+        return (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+
+    o1 = cross(x1, y1, x2, y2, segments[:, 0], segments[:, 1])
+    o2 = cross(x1, y1, x2, y2, segments[:, 2], segments[:, 3])
+    o3 = cross(segments[:, 0], segments[:, 1], segments[:, 2], segments[:, 3], x1, y1)
+    o4 = cross(segments[:, 0], segments[:, 1], segments[:, 2], segments[:, 3], x2, y2)
+    crossing = (o1 * o2 < 0) & (o3 * o4 < 0)
+    query = np.array([segment], dtype=float)
+    # 不相交（含共线、端点接触）时，最近距离出现在某个端点上
+    distance = np.minimum.reduce([
+        pointSegmentDistances(segments, x1, y1),
+        pointSegmentDistances(segments, x2, y2),
+        pointSegmentDistances(np.repeat(query, len(segments), axis=0), segments[:, 0], segments[:, 1]),
+        pointSegmentDistances(np.repeat(query, len(segments), axis=0), segments[:, 2], segments[:, 3]),
+    ])
+    return np.where(crossing, 0, distance)
+
+# 线段是否与矩形相交（Liang-Barsky裁剪）
+def segmentsInBox(segments: np.ndarray, box: Tuple[float, float, float, float]) -> np.ndarray:
+    x, y = segments[:, 0], segments[:, 1]
+    dx, dy = segments[:, 2] - x, segments[:, 3] - y
+    low = np.zeros(len(segments))
+    high = np.ones(len(segments))
+    hit = np.ones(len(segments), dtype=bool)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for p, q in ((-dx, x - box[0]), (dx, box[2] - x), (-dy, y - box[1]), (dy, box[3] - y)):
+            hit &= (p != 0) | (q >= 0)
+            ratio = q / p
+            low = np.where(p < 0, np.maximum(low, ratio), low)
+            high = np.where(p > 0, np.minimum(high, ratio), high)
+    return hit & (low <= high)
+
+# 一棵静态的打包R树，rows是元素在模型中的行号
+class _PackedTree(object):
+    def __init__(self, rows: np.ndarray, segments: np.ndarray):
+        boxes = _bounds(segments)
+        order = np.argsort(_morton(boxes), kind='stable')
+        self.rows = rows[order]
+        self.levels = [boxes[order]]
+        while len(self.levels[-1]) > 1:
+            below = self.levels[-1]
+            starts = np.arange(0, len(below), _Fanout)
+            self.levels.append(np.column_stack((np.minimum.reduceat(below[:, 0], starts),
+                                                np.minimum.reduceat(below[:, 1], starts),
+                                                np.maximum.reduceat(below[:, 2], starts),
+                                                np.maximum.reduceat(below[:, 3], starts))))
+        # 每个结点中仍有效的元素数，行失效时递减；按行号排序的行与其在叶层的位置用于查找失效行
+        self.live = [np.ones(len(self.rows), dtype=np.int64)]
+        for level in range(1, len(self.levels)):
+            self.live.append(np.add.reduceat(self.live[-1], np.arange(0, len(self.live[-1]), _Fanout)))
+        self.sortedRows = np.sort(self.rows)
+        self.slots = np.argsort(self.rows, kind='stable')
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _children(self, level: int, ids: np.ndarray) -> np.ndarray:
+        ids = (ids[:, None] * _Fanout + np.arange(_Fanout)).ravel()
+        return ids[ids < len(self.levels[level - 1])]
+
+    # 自顶向下保留keep(外包矩形)为True的结点，返回保留下来的元素行号
+    def search(self, keep: Callable[[np.ndarray], np.ndarray]) -> np.ndarray:
+        ids = np.arange(len(self.levels[-1]))
+        for level in range(len(self.levels) - 1, -1, -1):
+            ids = ids[keep(self.levels[level][ids])]
+            if level == 0 or not len(ids):
+                break
+            ids = self._children(level, ids)
+        return self.rows[ids]
+
+    # 标记失效的行（不在本树中的行忽略），更新各层结点的有效元素数
+    def invalidate(self, rows: np.ndarray) -> None:
+        at = np.minimum(np.searchsorted(self.sortedRows, rows), len(self.sortedRows) - 1)
+        slots = self.slots[at[self.sortedRows[at] == rows]]
+        slots = slots[self.live[0][slots] > 0]
+        for live in self.live:
+            np.subtract.at(live, slots, 1)
+            slots = slots // _Fanout
+
+    # k近邻的候选：只看仍有有效元素的结点，每个这样的结点至少包含一个有效元素，
+    # 所以第k小的最大距离是k近邻距离的上界；这样的结点不足k个时不剪枝
+    def nearest(self, x: float, y: float, k: int) -> np.ndarray:
+        ids = np.arange(len(self.levels[-1]))
+        for level in range(len(self.levels) - 1, 0, -1):
+            ids = ids[self.live[level][ids] > 0]
+            boxes = self.levels[level][ids]
+            if len(ids) > k:
+                far = _maxDist(boxes, x, y)
+                bound = np.partition(far, k - 1)[k - 1]
+                ids = ids[_minDist(boxes, x, y) <= bound]
+            ids = self._children(level, ids)
+        return self.rows[ids]
+
+# 一类元素（节点或线）的索引
+class _Layer(object):
+    def __init__(self, count: Callable[[], int], segments: Callable[[np.ndarray], np.ndarray]):
+        self.count = count
+        self.segments = segments
+        self.reset()
+
+    def reset(self) -> None:
+        self.runs: List[_PackedTree] = []
+        self.built = 0
+        self.moved = np.zeros(0, dtype=bool)
+        self.movedCount = 0
+
+    # 标记已移动的行，它们在树中的位置失效
+    def invalidate(self, rows) -> None:
+        rows = np.asarray(rows, dtype=np.int64)
+        rows = np.unique(rows[rows < self.built])
+        if not len(rows):
+            return
+        self._grow()
+        fresh = rows[~self.moved[rows]]
+        self.moved[fresh] = True
+        self.movedCount += len(fresh)
+        for run in self.runs:
+            run.invalidate(fresh)
+
+    def _grow(self) -> None:
+        if len(self.moved) < self.built:
+            self.moved = np.concatenate((self.moved, np.zeros(self.built - len(self.moved), dtype=bool)))
+
+    # 查询前整理：尾部过长时建树并合并，失效行过多时整体重建；返回需要逐个检查的行
+    def _sync(self) -> np.ndarray:
+        count = self.count()
+        if self.movedCount > max(_Tail, self.built // 8):
+            self.reset()
+        if count - self.built > _Tail:
+            rows = np.arange(self.built, count)
+            while self.runs and len(self.runs[-1]) <= 2 * len(rows):
+                rows = np.concatenate((self.runs.pop().rows, rows))
+            self.runs.append(_PackedTree(rows, self.segments(rows)))
+            self.built = count
+            self._grow()
+            if self.movedCount:
+                self.moved[rows] = False
+                self.movedCount = int(np.count_nonzero(self.moved))
+        loose = np.arange(self.built, count)
+        if self.movedCount:
+            loose = np.concatenate((np.flatnonzero(self.moved), loose))
+        return loose
+
+    # 依次用prune筛选每棵树，去掉失效行后与需要逐个检查的行合并，再用exact精确判断
+    def query(self, prune: Callable, exact: Callable[[np.ndarray], np.ndarray]) -> np.ndarray:
+        loose = self._sync()
+        parts = [loose]
+        for run in self.runs:
+            rows = run.search(prune)
+            if self.movedCount:
+                rows = rows[~self.moved[rows]]
+            parts.append(rows)
+        rows = np.concatenate(parts)
+        return np.sort(rows[exact(self.segments(rows))])
+
+    def box(self, box: Tuple[float, float, float, float]) -> np.ndarray:
+        return self.query(lambda b: _overlaps(b, box), lambda s: segmentsInBox(s, box))
+
+    def radius(self, x: float, y: float, r: float) -> np.ndarray:
+        return self.query(lambda b: _minDist(b, x, y) <= r, lambda s: pointSegmentDistances(s, x, y) <= r)
+
+    def segment(self, segment: Tuple[float, float, float, float], tol: float) -> np.ndarray:
+        x1, y1, x2, y2 = segment
+        box = (min(x1, x2) - tol, min(y1, y2) - tol, max(x1, x2) + tol, max(y1, y2) + tol)
+        return self.query(lambda b: _overlaps(b, box), lambda s: segmentDistances(s, segment) <= tol)
+
+    # 按距离从近到远返回k个行号
+    def nearest(self, x: float, y: float, k: int) -> np.ndarray:
+        loose = self._sync()
+        parts = [loose]
+        for run in self.runs:
+            rows = run.nearest(x, y, k)
+            if self.movedCount:
+                rows = rows[~self.moved[rows]]
+            parts.append(rows)
+        rows = np.concatenate(parts)
+        distance = pointSegmentDistances(self.segments(rows), x, y)
+        order = np.lexsort((rows, distance))[:k]
+        return rows[order]
+
+class SpatialIndex(object):
+    def __init__(self, model):
+        self.model = model
+        self.nodes = _Layer(lambda: model.nodeCount, lambda rows: np.tile(model.nodeXY.data[rows], 2))
+        self.lines = _Layer(lambda: model.lineCount, lambda rows: model.lineXY.data[rows])
+
+    def reset(self) -> None:
+        self.nodes.reset()
+        self.lines.reset()
+
+    # 节点查询
+    def nearestNode(self, x: float, y: float) -> int:
+        rows = self.nodes.nearest(x, y, 1)
+        return int(rows[0]) if len(rows) else -1
+
+    def nearestNodes(self, x: float, y: float, k: int) -> np.ndarray:
+        return self.nodes.nearest(x, y, k)
+
+    def nodesInRadius(self, x: float, y: float, r: float) -> np.ndarray:
+        return self.nodes.radius(x, y, r)
+
+    def nodesInBox(self, x1: float, y1: float, x2: float, y2: float) -> np.ndarray:
+        return self.nodes.box((min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)))
+
+    # 与线段距离不超过tol的节点
+    def nodesOnSegment(self, x1: float, y1: float, x2: float, y2: float, tol: float = 0) -> np.ndarray:
+        return self.nodes.segment((x1, y1, x2, y2), tol)
+
+    # 线查询，距离是点到线段的距离
+    def nearestLine(self, x: float, y: float) -> int:
+        rows = self.lines.nearest(x, y, 1)
+        return int(rows[0]) if len(rows) else -1
+
+    def nearestLines(self, x: float, y: float, k: int) -> np.ndarray:
+        return self.lines.nearest(x, y, k)
+
+    def linesInRadius(self, x: float, y: float, r: float) -> np.ndarray:
+        return self.lines.radius(x, y, r)
+
+    def linesInBox(self, x1: float, y1: float, x2: float, y2: float) -> np.ndarray:
+        return self.lines.box((min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)))
+
+    # 与线段相交（或距离不超过tol）的线
+    def linesOnSegment(self, x1: float, y1: float, x2: float, y2: float, tol: float = 0) -> np.ndarray:
+        return self.lines.segment((x1, y1, x2, y2), tol)
+
+__all__ = ['SpatialIndex', 'pointSegmentDistances', 'segmentDistances', 'segmentsInBox']
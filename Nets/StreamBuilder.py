@@ -0,0 +1,107 @@
+"""
+流式构建
+从任意可迭代对象（如生成器、逐行读取的日志）读取节点与边，按固定大小的块写入场景模型：
+- 每次只从迭代器取出一块（chunk个）元素，转为NumPy数组后一次写入各列，之后这一块的Python对象即可释放，
+  因此Python对象的峰值数量只与chunk有关，与流的长度无关
+- 节点是(编号, x, y)，边是(编号, 编号)；编号是非负整数，可以稀疏、很大（如哈希值、计数器）；
+  编号到模型行号的映射保存为若干段按编号排序的NumPy数组，用searchsorted查找，占用的内存只与节点数成正比；
+  每块新出现的编号成为一段，大小相近的段合并（对数方法），均摊每个编号O(log n)
+- 边引用了尚未出现的编号时，自动在原点创建节点，之后可以用NetScene.layout计算位置；
+  重复出现的节点编号更新该节点的位置，以其为端点的线随之移动
+写入的元素在render（show/save）时统一生成图元，批量模式（batch=True）下合并为集合图元。
+"""
+from typing import Iterable, Iterator, List, Tuple
+from itertools import islice
+
+import numpy as np
+
+from Nets.BaseMixin import CommonStyleMixin
+
+class StreamBuilder(object):
+    def __init__(self, model, chunk: int, nodestyle: CommonStyleMixin, linestyle: CommonStyleMixin, arrow: bool = False):
+        if chunk < 1:
+            raise ValueError('chunk必须是正整数')
+        self.model = model
+        self.chunk = chunk
+        self.nodestyle = nodestyle
+        self.linestyle = linestyle
+        self.arrow = arrow
+        # 节点编号 -> 模型行号：(按编号排序的编号, 对应的行号)的若干段，段从大到小排列
+        self._runs: List[Tuple[np.ndarray, np.ndarray]] = []
+        # 已写入的节点数与边数
+        self.nodeCount = 0
+        self.edgeCount = 0
+
+    def _blocks(self, items: Iterable) -> Iterator[List[tuple]]:
+        iterator = iter(items)
+        while True:
+            block = list(islice(iterator, self.chunk))
+            if not block:
+                return
+            yield block
+
+    # 编号对应的模型行号，尚未出现的编号为-1；先排序再查找，访问各段时按顺序前进
+    def rows(self, ids) -> np.ndarray:
+        ids = np.asarray(ids, dtype=np.int64)
+        flat = ids.reshape(-1)
+        order = np.argsort(flat)
+        needles = flat[order]
+        found = np.full(len(flat), -1, dtype=np.int64)
+        for keys, values in self._runs:
+            at = np.minimum(np.searchsorted(keys, needles), len(keys) - 1)
+            hit = keys[at] == needles
+            found[hit] = values[at[hit]]
+        rows = np.empty(len(flat), dtype=np.int64)
+        rows[order] = found
+        return rows.reshape(ids.shape)
+
+    # 在xy处创建节点，ids中不能有重复，也不能是已出现的编号；返回新节点的行号
+    def _create(self, ids: np.ndarray, xy: np.ndarray) -> np.ndarray:
+        if len(ids) and ids.min() < 0:
+            raise ValueError('节点编号必须是非负整数')
+        created = np.asarray(self.model.addNodes(xy, self.nodestyle), dtype=np.int64).reshape(-1)
+        self.nodeCount += len(created)
+        keys, values = ids, created
+        while self._runs and len(self._runs[-1][0]) <= 2 * len(keys):
+            run = self._runs.pop()
+            keys, values = np.concatenate((run[0], keys)), np.concatenate((run[1], values))
+        if len(keys):
+            order = np.argsort(keys, kind='stable')
+            self._runs.append((keys[order], values[order]))
+        return created
+
+    # 读取(编号, x, y)，返回读取的个数
+    def addNodes(self, items: Iterable[Tuple[int, float, float]]) -> int:
+        count = 0
+        for block in self._blocks(items):
+            ids = np.fromiter((item[0] for item in block), dtype=np.int64, count=len(block))
+            xy = np.array([item[1:3] for item in block], dtype=float).reshape(-1, 2)
+            count += len(block)
+            # 同一块中重复的编号以最后一次为准
+            ids, last = np.unique(ids[::-1], return_index=True)
+            xy = xy[::-1][last]
+            rows = self.rows(ids)
+            known = rows >= 0
+            if known.any():
+                self.model.setNodesPos(rows[known], xy[known])
+            if not known.all():
+                self._create(ids[~known], xy[~known])
+        return count
+
+    # 读取(编号, 编号)，返回读取的个数
+    def addEdges(self, items: Iterable[Tuple[int, int]]) -> int:
+        count = 0
+        for block in self._blocks(items):
+            pairs = np.array(block, dtype=np.int64).reshape(-1, 2)
+            rows = self.rows(pairs)
+            unknown = rows < 0
+            if unknown.any():
+                missing, inverse = np.unique(pairs[unknown], return_inverse=True)
+                rows[unknown] = self._create(missing, np.zeros((len(missing), 2)))[inverse]
+            xy = self.model.nodeXY.data
+            self.model.addLines(np.hstack((xy[rows[:, 0]], xy[rows[:, 1]])), self.linestyle, self.arrow, rows)
+            self.edgeCount += len(pairs)
+            count += len(pairs)
+        return count
+
+__all__ = ['StreamBuilder']
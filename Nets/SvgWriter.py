@@ -0,0 +1,245 @@
+"""
+SVG输出
+不经过matplotlib，直接把场景模型中的节点、线、箭头与文本写成SVG，适合大规模场景：
+- 流式写出：按块（chunk行）格式化后立即写入文件对象，不在内存中拼出整个文档，耗时与文件大小都与图元数成正比
+- 共享定义：每种节点样式（marker、大小、颜色）在<defs>中定义一次，节点用<use>引用；
+  线、箭头、文本的样式写成<style>中的类，箭头头部是共享的<marker>
+- 同一块中样式相同的普通线合并为一个<path>的多段子路径；箭头与文本逐个输出
+- 文本使用<text>元素，字体、字号、斜体与颜色来自TextStyleMixin，保留文本的旋转角度
+坐标：以点（1/72英寸）为单位，画布是边长size的正方形，数据范围等比例缩放后居中，y轴向上；
+节点大小、线宽、字号都以点为单位，与matplotlib一致。绘制顺序为线、箭头、节点、文本。
+"""
+from typing import IO, Dict, Iterable, List, Optional, Tuple, Union
+from html import escape
+import math
+
+import numpy as np
+
+from Nets.SceneModel import SceneModel
+
+# 单位大小的marker路径（y轴向下），大小即matplotlib的markersize；x、+只描边
+def _polygon(count: int, radius: float = .5, inner: Optional[float] = None, turn: float = 0) -> str:
+    points = []
+    steps = count * 2 if inner is not None else count
+    for i in range(steps):
+        r = inner if inner is not None and i % 2 else radius
+        t = math.radians(90 + turn) + 2 * math.pi * i / steps
+        points.append(f'{r * math.cos(t):.4f},{-r * math.sin(t):.4f}')
+    return 'M' + 'L'.join(points) + 'Z'
+
+_Markers: Dict[str, str] = {
+    's': 'M-.5,-.5H.5V.5H-.5Z',
+    'D': _polygon(4, .7071),
+    'd': 'M0,-.7071L.4243,0L0,.7071L-.4243,0Z',
+    '^': 'M0,-.5L.5,.5H-.5Z',
+    'v': 'M0,.5L.5,-.5H-.5Z',
+    '<': 'M-.5,0L.5,-.5V.5Z',
+    '>': 'M.5,0L-.5,-.5V.5Z',
+    'p': _polygon(5),
+    'h': _polygon(6),
+    'H': _polygon(6, turn=30),
+    '8': _polygon(8, turn=22.5),
+    '*': _polygon(5, inner=.5 * .381966),
+}
+_Strokes: Dict[str, str] = {
+    'x': 'M-.5,-.5L.5,.5M-.5,.5L.5,-.5',
+    '+': 'M-.5,0H.5M0,-.5V.5',
+    '|': 'M0,-.5V.5',
+    '_': 'M-.5,0H.5',
+}
+# 圆形marker的半径（相对大小）
+_Circles = {'o': .5, '.': .25, ',': .1}
+
+# matplotlib默认的虚线样式，以线宽为单位
+_Dashes = {
+    '--': (3.7, 1.6), 'dashed': (3.7, 1.6),
+    ':': (1, 1.65), 'dotted': (1, 1.65),
+    '-.': (6.4, 1.6, 1, 1.6), 'dashdot': (6.4, 1.6, 1, 1.6),
+}
+
+def _color(rgba: np.ndarray) -> str:
+    r, g, b = (int(round(c * 255)) for c in rgba[:3])
+    return f'#{r:02x}{g:02x}{b:02x}'
+
+def _paint(rgba: np.ndarray, kind: str) -> str:
+    paint = f'{kind}="{_color(rgba)}"'
+    if rgba[3] < 1:
+        paint += f' {kind}-opacity="{rgba[3]:.3g}"'
+    return paint
+
+def _css(rgba: np.ndarray, kind: str) -> str:
+    css = f'{kind}:{_color(rgba)}'
+    if rgba[3] < 1:
+        css += f';{kind}-opacity:{rgba[3]:.3g}'
+    return css
+
+def _dash(style: str, width: float) -> str:
+    pattern = _Dashes.get(style)
+    if pattern is None:
+        return ''
+    return ';stroke-dasharray:' + ','.join(f'{value * width:.3g}' for value in pattern)
+
+def _family(family) -> str:
+    names = [family] if isinstance(family, str) else list(family)
+    return ','.join(f"'{name}'" if ' ' in name else name for name in names + ['sans-serif'])
+
+def _chunks(count: int, chunk: int) -> Iterable[slice]:
+    for start in range(0, count, chunk):
+        yield slice(start, min(start + chunk, count))
+
+class SvgWriter(object):
+    def __init__(self, model: SceneModel, size: float = 432, margin: float = .05, title: Optional[str] = None,
+                 background: Optional[str] = 'white', chunk: int = 65536):
+        self.model = model
+        self.size = size
+        self.margin = margin
+        self.title = title
+        self.background = background
+        self.chunk = chunk
+        self.scale, self.origin = self._fit()
+
+    # 数据空间到画布：等比例缩放，数据范围居中
+    def _fit(self) -> Tuple[float, np.ndarray]:
+        model = self.model
+        parts = [model.nodeXY.data, model.lineXY.data.reshape(-1, 2), model.textXY.data]
+        points = np.concatenate([part for part in parts if len(part)]) if any(len(part) for part in parts) \
+            else np.zeros((1, 2))
+        points = points[np.isfinite(points).all(axis=1)]
+        if not len(points):
+            points = np.zeros((1, 2))
+        low, high = points.min(axis=0), points.max(axis=0)
+        span = float(max((high - low).max(), 1e-12))
+        scale = self.size * (1 - 2 * self.margin) / span
+        if self.title:
+            scale *= .92
+        center = (low + high) / 2
+        origin = np.array([self.size / 2 - center[0] * scale, self.size / 2 + center[1] * scale])
+        return scale, origin
+
+    def _map(self, xy: np.ndarray) -> np.ndarray:
+        out = np.empty_like(xy, dtype=float)
+        out[..., 0::2] = xy[..., 0::2] * self.scale + self.origin[0]
+        out[..., 1::2] = self.origin[1] - xy[..., 1::2] * self.scale
+        return out
+
+    def write(self, file: IO[str]) -> None:
+        size = f'{self.size:g}'
+        file.write('<?xml version="1.0" encoding="utf-8"?>\n'
+                   f'<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" '
+                   f'version="1.1" width="{size}pt" height="{size}pt" viewBox="0 0 {size} {size}">\n')
+        self._writeDefs(file)
+        if self.background:
+            file.write(f'<rect width="100%" height="100%" fill="{escape(self.background)}"/>\n')
+        if self.title:
+            file.write(f'<text x="{self.size / 2:.2f}" y="{self.size * .05:.2f}" text-anchor="middle" '
+                       f'dominant-baseline="central" font-size="12">{escape(self.title, quote=False)}</text>\n')
+        self._writeLines(file)
+        self._writeArrows(file)
+        self._writeNodes(file)
+        self._writeTexts(file)
+        file.write('</svg>\n')
+
+    def _used(self, column) -> List[int]:
+        return np.unique(column.data).tolist()
+
+    # 节点样式的<symbol>、箭头的<marker>与线、文本的类
+    def _writeDefs(self, file: IO[str]) -> None:
+        model = self.model
+        styles = model.styles
+        rgba = styles.column('rgba')
+        file.write('<defs>\n')
+        for sid in self._used(model.nodeStyle):
+            style = styles[sid]
+            file.write(f'<symbol id="n{sid}" overflow="visible">{self._marker(style.style, float(style.size), rgba[sid])}'
+                       '</symbol>\n')
+        arrows = np.unique(model.lineStyle.data[model.lineArrow.data]).tolist()
+        for sid in arrows:
+            # 与SceneModel批量模式的箭头相同：开口的'->'，长度为4 + 线宽（点）
+            head = 4 + float(styles[sid].size)
+            width = float(styles[sid].size)
+            file.write(f'<marker id="a{sid}" markerUnits="userSpaceOnUse" orient="auto" overflow="visible" '
+                       f'refX="0" refY="0"><path d="M{-head:.2f},{-head / 2:.2f}L0,0L{-head:.2f},{head / 2:.2f}" '
+                       f'fill="none" {_paint(rgba[sid], "stroke")} stroke-width="{width:g}"/></marker>\n')
+        file.write('<style>\n')
+        for sid in self._used(model.lineStyle):
+            style = styles[sid]
+            width = float(style.size)
+            rule = f'fill:none;{_css(rgba[sid], "stroke")};stroke-width:{width:g}{_dash(style.style, width)}'
+            file.write(f'.l{sid}{{{rule}}}\n')
+            if sid in arrows:
+                file.write(f'.a{sid}{{{rule};marker-end:url(#a{sid})}}\n')
+        for sid in self._used(model.textStyle):
+            style = styles[sid]
+            file.write(f'.t{sid}{{{_css(rgba[sid], "fill")};font-size:{float(style.size):g}px;'
+                       f'font-family:{_family(style.family)};font-style:{style.style};'
+                       'text-anchor:middle;dominant-baseline:central}\n')
+        file.write('</style>\n</defs>\n')
+
+    # 与matplotlib一致，填充的marker外加1点宽、同色的描边；单位路径经scale放大，描边宽度相应缩小
+    @staticmethod
+    def _marker(marker: str, size: float, rgba: np.ndarray) -> str:
+        size = max(size, 1e-3)
+        stroke = f'{_paint(rgba, "stroke")} stroke-width="{1 / size:.4g}" transform="scale({size:g})"'
+        if marker in _Strokes:
+            return f'<path d="{_Strokes[marker]}" fill="none" {stroke}/>'
+        if marker in _Markers:
+            return f'<path d="{_Markers[marker]}" {_paint(rgba, "fill")} {stroke}/>'
+        return f'<circle r="{_Circles.get(marker, .5)}" {_paint(rgba, "fill")} {stroke}/>'
+
+    def _writeLines(self, file: IO[str]) -> None:
+        model = self.model
+        rows = np.flatnonzero(~model.lineArrow.data)
+        for part in _chunks(len(rows), self.chunk):
+            members = rows[part]
+            xy = self._map(model.lineXY.data[members])
+            sid = model.lineStyle.data[members]
+            for style in np.unique(sid).tolist():
+                segments = xy[sid == style].tolist()
+                file.write(f'<path class="l{style}" d="')
+                file.write(''.join('M%.2f %.2fL%.2f %.2f' % tuple(segment) for segment in segments))
+                file.write('"/>\n')
+
+    def _writeArrows(self, file: IO[str]) -> None:
+        model = self.model
+        rows = np.flatnonzero(model.lineArrow.data)
+        for part in _chunks(len(rows), self.chunk):
+            members = rows[part]
+            xy = self._map(model.lineXY.data[members]).tolist()
+            sid = model.lineStyle.data[members].tolist()
+            file.write(''.join('<path class="a%d" d="M%.2f %.2fL%.2f %.2f"/>\n' % (s, *segment)
+                               for s, segment in zip(sid, xy)))
+
+    def _writeNodes(self, file: IO[str]) -> None:
+        model = self.model
+        for part in _chunks(model.nodeCount, self.chunk):
+            xy = self._map(model.nodeXY.data[part]).tolist()
+            sid = model.nodeStyle.data[part].tolist()
+            file.write(''.join('<use xlink:href="#n%d" x="%.2f" y="%.2f"/>\n' % (s, x, y)
+                               for s, (x, y) in zip(sid, xy)))
+
+    def _writeTexts(self, file: IO[str]) -> None:
+        model = self.model
+        for part in _chunks(model.textCount, self.chunk):
+            xy = self._map(model.textXY.data[part]).tolist()
+            sid = model.textStyle.data[part].tolist()
+            rotation = model.textRotation.data[part].tolist()
+            strings = model.textStr.data[part]
+            lines = []
+            for s, (x, y), angle, text in zip(sid, xy, rotation, strings):
+                text = escape(str(text), quote=False)
+                # 逆时针为正，SVG的y轴向下，取反
+                turn = f' transform="rotate({-angle:.2f} {x:.2f} {y:.2f})"' if angle % 360 else ''
+                lines.append(f'<text class="t{s}" x="{x:.2f}" y="{y:.2f}"{turn}>{text}</text>\n')
+            file.write(''.join(lines))
+
+# 把场景模型写成SVG，target是文件名或文本文件对象
+def writeSvg(model: SceneModel, target: Union[str, IO[str]], size: float = 432, margin: float = .05, title: Optional[str] = None,
+             background: Optional[str] = 'white', chunk: int = 65536) -> None:
+    writer = SvgWriter(model, size, margin, title, background, chunk)
+    if isinstance(target, str):
+        with open(target, 'w', encoding='utf-8', newline='\n') as file:
+            writer.write(file)
+    else:
+        writer.write(target)
+
+__all__ = ['SvgWriter', 'writeSvg']
@@ -0,0 +1,96 @@
+"""
+导入时间基准测试
+每次在新的解释器中测量导入（以及创建headless场景）的耗时，取多次的中位数，并检查加载了哪些重量级模块：
+- 几何计算（Nets.Geometry、Nets.BaseVar中的Offset、transToOffset）、场景文件与NetScene本身都不应加载matplotlib
+- headless场景只加载Figure与Agg画布，不应加载pyplot
+违反上述约束，或与之前的结果相比超过threshold倍时以状态码1退出，可用于防止导入时间的回退。
+
+用法（在仓库根目录）：
+    python benchmarks/imports.py --out imports.json
+    python benchmarks/imports.py --compare imports.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+Root = Path(__file__).resolve().parent.parent
+
+# 用例 -> (语句, 不应加载的模块)
+Cases: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    'geometry': ('import Nets.Geometry', ('matplotlib',)),
+    'basevar': ('from Nets.BaseVar import Offset, transToOffset', ('matplotlib',)),
+    'scenefile': ('import Nets.SceneFile', ('matplotlib',)),
+    'netscene': ('from Nets.NetScene import NetScene', ('matplotlib',)),
+    'headless': ('from Nets.NetScene import NetScene; NetScene(figsize=4, headless=True)', ('matplotlib.pyplot',)),
+}
+
+Heavy = ('numpy', 'matplotlib', 'matplotlib.pyplot')
+
+_Probe = '''
+import json, sys, time
+start = time.perf_counter()
+{statement}
+seconds = time.perf_counter() - start
+print(json.dumps(dict(seconds=seconds, modules=[name for name in {heavy!r} if name in sys.modules])))
+'''
+
+# 在新的解释器中执行一次
+def probe(statement: str) -> dict:
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, (str(Root), env.get('PYTHONPATH'))))
+    output = subprocess.run([sys.executable, '-c', _Probe.format(statement=statement, heavy=Heavy)], cwd=Root,
+                            env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def runCase(name: str, repeat: int) -> dict:
+    statement, forbidden = Cases[name]
+    samples = [probe(statement) for _ in range(repeat)]
+    modules = samples[-1]['modules']
+    return dict(
+        case=name,
+        seconds=statistics.median(sample['seconds'] for sample in samples),
+        modules=modules,
+        violations=[module for module in forbidden if module in modules],
+    )
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Nets导入时间基准测试')
+    parser.add_argument('--cases', nargs='+', default=list(Cases), choices=list(Cases))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--out', help='结果文件')
+    parser.add_argument('--compare', help='之前的结果文件')
+    parser.add_argument('--threshold', type=float, default=1.5)
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = {result['case']: result['seconds'] for result in json.load(f)['results']}
+    failed = 0
+    results = []
+    for name in args.cases:
+        result = runCase(name, args.repeat)
+        results.append(result)
+        line = f'{name:<10} {result["seconds"] * 1000:8.1f} ms  loaded: {", ".join(result["modules"]) or "-"}'
+        if result['violations']:
+            failed += 1
+            line += f'  FAIL: loads {", ".join(result["violations"])}'
+        if name in baseline and baseline[name] > 0:
+            ratio = result['seconds'] / baseline[name]
+            line += f'  x{ratio:.2f}'
+            if ratio > args.threshold:
+                failed += 1
+                line += ' slower'
+        print(line)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(dict(python=sys.version.split()[0], results=results), f, ensure_ascii=False, indent=1)
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,205 @@
+"""
+场景基准测试
+用合成场景测量NetScene在不同规模下的表现，结果写成JSON，便于在不同提交之间比较：
+- 场景（workload）：
+  - nodes：逐个addNode
+  - path：drawPathWithNode，节点与线各占一半
+  - star：addPtoPsWithNodeAndText，从中心到各点的线、节点与长度文本
+  - polar：addBindsToAll，极坐标链的节点、线与长度文本
+  - labeled：addNodes、addEdges与addNodeSigns构成的带标签图
+  规模是场景中的图元总数（节点、线、文本），默认1k、10k、100k
+- 模式：普通模式（normal）与批量模式（batch）
+- 测量：构造（build）、生成图元（render）、首次绘制（draw）、各格式保存（save，写入内存）的时间（秒），
+  进程的内存峰值（MB，需要resource模块，Windows上为null）以及坐标系中的图元数（artists）
+每个用例在独立的子进程中运行，内存峰值互不影响；repeat大于1时时间取各次的最小值。
+
+用法（在仓库根目录）：
+    python benchmarks/scenes.py --out base.json
+    python benchmarks/scenes.py --sizes 1000 10000 --modes batch --formats png --out new.json --compare base.json
+compare时逐项列出新旧时间之比，超过threshold的视为变慢，此时以状态码1退出。
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+Root = Path(__file__).resolve().parent.parent
+if str(Root) not in sys.path:
+    sys.path.insert(0, str(Root))
+
+from Nets.NetScene import NetScene
+from Nets.BaseVar import Offset
+
+# 各场景：size是图元总数
+def buildNodes(scene: NetScene, size: int, rng: np.random.Generator) -> None:
+    for x, y in (rng.random((size, 2)) * 100).tolist():
+        scene.addNode(Offset(x, y))
+
+def buildPath(scene: NetScene, size: int, rng: np.random.Generator) -> None:
+    steps = rng.normal(0, 1, (max(size // 2, 2), 2)).cumsum(axis=0)
+    scene.drawPathWithNode([Offset(x, y) for x, y in steps.tolist()])
+
+def buildStar(scene: NetScene, size: int, rng: np.random.Generator) -> None:
+    points = rng.normal(0, 10, (max(size // 3, 1), 2))
+    scene.addPtoPsWithNodeAndText(Offset(0, 0), [Offset(x, y) for x, y in points.tolist()], visible=1)
+
+def buildPolar(scene: NetScene, size: int, rng: np.random.Generator) -> None:
+    count = max(size // 3, 1)
+    pairs = np.column_stack((rng.random(count) + 0.5, rng.random(count) * 360))
+    scene.addBindsToAll(Offset(0, 0), pairs.tolist(), visible=1)
+
+def buildLabeled(scene: NetScene, size: int, rng: np.random.Generator) -> None:
+    count = max(size // 3, 2)
+    nodes = scene.addNodes(rng.random((count, 2)) * 100)
+    scene.addEdges(rng.integers(0, count, (count, 2)), nodes=nodes)
+    scene.addNodeSigns((str(i) for i in range(count)), nodes)
+
+Workloads: Dict[str, Callable[[NetScene, int, np.random.Generator], None]] = {
+    'nodes': buildNodes,
+    'path': buildPath,
+    'star': buildStar,
+    'polar': buildPolar,
+    'labeled': buildLabeled,
+}
+
+# 进程的内存峰值（MB）
+def peakMemory() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux以KB为单位，macOS以字节为单位
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+def _timed(action: Callable[[], None]) -> float:
+    start = time.perf_counter()
+    action()
+    return time.perf_counter() - start
+
+# 运行一个用例（在子进程中调用）
+def runCase(workload: str, size: int, mode: str, formats: List[str], repeat: int) -> dict:
+    # 默认字体缺失时每个文本都会警告一次
+    logging.getLogger('matplotlib.font_manager').setLevel(logging.ERROR)
+    result = dict(workload=workload, size=size, mode=mode)
+    times: Dict[str, List[float]] = {}
+    for _ in range(repeat):
+        scene = NetScene(False, figsize=8, headless=True, batch=mode == 'batch')
+        rng = np.random.default_rng(size)
+        record = {
+            'build': _timed(lambda: Workloads[workload](scene, size, rng)),
+            'render': _timed(scene.render),
+            'draw': _timed(scene.figure.canvas.draw),
+        }
+        for format in formats:
+            record[f'save.{format}'] = _timed(lambda: scene.saveBytes(format))
+        for key, value in record.items():
+            times.setdefault(key, []).append(value)
+        model = scene.model
+        result['elements'] = model.nodeCount + model.lineCount + model.textCount
+        result['artists'] = len(scene.ax.get_children())
+        scene.close()
+    best = {key: min(values) for key, values in times.items()}
+    result.update((key, best[key]) for key in ('build', 'render', 'draw'))
+    result['save'] = {format: best[f'save.{format}'] for format in formats}
+    result['peak_mb'] = peakMemory()
+    return result
+
+# 每个用例使用新的子进程
+def runIsolated(context, *args) -> dict:
+    with context.Pool(1) as pool:
+        try:
+            return pool.apply(runCase, args)
+        except Exception as e:
+            workload, size, mode = args[:3]
+            return dict(workload=workload, size=size, mode=mode, error=f'{type(e).__name__}: {e}')
+
+def environment() -> dict:
+    import matplotlib
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=Root, capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return dict(
+        commit=commit,
+        time=time.strftime('%Y-%m-%dT%H:%M:%S'),
+        python=platform.python_version(),
+        numpy=np.__version__,
+        matplotlib=matplotlib.__version__,
+        platform=platform.platform(),
+        machine=platform.machine(),
+    )
+
+def _key(result: dict) -> tuple:
+    return result['workload'], result['size'], result['mode']
+
+def _metrics(result: dict) -> Dict[str, float]:
+    metrics = {key: result[key] for key in ('build', 'render', 'draw') if key in result}
+    metrics.update((f'save.{format}', value) for format, value in result.get('save', {}).items())
+    return metrics
+
+# 与之前的结果比较，返回变慢的项数
+def compare(results: List[dict], baseline: List[dict], threshold: float) -> int:
+    old = {_key(result): _metrics(result) for result in baseline}
+    slower = 0
+    for result in results:
+        before = old.get(_key(result))
+        if before is None:
+            continue
+        for metric, value in _metrics(result).items():
+            if metric not in before or before[metric] <= 0:
+                continue
+            ratio = value / before[metric]
+            flag = ''
+            if ratio > threshold:
+                flag = '  slower'
+                slower += 1
+            print(f'{"/".join(map(str, _key(result))):<24} {metric:<10} '
+                  f'{before[metric]:10.4f} -> {value:10.4f}  x{ratio:.2f}{flag}')
+    return slower
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='NetScene基准测试')
+    parser.add_argument('--workloads', nargs='+', default=list(Workloads), choices=list(Workloads))
+    parser.add_argument('--sizes', nargs='+', type=int, default=[1000, 10000, 100000])
+    parser.add_argument('--modes', nargs='+', default=['normal', 'batch'], choices=['normal', 'batch'])
+    parser.add_argument('--formats', nargs='+', default=['png', 'svg', 'pdf'])
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--out', default='benchmark.json')
+    parser.add_argument('--compare', help='之前的结果文件')
+    parser.add_argument('--threshold', type=float, default=1.2)
+    args = parser.parse_args(argv)
+
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for size in args.sizes:
+        for workload in args.workloads:
+            for mode in args.modes:
+                result = runIsolated(context, workload, size, mode, args.formats, args.repeat)
+                results.append(result)
+                if 'error' in result:
+                    print(f'{workload:<8} {size:>7} {mode:<6} {result["error"]}')
+                    continue
+                saves = ' '.join(f'{format} {value:.3f}' for format, value in result['save'].items())
+                peak = 'n/a' if result['peak_mb'] is None else f'{result["peak_mb"]:.0f}MB'
+                print(f'{workload:<8} {size:>7} {mode:<6} build {result["build"]:.3f} render {result["render"]:.3f} '
+                      f'draw {result["draw"]:.3f} save[{saves}] peak {peak} artists {result["artists"]}')
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(dict(environment=environment(), results=results), f, ensure_ascii=False, indent=1)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        return 1 if compare(results, baseline, args.threshold) else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
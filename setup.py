@@ -5,6 +5,24 @@ Nets
 - BaseMixin.py
 - BaseVar.py
 - NetScene.py
+- SceneModel.py
+- ElementStore.py
+- Geometry.py
+- BatchRender.py
+- SceneFile.py
+- RenderCache.py
+- Layout.py
+- SpatialIndex.py
+- LabelPlacement.py
+- LevelOfDetail.py
+- Graph.py
+- StreamBuilder.py
+- Importers.py
+- Animation.py
+- Dependency.py
+- Instrumentation.py
+- SvgWriter.py
+- Constraints.py
 """
 from setuptools import setup, find_packages
 
@@ -20,6 +38,7 @@ setup(
     packages=find_packages(),
     install_requires=[
         "matplotlib",
+        "numpy",
     ],
     classifiers=[
         "Programming Language :: Python :: 3",
@@ -0,0 +1,19 @@
+import logging
+
+import pytest
+
+from Nets.NetScene import NetScene
+
+# 默认字体缺失时每个文本都会警告一次
+logging.getLogger('matplotlib.font_manager').setLevel(logging.ERROR)
+
+# 不经过pyplot的场景，用完释放
+@pytest.fixture
+def scene():
+    with NetScene(False, figsize=4, headless=True) as scene:
+        yield scene
+
+@pytest.fixture
+def batchScene():
+    with NetScene(False, figsize=4, headless=True, batch=True) as scene:
+        yield scene
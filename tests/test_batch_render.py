@@ -0,0 +1,40 @@
+import os
+import time
+
+from Nets.BaseVar import Offset
+from Nets.BatchRender import RenderJob, renderMany
+from Nets.NetScene import NetScene
+
+# builder需要定义在模块顶层才能发送到工作进程
+def _build(delay=0.):
+    time.sleep(delay)
+    scene = NetScene(False, figsize=2, headless=True)
+    scene.addNode(Offset(1, 1))
+    return scene
+
+def _crash():
+    os._exit(1)
+
+def _fail():
+    raise ValueError('bad scene')
+
+def _jobs(tmp_path, builders):
+    return [RenderJob(builder, str(tmp_path / f'scene{index}'), args=args) for index, (builder, args) in enumerate(builders)]
+
+# 进度按完成的先后报告，结果按任务的顺序返回
+def test_progress_in_completion_order(tmp_path):
+    calls = []
+    jobs = _jobs(tmp_path, [(_build, (1.,)), (_build, ())])
+    results = renderMany(jobs, workers=2, progress=lambda done, total, result: calls.append((done, total, result.fileName)))
+    assert calls == [(1, 2, jobs[1].fileName), (2, 2, jobs[0].fileName)]
+    assert [result.fileName for result in results] == [job.fileName for job in jobs]
+    assert all(result.ok and os.path.exists(result.files[0]) for result in results)
+
+# 工作进程崩溃只影响该任务，其余任务的结果保留
+def test_crashed_worker_recorded_per_scene(tmp_path):
+    calls = []
+    jobs = _jobs(tmp_path, [(_build, ()), (_crash, ()), (_build, ()), (_fail, ()), (_build, ())])
+    results = renderMany(jobs, workers=2, chunksize=2, progress=lambda *args: calls.append(args[0]))
+    assert [result.ok for result in results] == [True, False, True, False, True]
+    assert '异常退出' in results[1].error and 'bad scene' in results[3].error
+    assert calls == [1, 2, 3, 4, 5]
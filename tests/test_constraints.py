@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from Nets.BaseVar import Offset
+from Nets.Constraints import solve
+
+# 一致的约束求解到tol以内
+def test_square_converges():
+    pairs = [(0, 1), (1, 2), (2, 3), (3, 0), (0, 2)]
+    lengths = [1, 1, 1, 1, np.sqrt(2)]
+    pos = [(0, 0), (1.2, .1), (.9, 1.3), (-.2, .8)]
+    xy, lr, ar, convergence = solve(4, pos, (pairs, lengths), ([(0, 1)], [0]), [0])
+    assert convergence.converged and convergence.reason == 'tol'
+    assert 0 < convergence.iterations < 100
+    assert np.abs(lr).max() < 1e-6 and np.abs(ar).max() < 1e-6
+    assert xy[2] == pytest.approx((1, 1))
+
+# 约束矛盾时报告未收敛与最大残差
+def test_inconsistent_reports_residual():
+    xy, lr, ar, convergence = solve(3, [(0, 0), (1, 0), (3, 0)], ([(0, 1), (1, 2), (0, 2)], [1, 1, 3]), pinned=[0])
+    assert not convergence.converged
+    assert convergence.residual == pytest.approx(np.abs(lr).max())
+    assert convergence.residual > .1
+
+def test_iteration_limit_reported():
+    n = 200
+    t = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    ring = np.c_[np.cos(t), np.sin(t)] * n / (2 * np.pi)
+    pairs = np.c_[np.arange(n), (np.arange(n) + 1) % n]
+    delta = ring[pairs[:, 1]] - ring[pairs[:, 0]]
+    pos = ring + np.random.default_rng(0).normal(0, 2, ring.shape)
+    convergence = solve(n, pos, (pairs, np.hypot(delta[:, 0], delta[:, 1])), pinned=[0], iterations=2)[3]
+    assert not convergence.converged
+    assert (convergence.iterations, convergence.reason) == (2, 'iterations')
+
+def test_scene_warns_when_unconverged(scene):
+    ns, ls, ts = scene.addBindsToAll(Offset(0, 0), [(3, 0), (4, 90)], closure=True, visible=1)
+    with pytest.warns(RuntimeWarning, match='未收敛'):
+        lr, ar, convergence = scene.solveConstraints(lengths=zip(ls, [3, 4, 9]), pinned=[ns[0]])
+    assert not convergence.converged
+
+# addMixedBindsToALl建立的线绑定了节点，求解后线与长度标注随之更新
+def test_mixed_binds_follow_solve(scene):
+    a = scene.addNode(Offset(0, 0))
+    ns, ls, ts = scene.addMixedBindsToALl(a, [[None, 3, 0], [None, 4, 80]], closure=True, visible=2)
+    lr, ar, convergence = scene.solveConstraints(lengths=zip(ls, [3, 4, 5]), angles=[(ls[0], 0)], pinned=[a])
+    assert convergence.converged
+    assert ns[2].pos.x == pytest.approx(3) and ns[2].pos.y == pytest.approx(4)
+    for line in ls:
+        start, end = (int(i) for i in scene.model.lineNodes[line.index])
+        assert scene.model.lineXY[line.index].tolist() == pytest.approx(scene.model.nodeXY[[start, end]].reshape(-1).tolist())
+    assert [t.text for t in ts] == ['3.00', '4.00', '5.00']
+
+def test_unbound_line_rejected(scene):
+    line = scene.addLine(Offset(0, 0), Offset(1, 0), isBind=True)
+    with pytest.raises(ValueError):
+        scene.solveConstraints(lengths=[(line, 2)])
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from Nets.BaseVar import Offset
+
+def _xy(element):
+    return element.pos.x, element.pos.y
+
+def test_path_lines_follow_nodes(scene):
+    ns, ls, ts = scene.drawPathWithNodeAndText([Offset(0, 0), Offset(4, 0), Offset(4, 3)], closure=True, visible=1)
+    scene.moveNode(ns[1], Offset(4, 4))
+    assert scene.model.lineXY[ls[0].index].tolist() == [0, 0, 4, 4]
+    assert scene.model.lineXY[ls[1].index].tolist() == [4, 4, 4, 3]
+    assert [t.text for t in ts] == ['5.7', '1.0', '5.0']
+
+# 相对于上一个节点创建的节点随之平移；闭合线的长度标注重新测量，closureText保持原文
+def test_bound_chain_follows_root(scene):
+    ns, ls, ts = scene.addBindsToAll(Offset(0, 0), [(3, 0), (4, 90)], closure=True, visible=1, parallel=True)
+    scene.moveNode(ns[0], Offset(1, 1))
+    assert [_xy(n) for n in ns] == [(1, 1), (4, 1), (4, 5)]
+    assert [t.text for t in ts] == ['3.0', '4.0', '5.0']
+    scene.moveNode(ns[2], Offset(4, 1 + 3))
+    assert ts[2].text == '4.2'
+    assert ts[1].rotation == pytest.approx(90)
+    assert ts[2].rotation == pytest.approx(np.degrees(np.arctan2(-3, -3)) % 360)
+
+def test_mixed_binds_follow_nodes(scene):
+    a = scene.addNode(Offset(0, 0))
+    b = scene.addNode(Offset(3, 4))
+    ns, ls, ts = scene.addMixedBindsToALl(a, [[None, 3, 0], [b, 4, None], [None, '2', 90]], closure=True, visible=1)
+    assert [t.text for t in ts] == ['3.0', '4.0', '2.0', '6.7']
+    before = [_xy(t) for t in ts]
+    scene.moveNode(ns[1], Offset(6, 0))
+    assert scene.model.lineXY[ls[0].index].tolist() == [0, 0, 6, 0]
+    assert scene.model.lineXY[ls[1].index].tolist() == [6, 0, 3, 4]
+    # 新建节点的长度标注重新测量；连到已有节点与字符串的长度保持给定的文本
+    assert [t.text for t in ts] == ['6.0', '4.0', '2.0', '6.7']
+    assert _xy(ts[0]) == pytest.approx((before[0][0] + 1.5, before[0][1]))
+    assert _xy(ts[3]) == before[3]
+
+# 直接设置的位置与placeLabels的结果在之后移动节点时保留：文本保持相对于锚定节点的新偏移
+def test_explicit_text_position_survives_moves(scene):
+    ns, ls, ts = scene.drawPathWithNodeAndText([Offset(0, 0), Offset(4, 0)])
+    label = ts[0]
+    label.pos = Offset(2, 3)
+    scene.moveNode(ns[1], Offset(4, 2))
+    assert _xy(label) == pytest.approx((2, 4))
+    scene.placeLabels()
+    placed = _xy(label)
+    scene.moveNode(ns[0], Offset(0, 2))
+    assert _xy(label) == pytest.approx((placed[0], placed[1] + 1))
+
+def test_move_nodes_batch(scene):
+    ns, ls = scene.drawPathWithNode([Offset(0, 0), Offset(1, 0), Offset(2, 0)])
+    scene.moveNodes([ns[0], ns[2], ns[0]], [(9, 9), (2, 5), (0, -1)])
+    assert scene.model.lineXY.data.tolist() == [[0, -1, 1, 0], [1, 0, 2, 5]]
+    scene.render()
+    assert not scene.model.dirty
+
+# 批量模式下移动后重新生成的集合使用新的位置
+def test_batch_collections_follow_moves(batchScene):
+    ns, ls = batchScene.drawPathWithNode([Offset(0, 0), Offset(1, 0)])
+    batchScene.render()
+    batchScene.moveNode(ns[1], Offset(1, 1))
+    batchScene.render()
+    segments = batchScene.model.lineCollection.get_segments()
+    np.testing.assert_array_equal(segments[0], [(0, 0), (1, 1)])
+    np.testing.assert_array_equal(batchScene.model.nodeCollections['o'].get_offsets(), [(0, 0), (1, 1)])
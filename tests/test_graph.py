@@ -0,0 +1,115 @@
+import heapq
+
+import numpy as np
+import pytest
+
+from Nets.BaseVar import Offset
+
+Triangle = [Offset(0, 0), Offset(3, 0), Offset(3, 4)]
+
+def _isConnected(scene, nodes):
+    groups = scene.components()
+    return any(set(nodes) <= set(group) for group in groups)
+
+# 构造路径、星形与混合链的方法都应当把线连在节点上
+def test_path_builders_create_edges(scene):
+    ns, ls = scene.drawPathWithNode(Triangle, closure=True)
+    ends = scene.model.lineNodes.data[[line.index for line in ls]]
+    assert ends.tolist() == [[ns[0].index, ns[1].index], [ns[1].index, ns[2].index], [ns[2].index, ns[0].index]]
+    ns2, _, _ = scene.drawPathWithNodeAndText([Offset(10, 0), Offset(12, 0), Offset(12, 2)])
+    assert _isConnected(scene, ns) and _isConnected(scene, ns2)
+    assert len(scene.components()) == 2
+    assert [scene.degree(node) for node in ns2] == [1, 2, 1]
+
+def test_line_builders_create_edges(scene):
+    a, b, line = scene.addLineBindNodes(Offset(0, 0), Offset(1, 1))
+    assert scene.neighbors(a) == [b]
+    c = scene.addNode(Offset(5, 5))
+    scene.addLine(b, c)
+    lines, leaves = scene.addPtoPsWithNode(c, [Offset(1, 0), Offset(0, 1), Offset(-1, 0)])
+    assert scene.degree(c) == 4
+    assert _isConnected(scene, [a, b, c] + leaves)
+
+# 起点不是节点时，线只有终点锚定在节点上，不是图中的边
+def test_star_from_offset_anchors_leaves_only(scene):
+    lines, leaves = scene.addPtoPsWithNode(Offset(0, 0), [Offset(1, 0), Offset(0, 1)])
+    ends = scene.model.lineNodes.data[[line.index for line in lines]]
+    assert ends.tolist() == [[-1, leaves[0].index], [-1, leaves[1].index]]
+    assert scene.degree(leaves[0]) == 0
+
+def test_mixed_binds_form_connected_graph(scene):
+    a = scene.addNode(Offset(0, 0))
+    b = scene.addNode(Offset(3, 4))
+    ns, ls, _ = scene.addMixedBindsToALl(a, [[None, 3, 0], [b, '4.0', None], [None, 2, 90]], closure=True,
+                                         closureText='x')
+    assert len(ls) == 4
+    assert len(scene.components()) == 1
+    nodes, lines, length = scene.shortestPath(a, b)
+    assert nodes == [a, ns[1], b]
+    assert length == pytest.approx(7)
+
+def _randomGraph(scene, rng, count=300, edges=600):
+    nodes = scene.addNodes(rng.random((count, 2)) * 50)
+    pairs = rng.integers(0, count, (edges, 2))
+    pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+    arrows = rng.random(len(pairs)) < .3
+    scene.addEdges(pairs[~arrows], nodes=nodes)
+    scene.addEdges(pairs[arrows], nodes=nodes, arrow=True)
+    return np.vstack((pairs[~arrows], pairs[arrows])), np.concatenate((np.zeros((~arrows).sum(), bool), np.ones(arrows.sum(), bool)))
+
+# 与逐条边计算的度、连通分量与Dijkstra比较
+def test_queries_match_brute_force(scene):
+    rng = np.random.default_rng(4)
+    pairs, arrows = _randomGraph(scene, rng)
+    graph = scene.graph
+    count = scene.model.nodeCount
+    np.testing.assert_array_equal(graph.degree(), np.bincount(pairs.ravel(), minlength=count))
+    out = np.bincount(np.concatenate((pairs[:, 0], pairs[~arrows, 1])), minlength=count)
+    np.testing.assert_array_equal(graph.degree(directed=True), out)
+    parent = list(range(count))
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+    for u, v in pairs.tolist():
+        parent[find(u)] = find(v)
+    roots = np.array([find(i) for i in range(count)])
+    label = graph.components()
+    assert len(np.unique(label)) == len(np.unique(roots))
+    assert (label[pairs[:, 0]] == label[pairs[:, 1]]).all()
+    xy = scene.model.nodeXY.data
+    for directed in (False, True):
+        adjacency = [[] for _ in range(count)]
+        for (u, v), arrow in zip(pairs.tolist(), arrows.tolist()):
+            w = float(np.hypot(*(xy[u] - xy[v])))
+            adjacency[u].append((v, w))
+            if not (directed and arrow):
+                adjacency[v].append((u, w))
+        expected = np.full(count, np.inf)
+        expected[0] = 0
+        heap = [(0., 0)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > expected[u]:
+                continue
+            for v, w in adjacency[u]:
+                if d + w < expected[v]:
+                    expected[v] = d + w
+                    heapq.heappush(heap, (d + w, v))
+        dist, _ = graph.shortestPaths(0, directed=directed)
+        np.testing.assert_allclose(dist, expected)
+
+# 查询之后添加的线与移动后的长度在下一次查询时生效
+def test_graph_is_incremental(scene):
+    ns, _ = scene.drawPathWithNode(Triangle)
+    assert len(scene.components()) == 1
+    extra = scene.addNode(Offset(9, 9))
+    assert len(scene.components()) == 2
+    scene.addConnect(ns[2], extra)
+    assert len(scene.components()) == 1
+    assert scene.shortestPath(ns[0], ns[2])[2] == pytest.approx(7)
+    scene.moveNode(ns[1], Offset(0, 8))
+    assert scene.shortestPath(ns[0], ns[2])[2] == pytest.approx(13)
+    scene.addConnect(ns[0], ns[2])
+    assert scene.shortestPath(ns[0], ns[2])[2] == pytest.approx(5)
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from Nets.BaseVar import NodeVar, Offset
+
+def _write(path, text):
+    path.write_text(text, encoding='utf8')
+    return str(path)
+
+def test_edge_list_with_node_table(scene, tmp_path):
+    edges = _write(tmp_path / 'edges.csv', 'source,target,weight,label\n1,2,0.5,a\n2,3,,\n"3", 1 ,2,c\n')
+    nodes = _write(tmp_path / 'nodes.csv', 'id,x,y,label\n1,0,0,one\n2,3,0,\n3,3,4,three\n')
+    nodeRows, lineRows, keys, weights = scene.importEdgeList(edges, nodes)
+    assert len(nodeRows) == 3 and len(lineRows) == 3
+    assert [int(k) for k in keys] == [1, 2, 3]
+    np.testing.assert_array_equal(weights, [.5, np.nan, 2])
+    model = scene.model
+    np.testing.assert_array_equal(model.nodeXY.data[nodeRows.start:nodeRows.stop], [(0, 0), (3, 0), (3, 4)])
+    np.testing.assert_array_equal(model.lineNodes.data[lineRows.start:lineRows.stop] - nodeRows.start,
+                                  [(0, 1), (1, 2), (2, 0)])
+    # 空标签不创建文本
+    assert sorted(model.textStr.data) == ['a', 'c', 'one', 'three']
+    assert len(scene.components()) == 1
+
+# 分隔符由扩展名推断；没有节点表时节点在原点；标签锚定在节点上，移动节点时随之更新
+def test_tsv_without_nodes(scene, tmp_path):
+    edges = _write(tmp_path / 'edges.tsv', 'source\ttarget\tlabel\r\nx\ty\tedge\r\n\r\ny\tz\t\r\n')
+    nodeRows, lineRows, keys, weights = scene.importEdgeList(edges)
+    assert keys.astype(str).tolist() == ['x', 'y', 'z']
+    assert weights is None
+    assert not scene.model.nodeXY.data.any()
+    scene.moveNode(NodeVar.view(scene.model, nodeRows.start + 1), Offset(4, 2))
+    assert scene.model.lineXY[lineRows.start].tolist() == [0, 0, 4, 2]
+
+def test_edge_list_errors(scene, tmp_path):
+    with pytest.raises(ValueError):
+        scene.importEdgeList(_write(tmp_path / 'missing.csv', 'from,to\n1,2\n'))
+    with pytest.raises(ValueError):
+        scene.importEdgeList(_write(tmp_path / 'ragged.csv', 'source,target\n1,2\n3\n'))
+    with pytest.raises(ValueError):
+        scene.importEdgeList(_write(tmp_path / 'empty.csv', ''))
+
+GraphML = '''<?xml version="1.0" encoding="UTF-8"?>
+<graphml xmlns="http://graphml.graphdrawing.org/xmlns">
+  <key id="d0" for="node" attr.name="x" attr.type="double"/>
+  <key id="d1" for="node" attr.name="y" attr.type="double"/>
+  <key id="d2" for="node" attr.name="label" attr.type="string"/>
+  <key id="d3" for="edge" attr.name="weight" attr.type="double"/>
+  <graph id="G" edgedefault="directed">
+    <node id="a"><data key="d0">0</data><data key="d1">0</data><data key="d2">A</data></node>
+    <node id="b"><data key="d0">1</data><data key="d1">2</data></node>
+    <node id="c"><data key="d0">-1</data><data key="d1">5</data><data key="d2">C</data></node>
+    <edge source="a" target="b"><data key="d3">1.5</data></edge>
+    <edge source="b" target="c"/>
+  </graph>
+</graphml>
+'''
+
+def test_graphml(scene, tmp_path):
+    nodeRows, lineRows, keys, weights = scene.importGraphML(_write(tmp_path / 'g.graphml', GraphML))
+    model = scene.model
+    assert keys.astype(str).tolist() == ['a', 'b', 'c']
+    np.testing.assert_array_equal(model.nodeXY.data[nodeRows.start:nodeRows.stop], [(0, 0), (1, 2), (-1, 5)])
+    np.testing.assert_array_equal(weights, [1.5, np.nan])
+    # 有向图的边带箭头
+    assert model.lineArrow.data[lineRows.start:lineRows.stop].all()
+    assert sorted(model.textStr.data) == ['A', 'C']
+    a = NodeVar.view(model, nodeRows.start)
+    assert scene.degree(a, directed=True) == 1
+    nodeRows, lineRows, _, _ = scene.importGraphML(str(tmp_path / 'g.graphml'), arrow=False)
+    assert not model.lineArrow.data[lineRows.start:lineRows.stop].any()
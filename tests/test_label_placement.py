@@ -0,0 +1,36 @@
+import numpy as np
+
+from Nets.BaseVar import Offset
+from Nets.LabelPlacement import placeLabels, overlapPairs
+
+def _boxes(xy, sizes):
+    return np.hstack((xy - sizes / 2, xy + sizes / 2))
+
+def test_placed_labels_do_not_overlap():
+    rng = np.random.default_rng(0)
+    anchors = rng.random((500, 2)) * 40
+    sizes = np.tile((3., 1.), (500, 1))
+    obstacles = _boxes(rng.random((50, 2)) * 40, np.ones((50, 2)))
+    xy, placed = placeLabels(anchors, sizes, obstacles, rings=3)
+    boxes = _boxes(xy[placed], sizes[placed])
+    assert placed.any()
+    assert not len(overlapPairs(boxes, boxes, 6, inner=True)[0])
+    assert not len(overlapPairs(boxes, obstacles, 6)[0])
+    # 没有找到位置的文本保持原位
+    np.testing.assert_array_equal(xy[~placed], anchors[~placed])
+
+def test_free_labels_keep_their_position():
+    anchors = np.array([(0., 0.), (10., 0.), (0., 10.)])
+    xy, placed = placeLabels(anchors, np.ones((3, 2)))
+    assert placed.all()
+    np.testing.assert_array_equal(xy, anchors)
+
+# 同一位置的文本：序号小的留在原位，其余移到周围
+def test_scene_separates_stacked_labels(scene):
+    scene.addNode(Offset(0, 0))
+    scene.addNode(Offset(10, 10))
+    texts = [scene.addText(Offset(5, 5), f'label{i}') for i in range(4)]
+    assert scene.placeLabels(texts) == [True] * 4
+    positions = {(text.pos.x, text.pos.y) for text in texts}
+    assert len(positions) == 4
+    assert (texts[0].pos.x, texts[0].pos.y) == (5, 5)
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from Nets.BaseVar import Offset
+from Nets.Layout import fruchtermanReingold, barnesHut
+
+def _graph(count=40, seed=0):
+    rng = np.random.default_rng(seed)
+    ring = np.column_stack((np.arange(count), (np.arange(count) + 1) % count))
+    edges = np.concatenate((ring, rng.integers(0, count, (10, 2))))
+    return edges, rng.random((count, 2)) * 10
+
+def _edgeLengths(xy, edges):
+    return np.hypot(*(xy[edges[:, 1]] - xy[edges[:, 0]]).T)
+
+@pytest.mark.parametrize('layout', [fruchtermanReingold, barnesHut])
+def test_same_seed_same_positions(layout):
+    edges, _ = _graph()
+    first = layout(edges, 40, seed=3)
+    assert np.array_equal(first, layout(edges, 40, seed=3))
+    assert not np.allclose(first, layout(edges, 40, seed=4))
+
+# theta为0时不做近似，与精确计算一致；近似时单步的位移与整体的边长都接近精确计算
+def test_barnes_hut_close_to_exact():
+    edges, pos = _graph()
+    exact = fruchtermanReingold(edges, 40, pos)
+    assert np.allclose(barnesHut(edges, 40, pos, theta=0), exact)
+    start = fruchtermanReingold(edges, 40, pos, iterations=1)
+    step = np.hypot(*(start - pos).T).mean()
+    assert np.abs(barnesHut(edges, 40, pos, iterations=1) - start).max() < .1 * step
+    approx = barnesHut(edges, 40, pos)
+    assert _edgeLengths(approx, edges).mean() == pytest.approx(_edgeLengths(exact, edges).mean(), rel=.1)
+
+@pytest.mark.parametrize('layout', [fruchtermanReingold, barnesHut])
+def test_pinned_nodes_stay(layout):
+    edges, pos = _graph()
+    pinned = [0, 5, 17]
+    xy = layout(edges, 40, pos, pinned)
+    assert np.array_equal(xy[pinned], pos[pinned])
+    mask = np.zeros(40, dtype=bool)
+    mask[pinned] = True
+    assert np.array_equal(layout(edges, 40, pos, mask), xy)
+    assert not np.allclose(xy[~mask], pos[~mask])
+
+# 场景布局写回模型的位置与直接调用布局函数的结果一致，线的端点随之移动
+@pytest.mark.parametrize('method, layout', [('fr', fruchtermanReingold), ('barnesHut', barnesHut)])
+def test_scene_layout_writes_back(scene, method, layout):
+    edges, pos = _graph()
+    nodes = scene.addNodes(pos)
+    scene.addEdges(edges, nodes=nodes)
+    scene.moveNode(nodes[0], Offset(1, 1))
+    pos = scene.model.nodeXY.data.copy()
+    expected = layout(edges, 40, pos, np.isin(np.arange(40), [0]), seed=2)
+    scene.layout(method, pinned=[nodes[0]], seed=2)
+    assert np.allclose(scene.model.nodeXY.data, expected)
+    assert scene.model.nodeXY.data[0].tolist() == [1, 1]
+    lineNodes = scene.model.lineNodes.data
+    assert np.allclose(scene.model.lineXY.data, np.hstack((expected[lineNodes[:, 0]], expected[lineNodes[:, 1]])))
@@ -0,0 +1,53 @@
+import pytest
+
+from Nets.NetScene import NetScene
+from Nets.BaseVar import Offset
+from Nets.RenderCache import RenderCache, sceneDigest
+
+def _build(scene):
+    return scene.drawPathWithNode([Offset(0, 0), Offset(3, 0), Offset(3, 4)], closure=True)
+
+def test_same_content_same_key(scene):
+    _build(scene)
+    with NetScene(False, figsize=4, headless=True) as other:
+        _build(other)
+        assert sceneDigest(scene) == sceneDigest(other)
+    assert sceneDigest(scene, 'png') != sceneDigest(scene, 'svg')
+    assert sceneDigest(scene, dpi=72) != sceneDigest(scene, dpi=100)
+
+def test_moving_a_node_changes_key(scene):
+    ns, _ = _build(scene)
+    before = sceneDigest(scene)
+    scene.moveNode(ns[2], Offset(3, 5))
+    assert sceneDigest(scene) != before
+
+def test_highlight_changes_key(scene):
+    ns, ls = _build(scene)
+    before = sceneDigest(scene)
+    scene.highlight(ns[:2], ls[:1])
+    highlighted = sceneDigest(scene)
+    assert highlighted != before
+    scene.highlight(ns[:2], ls[:1], color='green')
+    assert sceneDigest(scene) not in (before, highlighted)
+    scene.clearHighlight()
+    assert sceneDigest(scene) == before
+
+def test_view_changes_key(scene):
+    _build(scene)
+    before = sceneDigest(scene)
+    scene.levelOfDetail()
+    detailed = sceneDigest(scene)
+    assert detailed != before
+    scene.ax.set_xlim(0, 1)
+    assert sceneDigest(scene) != detailed
+
+# 第二次保存命中缓存；高亮之后的图片与缓存中的不同，不能命中
+def test_save_hits_until_scene_changes(scene, tmp_path):
+    scene.cache = RenderCache(str(tmp_path))
+    ns, ls = _build(scene)
+    first = scene.saveBytes()
+    assert scene.saveBytes() == first
+    assert (scene.cache.hits, scene.cache.misses) == (1, 1)
+    scene.highlight(ns, ls)
+    assert scene.saveBytes() != first
+    assert scene.cache.misses == 2
@@ -0,0 +1,50 @@
+import json
+
+import numpy as np
+import pytest
+
+from Nets.NetScene import NetScene
+from Nets.BaseVar import Offset
+from Nets.BaseMixin import CommonStyleMixin, TextStyleMixin
+from Nets.SceneFile import Version, _Columns
+
+def _build(scene):
+    ns, ls, ts = scene.addBindsToAll(Offset(0, 0), [(3, 0), (4, 90)], closure=True, visible=2, parallel=True)
+    scene.addNode(Offset(1, 1), CommonStyleMixin(style='s', size=8, color='blue'), node=ns[1])
+    scene.addText(Offset(-1, -1), '说明', TextStyleMixin(style='italic', size=12, color='tan'), rotation=30)
+    return ns, ls, ts
+
+def _assertSame(a, b):
+    for name in _Columns:
+        np.testing.assert_array_equal(getattr(a.model, name).data, getattr(b.model, name).data, err_msg=name)
+    assert list(a.model.textStr.data) == list(b.model.textStr.data)
+    assert a.model.styles.styles == b.model.styles.styles
+    assert a.settings == b.settings
+
+@pytest.mark.parametrize('binary, mmap', [(False, False), (True, False), (True, True)])
+def test_round_trip(scene, tmp_path, binary, mmap):
+    _build(scene)
+    path = str(tmp_path / ('scene.nets' if binary else 'scene.json'))
+    scene.dump(path, binary)
+    with NetScene.load(path, mmap, headless=True) as loaded:
+        _assertSame(scene, loaded)
+
+# 读取后依赖关系仍然有效：移动节点时线与长度标注随之更新
+def test_loaded_scene_keeps_dependencies(scene, tmp_path):
+    ns, ls, ts = _build(scene)
+    path = str(tmp_path / 'scene.nets')
+    scene.dump(path, True)
+    with NetScene.load(path, headless=True) as loaded:
+        loaded.model.setNodePos(ns[2].index, 3, 8)
+        assert loaded.model.lineXY[ls[1].index].tolist() == [3, 0, 3, 8]
+        assert loaded.model.textStr[ts[1].index] == '8.00'
+
+def test_rejects_other_versions(scene, tmp_path):
+    _build(scene)
+    path = tmp_path / 'scene.json'
+    scene.dump(str(path))
+    data = json.loads(path.read_text(encoding='utf8'))
+    data['version'] = Version - 1
+    path.write_text(json.dumps(data), encoding='utf8')
+    with pytest.raises(ValueError):
+        NetScene.load(str(path), headless=True)
@@ -0,0 +1,21 @@
+import matplotlib
+import matplotlib.pyplot as plt
+
+from Nets.NetScene import NetScene
+from Nets.BaseVar import Offset
+
+# show原来是staticmethod，通过类调用时显示pyplot的所有画布，并生成其中场景的图元
+def test_show_from_class_and_instance(monkeypatch):
+    matplotlib.use('Agg')
+    shown = []
+    monkeypatch.setattr(plt, 'show', lambda: shown.append(True))
+    with NetScene(False, figsize=4) as first, NetScene(False, figsize=4) as second:
+        first.addNode(Offset(1, 1))
+        second.addNode(Offset(2, 2))
+        assert first.model.nodeArtists == [None]
+        NetScene.show()
+        assert first.model.nodeArtists[0] is not None and second.model.nodeArtists[0] is not None
+        first.addNode(Offset(3, 3))
+        first.show()
+        assert first.model.nodeArtists[1] is not None
+    assert shown == [True, True]
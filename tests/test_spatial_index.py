@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from Nets.BaseVar import Offset
+from Nets.SpatialIndex import pointSegmentDistances, segmentDistances
+
+# 与逐个计算的结果比较；节点数超过尾部的行数，查询会经过树
+def _scene(scene, rng, count=2000):
+    xy = rng.random((count, 2)) * 100
+    nodes = scene.addNodes(xy)
+    scene.addEdges(rng.integers(0, count, (count // 2, 2)), nodes=nodes)
+    return nodes
+
+def _nodeDistances(scene, x, y):
+    return np.hypot(*(scene.model.nodeXY.data - (x, y)).T)
+
+def test_node_queries_match_brute_force(scene):
+    rng = np.random.default_rng(1)
+    _scene(scene, rng)
+    index = scene.model.spatialIndex()
+    for x, y in rng.random((20, 2)) * 100:
+        distances = _nodeDistances(scene, x, y)
+        assert index.nearestNode(x, y) == int(np.argmin(distances))
+        assert index.nearestNodes(x, y, 5).tolist() == np.argsort(distances, kind='stable')[:5].tolist()
+        assert sorted(index.nodesInRadius(x, y, 7).tolist()) == np.flatnonzero(distances <= 7).tolist()
+        inside = ((scene.model.nodeXY.data >= (x - 5, y - 3)) & (scene.model.nodeXY.data <= (x + 5, y + 3))).all(axis=1)
+        assert sorted(index.nodesInBox(x - 5, y - 3, x + 5, y + 3).tolist()) == np.flatnonzero(inside).tolist()
+
+def test_line_queries_match_brute_force(scene):
+    rng = np.random.default_rng(2)
+    _scene(scene, rng)
+    index = scene.model.spatialIndex()
+    segments = scene.model.lineXY.data
+    for x, y in rng.random((20, 2)) * 100:
+        distances = pointSegmentDistances(segments, x, y)
+        assert distances[index.nearestLine(x, y)] == distances.min()
+        probe = (x, y, x + 10, y + 4)
+        expected = np.flatnonzero(segmentDistances(segments, probe) <= 0)
+        assert sorted(index.linesOnSegment(*probe).tolist()) == expected.tolist()
+
+# 移动节点与新添加的行在之后的查询中生效
+def test_index_follows_moves_and_additions(scene):
+    rng = np.random.default_rng(3)
+    nodes = _scene(scene, rng)
+    assert scene.nearestNode(Offset(500, 500)) is not None
+    scene.moveNode(nodes[7], Offset(500, 500))
+    assert scene.nearestNode(Offset(499, 499)) == nodes[7]
+    added = scene.addNode(Offset(-300, -300))
+    assert scene.nearestNode(Offset(-290, -290)) == added
+    assert scene.nodesInRadius(Offset(-300, -300), 1) == [added]
+    assert nodes[7] not in scene.nodesInBox(Offset(0, 0), Offset(100, 100))
+
+# 257个节点时最后一个顶层结点只含一个节点，节点移走后该结点不再作为最近邻距离的上界
+@pytest.mark.parametrize('seed', range(30))
+def test_nearest_skips_boxes_without_live_rows(scene, seed):
+    nodes = scene.addNodes(np.random.default_rng(seed).random((257, 2)) * 100)
+    index = scene.model.spatialIndex()
+    index.nearestNode(0, 0)
+    last = int(index.nodes.runs[0].rows[-1])
+    old = scene.model.nodeXY.data[last].copy()
+    scene.moveNode(nodes[last], Offset(1e4, 1e4))
+    distances = _nodeDistances(scene, *old)
+    assert index.nearestNode(*old) == int(np.argmin(distances))
+    assert index.nearestNodes(*old, 3).tolist() == np.argsort(distances, kind='stable')[:3].tolist()
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+# 稀疏、很大的编号（如计数器、哈希值）不按编号分配内存
+def test_sparse_large_ids(scene):
+    base = 10 ** 12
+    edges = ((base + 7 * i, base + 7 * (i + 1)) for i in range(1000))
+    builder = scene.stream(edges, nodes=[(base, 1., 2.), (2 ** 62, 3., 4.)], chunk=64)
+    assert (builder.nodeCount, builder.edgeCount) == (1002, 1000)
+    rows = builder.rows([base, base + 7, base + 1, 2 ** 62])
+    assert rows[2] == -1
+    assert scene.model.nodeXY.data[rows[[0, 3]]].tolist() == [[1, 2], [3, 4]]
+    # 每条边连接相邻编号对应的节点
+    lines = scene.model.lineNodes.data
+    assert lines[5].tolist() == builder.rows([base + 35, base + 42]).tolist()
+    assert len(np.unique(builder.rows(base + 7 * np.arange(1001)))) == 1001
+
+# 重复出现的编号更新位置，不新建节点
+def test_repeated_ids_move_nodes(scene):
+    builder = scene.stream([(5, 10 ** 12)], chunk=2)
+    builder.addNodes([(10 ** 12, 1., 1.), (5, 2., 0.), (10 ** 12, 3., 3.)])
+    assert builder.nodeCount == 2
+    assert scene.model.nodeXY.data[builder.rows([10 ** 12])[0]].tolist() == [3, 3]
+    assert scene.model.lineXY.data[0].tolist() == [2, 0, 3, 3]
+
+def test_negative_ids_rejected(scene):
+    with pytest.raises(ValueError):
+        scene.stream([(1, -2)])
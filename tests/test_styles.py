@@ -0,0 +1,38 @@
+import gc
+
+import pytest
+
+from Nets import BaseMixin
+from Nets.BaseMixin import TextStyleMixin, DefaultTextStyle, internStyle
+from Nets.BaseVar import Offset
+
+# 位置参数保持原来的顺序：family、rotation
+def test_text_style_positional_family():
+    style = TextStyleMixin('Arial', 30, style='normal', size=12, color='red')
+    assert (style.family, style.rotation, style.size) == ('Arial', 30, 12)
+    assert style.replace(size=14).family == 'Arial'
+    with pytest.raises(TypeError):
+        TextStyleMixin('Arial', 30, 'normal', 12, 'red')
+
+# 读取带角度的样式不驻留，驻留表不随角度增长
+def test_rotated_styles_not_retained(scene):
+    ns, ls, ts = scene.addBindsToAll(Offset(0, 0), [(3, 30), (4, 100), (5, 200)], visible=1, parallel=True)
+    gc.collect()
+    before = len(BaseMixin._Interned)
+    for angle in range(500):
+        internStyle(DefaultTextStyle.replace(rotation=angle + 0.5))
+        assert ts[angle % 3].style.rotation == ts[angle % 3].rotation
+    gc.collect()
+    assert len(BaseMixin._Interned) == before
+
+# 替换样式时保留平行文本的角度，显式指定角度时才修改
+def test_set_text_style_keeps_rotation(scene):
+    ns, ls, ts = scene.addBindsToAll(Offset(0, 0), [(3, 90)], visible=1, parallel=True)
+    text = ts[0]
+    text.style = text.style.replace(color='red').replace(rotation=0)
+    assert (text.style.color, text.rotation) == ('red', pytest.approx(90))
+    text.style = text.style.replace(rotation=45)
+    assert text.rotation == 45
+    text.rotation = 0
+    assert text.rotation == 0
+    assert scene.model.styles[scene.model.textStyle[text.index]].rotation == 0
@@ -0,0 +1,60 @@
+import io
+import re
+import xml.etree.ElementTree as ElementTree
+
+import numpy as np
+
+from Nets.BaseVar import Offset
+from Nets.BaseMixin import CommonStyleMixin, TextStyleMixin
+
+Svg = '{http://www.w3.org/2000/svg}'
+
+def _build(scene):
+    ns, ls = scene.drawPathWithNode([Offset(0, 0), Offset(4, 0), Offset(4, 3)])
+    scene.addConnect(ns[2], ns[0], arrow=True)
+    scene.addNode(Offset(2, 2), CommonStyleMixin(style='s', size=8, color='blue'))
+    scene.addText(Offset(1, 1), '<a & b>', TextStyleMixin(style='italic', size=10, color='red'), rotation=30)
+    scene.addAttachText(ls[0], visible=1)
+
+def _svg(scene, chunk=65536) -> str:
+    buffer = io.StringIO()
+    scene.saveSvg(buffer, chunk)
+    return buffer.getvalue()
+
+def test_elements_and_escaping(scene):
+    _build(scene)
+    root = ElementTree.fromstring(_svg(scene))
+    model = scene.model
+    assert len(root.findall(f'{Svg}use')) == model.nodeCount
+    # 两种节点样式各定义一次
+    assert len(root.findall(f'{Svg}defs/{Svg}symbol')) == 2
+    arrows = [p for p in root.findall(f'{Svg}path') if p.get('class', '').startswith('a')]
+    assert len(arrows) == 1
+    texts = root.findall(f'{Svg}text')
+    assert [t.text for t in texts] == ['<a & b>', '4.0']
+    assert texts[0].get('transform').startswith('rotate(-30.00')
+    assert texts[1].get('transform') is None
+
+# 分块只影响写出的方式，不影响内容：普通线按块合并为路径，路径中的线段总数不变
+def test_chunks_do_not_change_content(scene):
+    _build(scene)
+    whole, parts = _svg(scene), _svg(scene, chunk=1)
+    segments = lambda svg: sorted(re.findall(r'M[-\d.]+ [-\d.]+L[-\d.]+ [-\d.]+', svg))
+    assert segments(whole) == segments(parts)
+    strip = lambda svg: sorted(line for line in svg.splitlines() if not line.startswith('<path class="l'))
+    assert strip(whole) == strip(parts)
+
+# 数据范围等比例缩放后居中，y轴向上
+def test_coordinates_fit_the_canvas(scene):
+    scene.addNodes(np.array([(0, 0), (10, 5)]))
+    root = ElementTree.fromstring(_svg(scene))
+    size = float(root.get('viewBox').split()[2])
+    (x0, y0), (x1, y1) = [(float(u.get('x')), float(u.get('y'))) for u in root.findall(f'{Svg}use')]
+    assert x0 < x1 and y0 > y1
+    assert (x0 + x1) / 2 == size / 2 and (y0 + y1) / 2 == size / 2
+    assert x1 - x0 == 2 * (y0 - y1)
+
+def test_writes_file(scene, tmp_path):
+    _build(scene)
+    scene.saveSvg(str(tmp_path / 'scene'))
+    ElementTree.parse(tmp_path / 'scene.svg')